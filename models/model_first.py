@@ -1,5 +1,9 @@
 from typing import List
 
+# Local Modules - Auxiliary (first of all, so that numerical libraries are loaded within the thread budget)
+import modules_aux.module_threads               as module_threads
+module_threads.limit_threads()
+
 # Local Modules - Abstraction
 import modules_abstraction.module_parser        as module_parser
 import modules_abstraction.module_models        as module_models
@@ -20,7 +24,7 @@ else: model = module_models.ParallelModel(arguments)
 # =================================== COMPUTE FEATURES ===================================
 
 feature_sets = None
-if parallelization is None or parallelization == module_models.PARALLEL_FEATURE_EXTRACTION:
+if parallelization is None or parallelization in module_models.PARALLEL_REQUIRES_FEATURE_SETS:
 
     # =========================================== Get Features for FeatureSet ===========================================
 
@@ -33,7 +37,7 @@ if parallelization is None or parallelization == module_models.PARALLEL_FEATURE_
 
     # =========================================== Init Execution of Feature Sets ===========================================
 
-    if not print_variations:
+    if not print_variations and (parallelization is None or parallelization == module_models.PARALLEL_FEATURE_EXTRACTION):
 
         model.init_execution()
 
@@ -6,7 +6,7 @@ import warnings
 import numpy as np
 import pandas as pd
 
-from typing import Any, Dict, Generator, List, Optional, Tuple, Type
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple, Type
 
 from sklearn.svm import SVC
 from sklearn.tree import DecisionTreeClassifier
@@ -21,6 +21,7 @@ from sklearn.exceptions import ConvergenceWarning
 import modules_abstraction.module_scorer    as module_scorer
 # Local Modules - Auxiliary
 import modules_aux.module_exporter  as module_exporter
+import modules_aux.module_threads   as module_threads
 
 # =================================== PACKAGES PARAMETERS ===================================
 
@@ -50,6 +51,16 @@ VARIATIONS_MLP_LEARNING_RATE_INIT = [ 0.001 * pow(5, value) for value in range(0
 VARIATIONS_MLP_LEARNING_RATE =      [ 'constant', 'invscaling', 'adaptive' ]
 VARIATIONS_MLP_MAX_ITERATIONS =     [ 100, 500, 1000 ]
 
+# =================================== CONSTANTS - TRAIN SCORING ===================================
+
+# Train rows predicted (by every fitted model) to score the train set
+TRAIN_SCORING_FULL      : str       = 'full'
+TRAIN_SCORING_NONE      : str       = 'none'
+TRAIN_SCORING_BEST      : str       = 'best'
+TRAIN_SCORING_SAMPLE    : str       = 'sample'
+TRAIN_SCORING_OPTIONS   : List[str] = [TRAIN_SCORING_FULL, TRAIN_SCORING_NONE, TRAIN_SCORING_BEST, TRAIN_SCORING_SAMPLE]
+DEFAULT_TRAIN_SAMPLE    : int       = 32
+
 VARIATIONS_NB_PRESET =  { }
 VARIATIONS_DT_PRESET =  { }
 VARIATIONS_SVM_PRESET = { }
@@ -103,33 +114,140 @@ class Classifier(metaclass=abc.ABCMeta):
     def export_variations_results(self, variation_summary: pd.DataFrame, metric: str) -> None:
         exit("🚨 Method 'export_variations_results' not defined")
 
-    def process_iteration(self, train_X: pd.DataFrame, train_Y: pd.Series, test_X: pd.DataFrame, test_Y: pd.Series):
-        for scorer_key in self.scorers:
-            scorer = self.scorers[scorer_key]
+    # Train rows scored on the current split, None when the train set is not scored
+    train_scoring : str = TRAIN_SCORING_FULL
+    train_sample_size : int = DEFAULT_TRAIN_SAMPLE
+    train_sample : Optional[pd.Index] = None
+    train_generator : Optional[np.random.RandomState] = None
+    train_rows : Optional[np.ndarray] = None
+
+    def set_train_scoring(self, train_scoring: str, sample_size: Optional[int] = None, seed: int = 0) -> None:
+        if train_scoring not in TRAIN_SCORING_OPTIONS: exit(f"🚨 Train scoring '{train_scoring}' not recognized")
+        self.train_scoring = train_scoring
+        self.train_sample_size = sample_size if sample_size is not None else DEFAULT_TRAIN_SAMPLE
+        self.train_sample = None
+        self.train_generator = np.random.RandomState(seed)
+
+    def get_train_rows(self, train_X: pd.DataFrame) -> Optional[np.ndarray]:
+
+        if self.train_scoring == TRAIN_SCORING_FULL: return np.arange(len(train_X.index))
+        # The winning variation is only scored on the train set once the search concluded
+        elif self.train_scoring in [TRAIN_SCORING_NONE, TRAIN_SCORING_BEST]: return None
+        # Same subjects on every split (the ones not left out), drawn once from the first
+        if self.train_sample is None:
+            sampled_rows = self.train_generator.choice(len(train_X.index), min(self.train_sample_size, len(train_X.index)), replace=False)
+            self.train_sample = train_X.index[np.sort(sampled_rows)]
+        return np.flatnonzero(train_X.index.isin(self.train_sample))
+
+    def predict_train(self, model: Any, train_X: pd.DataFrame) -> Optional[np.ndarray]:
+        if self.train_rows is None: return None
+        if len(self.train_rows) == len(train_X.index): return model.predict(train_X)
+        return model.predict(train_X.iloc[self.train_rows])
+
+    # Features permuted on the test rows of every split, scored (once the search concluded) by the winning variation only
+    importance_categories : Optional[List[str]] = None
+    importance_features : Optional[List[str]] = None
+    importance_generator : Optional[np.random.RandomState] = None
+
+    def study_features_importance(self, categories: List[str], features: List[str], seed: int = 0) -> None:
+        self.importance_categories = list(categories)
+        self.importance_features = list(features)
+        self.importance_generator = np.random.RandomState(seed)
+
+    def permute_features(self, train_X: pd.DataFrame, test_X: pd.DataFrame, features: List[str]) -> pd.DataFrame:
+        # One block of test rows per feature, that feature taken from a (seeded) permutation of its column on the train rows
+        number_features, number_rows, number_train = len(features), len(test_X.index), len(train_X.index)
+        permuted_X = pd.DataFrame({ column: np.tile(test_X[column].to_numpy(), number_features) for column in test_X.columns },
+            index=np.tile(test_X.index.to_numpy(), number_features), columns=test_X.columns)
+        permutations = np.argsort(self.importance_generator.rand(number_features, number_train), axis=1)[:, np.arange(number_rows) % number_train]
+        for feature_index, feature in enumerate(features):
+            feature_values = permuted_X[feature].to_numpy(copy=True)
+            feature_values[feature_index * number_rows:(feature_index + 1) * number_rows] = train_X[feature].to_numpy()[permutations[feature_index]]
+            permuted_X[feature] = feature_values
+        return permuted_X
+
+    def process_iteration(self, train_X: pd.DataFrame, train_Y: pd.Series, test_X: pd.DataFrame, test_Y: pd.Series, split_index: int, scorer_keys: Optional[List[str]] = None):
+        # Search strategies may only evaluate some of the variations on a given split
+        if scorer_keys is None: scorer_keys = list(self.scorers.keys())
+        self.train_rows = self.get_train_rows(train_X)
+        score_train_Y = train_Y.iloc[self.train_rows] if self.train_rows is not None else train_Y
+
+        predictions : List[Tuple[Optional[np.ndarray], np.ndarray]] = []
+        subjects_keys = test_Y.index.to_numpy()
+        for scorer_key in scorer_keys:
             parameters = self.variations[scorer_key]
-
             y_train_pred, y_test_pred = self.make_prediction(parameters, train_X.copy(), train_Y.copy(), test_X.copy())
-            scorer.add_points(train_Y.copy(), y_train_pred, test_Y.copy(), y_test_pred)
-            scorer.add_subjects_information(test_Y.copy(), y_test_pred)
-
+            predictions.append((y_train_pred, np.asarray(y_test_pred)))
+            self.scorers[scorer_key].add_subjects_information(test_Y, y_test_pred, split_index, subjects_keys)
+        if len(predictions) == 0: return
+
+        # Every variation's predictions on the split are scored at once
+        train_preds_Y = np.stack([ np.asarray(y_train_pred) for y_train_pred, _ in predictions ]) if self.train_rows is not None else None
+        test_preds_Y = np.stack([ y_test_pred for _, y_test_pred in predictions ])
+        module_scorer.add_points_batch([ self.scorers[scorer_key] for scorer_key in scorer_keys ], score_train_Y, train_preds_Y, test_Y, test_preds_Y)
+
+    def process_best_iteration(self, train_X: pd.DataFrame, train_Y: pd.Series, test_X: pd.DataFrame, test_Y: pd.Series, split_index: int, scorer_key: str,
+        importance_scorers: Dict[str, module_scorer.Scorer]):
+        # Single refit of the winning variation on the split, scoring its whole train set ('best' train scoring) and its permuted rows alike
+        score_train = self.train_scoring == TRAIN_SCORING_BEST
+        self.train_rows = np.arange(len(train_X.index)) if score_train else self.get_train_rows(train_X)
+        # Features missing from this split (dynamic features may differ among splits) are left without its points
+        number_rows = len(test_X.index)
+        split_features : List[str] = []
+        if self.importance_features is not None:
+            split_features = [ feature for feature in self.importance_features if feature in train_X.columns and feature in test_X.columns ]
+        if not score_train and len(split_features) == 0: return
+
+        # Every block of permuted rows is predicted at once, without permuted rows the test set only stands in for it
+        predict_X = self.permute_features(train_X, test_X, split_features) if len(split_features) != 0 else train_X.iloc[:1].copy()
+        y_train_pred, y_permuted_pred = self.make_prediction(self.variations[scorer_key], train_X.copy(), train_Y.copy(), predict_X)
+        if score_train: self.scorers[scorer_key].add_train_points(train_Y, y_train_pred)
+        if len(split_features) == 0: return
+
+        score_train_Y = train_Y.iloc[self.train_rows] if self.train_rows is not None else train_Y
+        train_preds_Y = np.tile(np.asarray(y_train_pred), (len(split_features), 1)) if self.train_rows is not None else None
+        feature_preds_Y = np.asarray(y_permuted_pred).reshape(len(split_features), number_rows)
+        feature_scorers = [ importance_scorers[feature] for feature in split_features ]
+        subjects_keys = test_Y.index.to_numpy()
+        for feature_scorer, feature_pred_Y in zip(feature_scorers, feature_preds_Y): feature_scorer.add_subjects_information(test_Y, feature_pred_Y, split_index, subjects_keys)
+        module_scorer.add_points_batch(feature_scorers, score_train_Y, train_preds_Y, test_Y, feature_preds_Y)
+
+    def score_best_variation(self, scorer_key: str, number_splits: int, get_split: Callable[[int], Optional[Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]]]) -> Dict[str, module_scorer.Scorer]:
+        # Final pass for the winning variation alone, once the search concluded (models fitted by the search are not kept,
+        # hence it costs one more fit per split, only made when scoring the train set with 'best' or studying features importance)
+        importance_scorers : Dict[str, module_scorer.Scorer] = {}
+        if self.importance_features is not None:
+            importance_scorers = { feature: module_scorer.Scorer(self.importance_categories) for feature in self.importance_features }
+        if self.train_scoring != TRAIN_SCORING_BEST and self.importance_features is None: return importance_scorers
+
+        for split_index in range(number_splits):
+            split = get_split(split_index)
+            if split is None: continue
+            train_X, train_Y, test_X, test_Y = split
+            self.process_best_iteration(train_X, train_Y, test_X, test_Y, split_index, scorer_key, importance_scorers)
+        return importance_scorers
 
     def get_scorers(self) -> Dict[str, module_scorer.Scorer]: return self.scorers
+    def get_variations(self) -> Dict[str, Dict[str, Any]]: return self.variations
+    def get_number_folds(self, scorer_key: str) -> int: return self.scorers[scorer_key].get_number_folds()
     def get_best_scorer(self, metric: str) -> Optional[Tuple[str, module_scorer.Scorer]]:
-        
-        current_max : Optional[Tuple[str, module_scorer.Scorer, float]] = None
-        for scorer_key in self.scorers:
-            scorer = self.scorers[scorer_key]
-            scorer_metrics = scorer.export_metrics(module_scorer.ScorerSet.Test)
 
-            scorer_metric = list(filter(lambda score_metric: score_metric['name'] == metric, scorer_metrics))[0]
-            if current_max is None or scorer_metric['score'] > current_max[2]:
-                current_max = (scorer_key, scorer, scorer_metric['score'])
-        return (current_max[0], current_max[1])
+        # Variations discarded early by the search are not compared against the ones evaluated on every split
+        maximum_folds = max(self.get_number_folds(scorer_key) for scorer_key in self.scorers)
+        scorer_keys = [ scorer_key for scorer_key in self.scorers if self.get_number_folds(scorer_key) == maximum_folds ]
+        scores = module_scorer.compute_metrics_batch([ self.scorers[scorer_key] for scorer_key in scorer_keys ], module_scorer.ScorerSet.Test)[metric]
+        # First of the best, as when compared one by one
+        best_scorer_key = scorer_keys[int(np.argmax(scores.to_numpy()))]
+        return (best_scorer_key, self.scorers[best_scorer_key])
 
     def get_variations_df(self, variation_summary: Dict[str, Any]) -> pd.DataFrame:
+        # Variations left out by the search have no results
+        scorer_keys = [ scorer_key for scorer_key in self.scorers if self.get_number_folds(scorer_key) != 0 ]
+        scorers = [ self.scorers[scorer_key] for scorer_key in scorer_keys ]
+        metrics = { result_set: module_scorer.compute_metrics_batch(scorers, result_set) for result_set in module_scorer.ScorerSet }
+
         summary = []
-        for scorer_key in self.scorers:
-            scorer = self.scorers[scorer_key]
+        for scorer_index, scorer_key in enumerate(scorer_keys):
             # Current Line
             for result_set in [('Train', module_scorer.ScorerSet.Train), ('Test', module_scorer.ScorerSet.Test) ]:
                 # Define variation summary
@@ -138,8 +256,9 @@ class Classifier(metaclass=abc.ABCMeta):
                 for param_key in self.variations[scorer_key]: variation_summary_copy[param_key] = self.variations[scorer_key][param_key]
                 # Define variation summary, by adding its set
                 variation_summary_copy['Set'] = result_set[0]
+                variation_summary_copy['Folds'] = self.get_number_folds(scorer_key)
                 # Define variation summary, by adding its scores
-                for score in scorer.export_metrics(result_set[1]): variation_summary_copy[score['name']] = score['score']
+                variation_summary_copy.update(metrics[result_set[1]].iloc[scorer_index].to_dict())
                 # Add Current Line and Current Set
                 summary.append(variation_summary_copy)
 
@@ -156,6 +275,9 @@ class NaiveBayes(Classifier):
 
     def __init__(self, categories: List[str], filter_variations: Optional[List[str]]):
         self.filter_variations = filter_variations
+        # Instance state, classifiers of several variations may be built by the same process
+        self.scorers = {}
+        self.variations = dict(VARIATIONS_NB_PRESET)
         self.variations.update(self.compute_variations())
 
         for variation_key in self.variations:
@@ -177,7 +299,7 @@ class NaiveBayes(Classifier):
         else: exit(f"🚨 Naive Bayes algorithm '{algorithm}' not recognized")
         nb_classifier.fit(train_X, train_Y)
 
-        prd_train_Y = nb_classifier.predict(train_X)
+        prd_train_Y = self.predict_train(nb_classifier, train_X)
         prd_test_Y = nb_classifier.predict(test_X)
         return (prd_train_Y, prd_test_Y)
 
@@ -196,6 +318,8 @@ class DecisionTree(Classifier):
 
     def __init__(self, categories: List[str], filter_variations: Optional[List[str]]):
         self.filter_variations = filter_variations
+        self.scorers = {}
+        self.variations = dict(VARIATIONS_DT_PRESET)
         self.variations.update(self.compute_variations())
 
         for variation_key in self.variations:
@@ -210,7 +334,7 @@ class DecisionTree(Classifier):
         tree_classifier = DecisionTreeClassifier(**params)
         tree_classifier.fit(train_X, train_Y)
 
-        prd_train_Y = tree_classifier.predict(train_X)
+        prd_train_Y = self.predict_train(tree_classifier, train_X)
         prd_test_Y = tree_classifier.predict(test_X)
         return (prd_train_Y, prd_test_Y)
 
@@ -243,6 +367,8 @@ class SupportVectorMachine(Classifier):
 
     def __init__(self, categories: List[str], filter_variations: Optional[List[str]]):
         self.filter_variations = filter_variations
+        self.scorers = {}
+        self.variations = dict(VARIATIONS_SVM_PRESET)
         self.variations.update(self.compute_variations())
 
         for variation_key in self.variations:
@@ -257,7 +383,7 @@ class SupportVectorMachine(Classifier):
         svm_classifier = SVC(**params)
         svm_classifier.fit(train_X, train_Y)
 
-        prd_train_Y = svm_classifier.predict(train_X)
+        prd_train_Y = self.predict_train(svm_classifier, train_X)
         prd_test_Y = svm_classifier.predict(test_X)
         return (prd_train_Y, prd_test_Y)
 
@@ -276,6 +402,8 @@ class RandomForest(Classifier):
 
     def __init__(self, categories: List[str], filter_variations: Optional[List[str]]):
         self.filter_variations = filter_variations
+        self.scorers = {}
+        self.variations = dict(VARIATIONS_RF_PRESET)
         self.variations.update(self.compute_variations())
 
         for variation_key in self.variations:
@@ -287,10 +415,10 @@ class RandomForest(Classifier):
         return develop_parameters_variations(keys, values, self.filter_variations)
 
     def make_prediction(self, params: Dict[str, Dict[str, Any]], train_X: pd.DataFrame, train_Y: pd.Series, test_X: pd.DataFrame) -> Tuple[pd.Series]:
-        forest_classifier = RandomForestClassifier(**params)
+        forest_classifier = RandomForestClassifier(**params, n_jobs=module_threads.get_n_jobs())
         forest_classifier.fit(train_X, train_Y)
 
-        prd_train_Y = forest_classifier.predict(train_X)
+        prd_train_Y = self.predict_train(forest_classifier, train_X)
         prd_test_Y = forest_classifier.predict(test_X)
         return (prd_train_Y, prd_test_Y)
 
@@ -323,11 +451,13 @@ class RandomForest(Classifier):
 class MultiLayerPerceptron(Classifier):
 
     scorers = {}
-    variations = VARIATIONS_RF_PRESET
+    variations = VARIATIONS_MLP_PRESET
     filter_variations = None
 
     def __init__(self, categories: List[str], filter_variations: Optional[List[str]]):
         self.filter_variations = filter_variations
+        self.scorers = {}
+        self.variations = dict(VARIATIONS_MLP_PRESET)
         self.variations.update(self.compute_variations())
         
         for variation_key in self.variations:
@@ -342,7 +472,7 @@ class MultiLayerPerceptron(Classifier):
         mlp_classifier = MLPClassifier(**params)
         mlp_classifier.fit(train_X, train_Y)
 
-        prd_train_Y = mlp_classifier.predict(train_X)
+        prd_train_Y = self.predict_train(mlp_classifier, train_X)
         prd_test_Y = mlp_classifier.predict(test_X)
         return (prd_train_Y, prd_test_Y)
 
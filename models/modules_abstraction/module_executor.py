@@ -0,0 +1,205 @@
+import os
+import pickle
+import shutil
+import tempfile
+import multiprocessing
+import multiprocessing.pool
+
+import numpy    as np
+import pandas   as pd
+
+from tqdm       import tqdm
+from typing     import Any, Callable, Dict, List, Optional, Tuple
+
+# Local Modules - Auxiliary
+import modules_aux.module_threads               as module_threads
+# Local Modules - Abstraction
+import modules_abstraction.module_variations    as module_variations
+import modules_abstraction.module_featureset    as module_featureset
+
+# =================================== CONSTANTS ===================================
+
+# Memory backed file system, matrices published there never reach the disk
+SHARED_MEMORY_DIRECTORY     : str   = '/dev/shm'
+SHARED_PREFIX               : str   = 'variations_executor_'
+MATRIX_EXTENSION            : str   = '.npy'
+# Handle of a published dataset (and its variations), written once and read by each worker
+HANDLE_FILENAME             : str   = 'dataset.pkl'
+# Feature sets the splits are developed from, published once for every dataset built from them
+FEATURE_SET_FILENAME        : str   = 'feature_set - {0}.pkl'
+
+# =================================== PRIVATE VARIABLES ===================================
+
+# Set before the pool is forked, so that workers inherit the model instead of receiving it pickled
+TASK_RUNNER : Optional[Callable[[module_variations.Variation, module_featureset.PreparedDataset], List[Dict[str, Any]]]] = None
+# Handle last read by a worker (and the dataset attached from it), its following tasks usually share it
+WORKER_HANDLE : Optional[Tuple[str, 'SharedDataset', module_featureset.PreparedDataset]] = None
+# Feature sets read by a worker, by path
+WORKER_FEATURE_SETS : Dict[str, module_featureset.FeatureSetAbstraction] = {}
+
+# =================================== PRIVATE CLASSES ===================================
+
+class SharedFrame():
+
+    # Numeric columns are written to memory mapped files, the remaining ones (and the index) travel with the handle
+    def __init__(self, dataframe: pd.DataFrame, path_prefix: str) -> None:
+
+        self.columns        : pd.Index                          = dataframe.columns
+        self.index          : pd.Index                          = dataframe.index
+        self.blocks         : List[Tuple[str, List[Any], str]]  = []
+        self.others         : Optional[pd.DataFrame]            = None
+
+        numeric_columns = [ column for column in dataframe.columns if pd.api.types.is_numeric_dtype(dataframe[column]) and not pd.api.types.is_bool_dtype(dataframe[column]) ]
+        other_columns = [ column for column in dataframe.columns if column not in set(numeric_columns) ]
+        if len(other_columns) != 0: self.others = dataframe[other_columns]
+        if dataframe.columns.has_duplicates: self.others, numeric_columns = dataframe, []
+
+        dtypes : Dict[str, List[Any]] = {}
+        for column in numeric_columns: dtypes.setdefault(str(dataframe[column].dtype), []).append(column)
+        for block_index, (dtype, columns) in enumerate(sorted(dtypes.items())):
+            path = f'{path_prefix}.{block_index}{MATRIX_EXTENSION}'
+            matrix = np.lib.format.open_memmap(path, mode='w+', dtype=np.dtype(dtype), shape=(len(dataframe.index), len(columns)))
+            matrix[:] = dataframe[columns].to_numpy(dtype=np.dtype(dtype))
+            matrix.flush()
+            del matrix
+            self.blocks.append((dtype, columns, path))
+
+    def attach(self) -> pd.DataFrame:
+
+        # Read only, workers copy whatever they modify (as preprocessing and classifiers already do)
+        frames = [ pd.DataFrame(np.load(path, mmap_mode='r'), index=self.index, columns=columns, copy=False) for _, columns, path in self.blocks ]
+        if self.others is not None: frames.append(self.others)
+        if len(frames) == 1 and self.others is None: return frames[0]
+        if len(frames) == 0: return pd.DataFrame(index=self.index, columns=self.columns)
+        return pd.concat(frames, axis=1)[self.columns]
+
+class SharedDataset():
+
+    def __init__(self, prepared_dataset: module_featureset.PreparedDataset, variations: Dict[int, module_variations.Variation], directory_path: str, feature_set_path: str) -> None:
+
+        self.variations             : Dict[int, module_variations.Variation]    = variations
+        self.variation              : module_variations.Variation               = prepared_dataset.variation
+        self.feature_set_path       : str                                       = feature_set_path
+        self.data_splits            : List[Tuple[List[int], List[int]]]         = prepared_dataset.get_data_splits()
+        self.profiling_directory    : Optional[str]                             = prepared_dataset.get_profiling_directory()
+
+        # Only the full frame is published, splits are developed by the workers as their variations go through them
+        dataframe_X, dataframe_Y = prepared_dataset.get_full_df()
+        self.full_df    : Tuple[SharedFrame, pd.Series] = (SharedFrame(dataframe_X, os.path.join(directory_path, 'full')), dataframe_Y)
+
+    def attach(self) -> module_featureset.PreparedDataset:
+
+        # Attached once by each worker, its splits then kept for the following variations sharing the dataset
+        shared_X, dataframe_Y = self.full_df
+        prepared_dataset = module_featureset.PreparedDataset(read_feature_set(self.feature_set_path), self.variation, shared_X.attach(), dataframe_Y, self.data_splits)
+        if self.profiling_directory is not None: prepared_dataset.set_profiling_directory(self.profiling_directory)
+        return prepared_dataset
+
+def publish_feature_set(feature_set: module_featureset.FeatureSetAbstraction, directory_path: str) -> str:
+    full_path = os.path.join(directory_path, FEATURE_SET_FILENAME.format(len(os.listdir(directory_path))))
+    with open(full_path, 'wb') as file: pickle.dump(feature_set, file)
+    return full_path
+
+def read_feature_set(full_path: str) -> module_featureset.FeatureSetAbstraction:
+    if full_path not in WORKER_FEATURE_SETS:
+        with open(full_path, 'rb') as file: WORKER_FEATURE_SETS[full_path] = pickle.load(file)
+    return WORKER_FEATURE_SETS[full_path]
+
+def publish_dataset(shared_dataset: SharedDataset, directory_path: str) -> None:
+    with open(os.path.join(directory_path, HANDLE_FILENAME), 'wb') as file: pickle.dump(shared_dataset, file)
+
+def read_dataset(directory_path: str) -> Tuple[SharedDataset, module_featureset.PreparedDataset]:
+    global WORKER_HANDLE
+    if WORKER_HANDLE is None or WORKER_HANDLE[0] != directory_path:
+        with open(os.path.join(directory_path, HANDLE_FILENAME), 'rb') as file: shared_dataset = pickle.load(file)
+        WORKER_HANDLE = (directory_path, shared_dataset, shared_dataset.attach())
+    return (WORKER_HANDLE[1], WORKER_HANDLE[2])
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def init_worker(thread_budget: int) -> None:
+    # Cores are split among the workers, as done by 'parallelization.py' among the jobs of a host
+    os.environ[module_threads.THREAD_BUDGET_VARIABLE] = str(thread_budget)
+    module_threads.limit_threads()
+
+def execute_task(task: Tuple[int, str]) -> Tuple[int, List[Dict[str, Any]]]:
+    variation_index, directory_path = task
+    shared_dataset, prepared_dataset = read_dataset(directory_path)
+    variation = shared_dataset.variations[variation_index]
+    # Exiting would kill the worker, leaving the pool waiting for the task forever
+    try: return (variation_index, TASK_RUNNER(variation, prepared_dataset))
+    except SystemExit as error: raise RuntimeError(f"variation '{variation.generate_code()}' exited with '{error.code}'")
+
+# =================================== PUBLIC CLASSES ===================================
+
+class VariationsExecutor():
+
+    # Workers are forked on creation, which should happen before feature sets are extracted or loaded
+    # (libraries as torch or tensorflow are not to be forked once their thread pools are running)
+    def __init__(self, number_jobs: int, runner: Callable[[module_variations.Variation, module_featureset.PreparedDataset], List[Dict[str, Any]]]) -> None:
+
+        global TASK_RUNNER
+        TASK_RUNNER = runner
+        thread_budget = module_threads.compute_thread_budget(module_threads.get_thread_budget(), number_jobs)
+
+        self.number_jobs    : int                       = number_jobs
+        self.pool           : multiprocessing.pool.Pool = multiprocessing.get_context('fork').Pool(number_jobs, init_worker, (thread_budget,))
+
+    def get_directory(self) -> str:
+        base_directory = SHARED_MEMORY_DIRECTORY if os.path.isdir(SHARED_MEMORY_DIRECTORY) else None
+        return tempfile.mkdtemp(prefix=SHARED_PREFIX, dir=base_directory)
+
+    def close(self) -> None:
+        if self.pool is None: return
+        self.pool.terminate()
+        self.pool = None
+
+    def execute(self, groups: List[List[int]], variations: List[module_variations.Variation], prepare: Callable[[int], module_featureset.PreparedDataset]) -> Dict[int, List[Dict[str, Any]]]:
+
+        if self.pool is None: exit("🚨 Executor already closed")
+        results : Dict[int, List[Dict[str, Any]]] = {}
+        # Datasets still being used by the workers, removed once all their variations concluded
+        pending : List[Tuple[str, List[Any]]] = []
+        tracker = tqdm(total=sum(map(len, groups)), desc="👉 Running variations:", leave=False)
+        # Published once, workers read each feature set the first time one of its datasets reaches them
+        feature_sets_directory = self.get_directory()
+        feature_sets_paths : Dict[str, str] = {}
+
+        def collect(self: VariationsExecutor) -> None:
+            directory_path, tasks = pending[0]
+            for task in tasks:
+                try: variation_index, summaries = task.get()
+                except RuntimeError as error: exit(f"🚨 Executor stopped since {error}")
+                # Errors of the workers themselves (or of the tasks sent to them) stop the executor as well
+                except Exception as error: exit(f"🚨 Executor stopped by '{error.__class__.__name__}': {error}")
+                results[variation_index] = summaries
+                tracker.update(1)
+            shutil.rmtree(directory_path, ignore_errors=True)
+            pending.pop(0)
+
+        try:
+            for variation_indexes in groups:
+
+                # Datasets are prepared by this process while the workers run the variations of the previous ones
+                shared_directory = self.get_directory()
+                pending.append((shared_directory, []))
+                group_variations = { variation_index: variations[variation_index] for variation_index in variation_indexes }
+                prepared_dataset = prepare(variation_indexes[0])
+                feature_set_id = prepared_dataset.feature_set.id
+                if feature_set_id not in feature_sets_paths: feature_sets_paths[feature_set_id] = publish_feature_set(prepared_dataset.feature_set, feature_sets_directory)
+                publish_dataset(SharedDataset(prepared_dataset, group_variations, shared_directory, feature_sets_paths[feature_set_id]), shared_directory)
+                # Tasks only carry the variation index and where its dataset was published
+                pending[-1][1].extend(self.pool.apply_async(execute_task, ((variation_index, shared_directory),)) for variation_index in variation_indexes)
+                # Only a few datasets are kept published at once, bounding the memory used
+                while len(pending) > self.number_jobs: collect(self)
+
+            while len(pending) != 0: collect(self)
+            self.pool.close()
+            self.pool.join()
+        finally:
+            self.close()
+            tracker.close()
+            for directory_path, _ in pending: shutil.rmtree(directory_path, ignore_errors=True)
+            shutil.rmtree(feature_sets_directory, ignore_errors=True)
+
+        return results
@@ -4,7 +4,7 @@ import pickle
 import warnings
 
 from tqdm       import tqdm
-from typing     import Callable, List, Optional, Set, Tuple
+from typing     import Any, Callable, Dict, List, Optional, Set, Tuple
 from functools  import reduce
 
 import pandas   as pd
@@ -24,8 +24,23 @@ warnings.filterwarnings('ignore', category = pd.errors.PerformanceWarning)
 
 # =================================== CONSTANTS ===================================
 
+# Resources declared to 'parallelization.py', transformer models (e.g. RoBERTa) only fit a few times in the memory of a host
+RESOURCES_HEAVY_MODEL : Dict[str, Any] = { 'memory': 12, 'threads': 4, 'tags': ['heavy-model'] }
+# Memory taken by the splits a prepared dataset keeps for the following variations, the remaining ones are developed again when needed
+SPLITS_CACHE_BYTES : int = 512 * 1024 * 1024
+
 # =================================== PRIVATE FUNCTIONS ===================================
 
+def merge_resources(resources_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+
+    merged_resources : Dict[str, Any] = {}
+    for key in ['memory', 'threads']:
+        values = [ resources[key] for resources in resources_list if key in resources ]
+        if len(values) != 0: merged_resources[key] = max(values)
+    tags = sorted(set(tag for resources in resources_list for tag in resources.get('tags', [])))
+    if len(tags) != 0: merged_resources['tags'] = tags
+    return merged_resources
+
 # =================================== PUBLIC CLASSES ===================================
 
 class FeatureSetAbstraction(abc.ABC):
@@ -36,6 +51,9 @@ class FeatureSetAbstraction(abc.ABC):
     static_dataframe        :   Optional[pd.DataFrame]  = None
     feature_columns         :   List[str]               = []
     drop_columns            :   List[str]               = []
+    # Resources of the jobs extracting the feature set and of the jobs running models on it
+    extraction_resources    :   Dict[str, Any]          = {}
+    models_resources        :   Dict[str, Any]          = {}
 
     # =================================== FUNCTIONS ===================================
 
@@ -182,15 +200,20 @@ class FeatureSetAbstraction(abc.ABC):
 
         return ((X_train, y_train), (X_test, y_test))
     
-    def get_df_for_classification(self, variation: module_variations.Variation, index_key: str, indexes: Tuple[List[int], List[int]]) -> Tuple[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series]]:
+    def get_filtered_df(self, variation: module_variations.Variation) -> Tuple[pd.DataFrame, pd.Series]:
 
         if self.basis_dataframe is None: self.develop_basis_df()
         if self.static_dataframe is None: self.develop_static_df()
         current_df : pd.DataFrame = self.static_dataframe.copy(deep=True)
 
         current_df = self.filter_rows(current_df, variation)
+        return self.separate_target(current_df)
 
-        dataframe_X, dataframe_Y = self.separate_target(current_df)
+    def get_df_for_classification(self, variation: module_variations.Variation, index_key: str, indexes: Tuple[List[int], List[int]],
+        filtered_df: Optional[Tuple[pd.DataFrame, pd.Series]] = None) -> Tuple[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series]]:
+
+        if filtered_df is None: filtered_df = self.get_filtered_df(variation)
+        dataframe_X, dataframe_Y = filtered_df
         (train_X, train_Y), (test_X, test_Y) = self.separate_train_test(indexes, dataframe_X, dataframe_Y)
         train_X, test_X = self.develop_dynamic_df(f'{variation.generate_code_dataset()} - {index_key}', train_X, train_Y, test_X)
 
@@ -228,11 +251,52 @@ class FeatureSetAbstraction(abc.ABC):
         
         return dataframe_X, dataframe_Y
 
+class PreparedDataset():
+
+    def __init__(self, feature_set: FeatureSetAbstraction, variation: module_variations.Variation,
+        dataframe_X: pd.DataFrame, dataframe_Y: pd.Series, data_splits: List[Tuple[List[int], List[int]]]) -> None:
+
+        self.feature_set            : FeatureSetAbstraction                         = feature_set
+        self.variation              : module_variations.Variation                   = variation
+        self.code                   : str                                           = variation.generate_code_prepared_dataset()
+        self.dataframe_X            : pd.DataFrame                                  = dataframe_X
+        self.dataframe_Y            : pd.Series                                     = dataframe_Y
+        self.data_splits            : List[Tuple[List[int], List[int]]]             = data_splits
+        # Developed on the first request, then handed to every variation sharing the dataset
+        self.filtered_df            : Optional[Tuple[pd.DataFrame, pd.Series]]      = None
+        self.splits_df              : Dict[int, Tuple[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series]]] = {}
+        self.splits_bytes           : int                                           = 0
+        # Exports of the profiling made for the first variation, copied for the following ones
+        self.profiling_directory    : Optional[str]                                 = None
+
+    def get_code(self) -> str: return self.code
+    def get_full_df(self) -> Tuple[pd.DataFrame, pd.Series]: return (self.dataframe_X, self.dataframe_Y)
+    def get_data_splits(self) -> List[Tuple[List[int], List[int]]]: return self.data_splits
+    def get_profiling_directory(self) -> Optional[str]: return self.profiling_directory
+    def set_profiling_directory(self, profiling_directory: str) -> None: self.profiling_directory = profiling_directory
+
+    def get_split_df(self, split_index: int) -> Tuple[Tuple[pd.DataFrame, pd.Series], Tuple[pd.DataFrame, pd.Series]]:
+
+        if split_index in self.splits_df: return self.splits_df[split_index]
+        if self.filtered_df is None: self.filtered_df = self.feature_set.get_filtered_df(self.variation)
+        split_df = self.feature_set.get_df_for_classification(self.variation, split_index, self.data_splits[split_index], self.filtered_df)
+
+        # Variations go through the splits in the same order, so the first ones are kept (evicting would leave none to reuse)
+        (X_train, y_train), (X_test, y_test) = split_df
+        split_bytes = sum(int(data.memory_usage(index=True).sum()) if isinstance(data, pd.DataFrame) else int(data.memory_usage(index=True))
+            for data in [X_train, y_train, X_test, y_test])
+        if self.splits_bytes + split_bytes <= SPLITS_CACHE_BYTES:
+            self.splits_df[split_index] = split_df
+            self.splits_bytes += split_bytes
+        return split_df
+
 class MergedFeatureSetAbstraction(FeatureSetAbstraction):
 
     def __init__(self, feature_sets: List[FeatureSetAbstraction]) -> None:
         super().__init__(' + '.join(map(lambda feature_set: feature_set.id, feature_sets)))
         self.feature_sets = feature_sets
+        self.extraction_resources = merge_resources(list(map(lambda feature_set: feature_set.extraction_resources, feature_sets)))
+        self.models_resources = merge_resources(list(map(lambda feature_set: feature_set.models_resources, feature_sets)))
 
         all_drop_columns : Set[str] = set()
         for feature_set in self.feature_sets:
@@ -1,8 +1,11 @@
 import math
 import os
+import glob
+import json
 import abc
 import pickle
 import argparse
+import tempfile
 import warnings
 
 from tqdm import tqdm
@@ -12,12 +15,16 @@ import pandas as pd
 
 # Local Modules
 import modules_abstraction.module_scorer        as module_scorer
+import modules_abstraction.module_search        as module_search
+import modules_abstraction.module_executor      as module_executor
 import modules_abstraction.module_profiling     as module_profiling
 import modules_abstraction.module_classifier    as module_classifier
 import modules_abstraction.module_variations    as module_variations
 import modules_abstraction.module_featureset    as module_featureset
 # Local Modules - Auxiliary
 import modules_aux.module_load      as module_load
+import modules_aux.module_scratch   as module_scratch
+import modules_aux.module_results   as module_results
 import modules_aux.module_exporter  as module_exporter
 
 # =================================== PACKAGES PARAMETERS ===================================
@@ -38,11 +45,95 @@ VARIATIONS_FILTER_BY_INDEX  :   Optional[List[int]] = None
 PICKLE_EXTENSION = '.pkl'
 
 PARALLEL_FEATURE_SETS_FILE      = 'tmp_feature_set' + PICKLE_EXTENSION
+PARALLEL_FEATURE_SET_FILE       = 'tmp_feature_set - {0}' + PICKLE_EXTENSION
+PARALLEL_PLAN_FILE              = 'tmp_plan.json'
 PARALLEL_NUMBER_VARIATIONS_FILE = 'tmp_number_variations.txt'
-
-PARALLEL_FEATURE_EXTRACTION = 'FEATURE_EXTRACTION'
-PARALLEL_RUN_MODELS         = 'RUN_MODELS'
-PARALLEL_RUN_FINAL          = 'RUN_FINAL'
+PARALLEL_JOB_CLASSES_FILE       = 'tmp_variations_job_classes.txt'
+# Results of the variations, one store published by each job as it concludes (executions before it left one pickle per variation)
+PARALLEL_RESULTS_DIRECTORY      = 'tmp_results'
+# Stores of every job merged by the final aggregation, to be queried once the execution is over
+PARALLEL_RESULTS_FILE           = 'tmp_results.sqlite'
+
+PARALLEL_FEATURE_EXTRACTION     = 'FEATURE_EXTRACTION'
+PARALLEL_RUN_MODELS             = 'RUN_MODELS'
+PARALLEL_RUN_FINAL              = 'RUN_FINAL'
+# Pipeline executed as a dependency graph, with one extraction job per feature set
+PARALLEL_PLAN                   = 'PLAN'
+PARALLEL_EXTRACT_FEATURE_SET    = 'EXTRACT_FEATURE_SET'
+
+PARALLEL_REQUIRES_FEATURE_SETS  = [PARALLEL_FEATURE_EXTRACTION, PARALLEL_PLAN, PARALLEL_EXTRACT_FEATURE_SET]
+
+# Directories of a job written to node-local scratch, and where they are shipped back to (the store last, marking the job as complete)
+SCRATCH_RESULTS                 = 'results'
+SCRATCH_STORE                   = 'store'
+
+# Indexes given to 'RUN_MODELS' as comma separated parts: '7', ranges '0-99', shards '3%8' (k mod n) or files '@indexes.txt'
+INDEXES_SEPARATOR               = ','
+INDEXES_RANGE                   = '-'
+INDEXES_SHARD                   = '%'
+INDEXES_FILE                    = '@'
+
+# Pickles held by a worker daemon ('worker_daemon.py'), inherited by every job it forks
+PICKLES_CACHE : Dict[str, Tuple[float, Any]] = {}
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def load_pickle(full_path: str) -> Any:
+
+    cache_key = os.path.abspath(full_path)
+    modification_time = os.path.getmtime(full_path)
+    if cache_key in PICKLES_CACHE and PICKLES_CACHE[cache_key][0] == modification_time: return PICKLES_CACHE[cache_key][1]
+
+    file = open(full_path, 'rb')
+    content = pickle.load(file)
+    file.close()
+    return content
+
+def parse_indexes(specification: str, number_indexes: int) -> List[int]:
+
+    indexes : List[int] = []
+    for part in specification.strip().split(INDEXES_SEPARATOR):
+        part = part.strip()
+        if part == '': continue
+
+        # Files list indexes (or any other part) separated by commas or white space
+        if part.startswith(INDEXES_FILE):
+            if not os.path.exists(part[1:]): exit(f"🚨 File with indexes '{part[1:]}' not found")
+            file = open(part[1:], 'r')
+            content = file.read()
+            file.close()
+            indexes.extend(parse_indexes(INDEXES_SEPARATOR.join(content.replace(INDEXES_SEPARATOR, ' ').split()), number_indexes))
+            continue
+
+        try:
+            if INDEXES_SHARD in part:
+                shard, number_shards = map(int, part.split(INDEXES_SHARD))
+                if number_shards <= 0 or not 0 <= shard < number_shards: exit(f"🚨 Shard '{part}' is not valid")
+                indexes.extend(range(shard, number_indexes, number_shards))
+            elif INDEXES_RANGE in part[1:]:
+                start, end = map(int, part.split(INDEXES_RANGE))
+                indexes.extend(range(start, end + 1))
+            else: indexes.append(int(part))
+        except ValueError: exit(f"🚨 Indexes '{part}' not recognized")
+
+    for index in indexes:
+        if not 0 <= index < number_indexes: exit(f"🚨 Index '{index}' out of range, only {number_indexes} available")
+    # Repeated indexes are run once, in order of first appearance
+    return list(dict.fromkeys(indexes))
+
+def cache_feature_sets(directory_path: str) -> None:
+
+    # Feature sets are written by extraction jobs during the execution, hence new ones are picked up on every call
+    file_names = [PARALLEL_FEATURE_SETS_FILE, PARALLEL_FEATURE_SET_FILE.format('*')]
+    for full_path in sorted(set(path for file_name in file_names for path in glob.glob(os.path.join(glob.escape(directory_path), file_name)))):
+        cache_key = os.path.abspath(full_path)
+        modification_time = os.path.getmtime(full_path)
+        if cache_key in PICKLES_CACHE and PICKLES_CACHE[cache_key][0] == modification_time: continue
+
+        # Files still being written fail to load, jobs then load them on their own
+        try: PICKLES_CACHE[cache_key] = (modification_time, load_pickle(full_path))
+        except (EOFError, pickle.UnpicklingError): continue
+        print(f"📦 Feature sets held from '{full_path}'", flush=True)
 
 # =================================== PRIVATE CLASSES ===================================
 
@@ -185,8 +276,8 @@ class ModelAbstraction(metaclass=abc.ABCMeta):
         self.feature_sets = feature_sets
         self.generate_variations()
 
-    def generate_variations(self):
-        variation_features = list(map(lambda feature_set: feature_set.id, self.feature_sets))
+    def generate_variations(self, variation_features: Optional[List[str]] = None):
+        if variation_features is None: variation_features = list(map(lambda feature_set: feature_set.id, self.feature_sets))
         variation_generator = module_variations.VariationGenerator(self.arguments.variations_key, self.VARIATIONS_BY_KEY,
             self.VARIATION_TASKS, self.VARIATION_GENDERS, self.VARIATION_DATA, variation_features, self.VARIATION_CLASSIFIERS, self.VARIATION_PREPROCESSING)
 
@@ -215,6 +306,7 @@ class ModelAbstraction(metaclass=abc.ABCMeta):
         if timestamp_argument is not None: module_exporter.change_execution_timestamp(timestamp_argument)
         checkpoint_argument = arguments.data_checkpoint
         if checkpoint_argument is not None: module_exporter.change_checkpoint_directory(checkpoint_argument)
+        self.search : module_search.SearchStrategy = module_search.create_search(arguments.search, arguments.search_seed, arguments.search_budget)
 
     def init_execution(self) -> None:
         # Load Informations
@@ -222,12 +314,13 @@ class ModelAbstraction(metaclass=abc.ABCMeta):
         self.load_subjects_info()
         self.load_subjects_paths()
 
-    def study_feature_sets(self):
+    def study_feature_sets(self, feature_sets: Optional[List[module_featureset.FeatureSetAbstraction]] = None):
 
         print()
         print("🚀 Running datasets profiling ...")
 
-        for feature_set in self.feature_sets:
+        if feature_sets is None: feature_sets = self.feature_sets
+        for feature_set in feature_sets:
 
             feature_key : str = feature_set.id
             print("🚀 Running profiling of '{0}' dataset".format(feature_key))
@@ -239,66 +332,122 @@ class ModelAbstraction(metaclass=abc.ABCMeta):
             profiler = module_profiling.DatasetProfiling(feature_df, target_df)
             profiler.make_profiling()
 
-    def run_variation(self, variation: module_variations.Variation) -> List[Tuple[str, module_scorer.Scorer, module_variations.Variation]]:
+    def group_variations_by_dataset(self, variations: List[module_variations.Variation]) -> Dict[str, List[int]]:
+
+        # Indexes of the variations sharing each dataset, in order of first appearance
+        groups : Dict[str, List[int]] = {}
+        for variation_index, variation in enumerate(variations):
+            groups.setdefault(variation.generate_code_prepared_dataset(), []).append(variation_index)
+        return groups
+
+    def get_feature_set(self, variation: module_variations.Variation) -> module_featureset.FeatureSetAbstraction:
 
-        print("🚀 Running variation '{0}'".format(variation.generate_code()))
         feature_sets_filter = list(filter(lambda feature_set: feature_set.id == variation.features_code, self.feature_sets))
         if len(feature_sets_filter) == 0: exit(f"🚨 Feature set with key '{variation.features_code}' not found in model feature_sets")
-        feature_set : module_featureset.FeatureSetAbstraction = feature_sets_filter[0]
+        return feature_sets_filter[0]
 
-        module_exporter.change_current_directory([variation.generate_code(), 'Feature Extraction'])
-        dataframe_X, dataframe_Y = feature_set.get_full_df(variation)
+    def prepare_dataset(self, variation: module_variations.Variation) -> module_featureset.PreparedDataset:
 
-        # Generate Sub Variations if required
-        variations_to_run : List[module_variations.Variation] = [ variation ]
-        if variation.study_features_importance:
-            variations_to_run = variation.generate_sub_variations(dataframe_X.columns)
-
-        # Return value
-        best_scorers : List[Tuple[str, module_scorer.Scorer, module_variations.Variation]] = []
+        feature_set = self.get_feature_set(variation)
 
-        for variation_to_run in variations_to_run:
+        module_exporter.change_current_directory([variation.generate_code(), 'Feature Extraction'])
+        dataframe_X, dataframe_Y = feature_set.get_full_df(variation)
+        data_splits = list(module_classifier.leave_one_out(dataframe_X))
+        return module_featureset.PreparedDataset(feature_set, variation, dataframe_X, dataframe_Y, data_splits)
 
-            if variation.study_features_importance:
-                print("🚀 Running sub variation '{0}'".format(variation_to_run.generate_code()))
+    def profile_dataset(self, variation: module_variations.Variation, prepared_dataset: module_featureset.PreparedDataset):
 
-            # Do profiling of current dataset
-            module_exporter.change_current_directory([variation_to_run.generate_code(), 'Data Profiling'])
+        # Only done once for variations sharing the dataset, the others receive a copy of its exports
+        module_exporter.change_current_directory([variation.generate_code(), 'Data Profiling'])
+        if prepared_dataset.get_profiling_directory() is None:
             print("🚀 Running profiling ...")
+            dataframe_X, dataframe_Y = prepared_dataset.get_full_df()
             profiler = module_profiling.DatasetProfiling(dataframe_X, dataframe_Y, fast=True)
             profiler.make_profiling()
+            prepared_dataset.set_profiling_directory(module_exporter.get_current_path())
+        else: module_exporter.copy_to_current_path(prepared_dataset.get_profiling_directory())
+
+    def run_variation(self, variation: module_variations.Variation, prepared_dataset: Optional[module_featureset.PreparedDataset] = None) -> List[Tuple[str, module_scorer.Scorer, module_variations.Variation]]:
 
-            # Running the classifier itself
-            print("🚀 Running model ...")
-            data_splits = list(module_classifier.leave_one_out(dataframe_X))
-            classifier = variation_to_run.develop_classifier(['Psychosis', 'Control'])
-            for (split_index, (train_index, test_index)) in enumerate(tqdm(data_splits, desc="👉 Running classifier:", leave=False)):
-                module_exporter.change_current_directory([variation_to_run.generate_code(), 'Feature Extraction', f'split {split_index}'])
-                (X_train, y_train), (X_test, y_test) = feature_set.get_df_for_classification(variation_to_run, split_index, (train_index, test_index))
-
-                # Skip if column to "study" does not exit
-                if (variation_to_run.study_features_importance) and (variation_to_run.study_feature_importance is not None) and (variation_to_run.study_feature_importance not in X_train.columns):
-                    continue
-
-                if variation_to_run.study_features_importance: X_test = variation_to_run.random_for_feature_importance(X_train, X_test)
-                classifier.process_iteration(X_train, y_train, X_test, y_test)
-
-            # Export Classifier Variations Results
-            module_exporter.change_current_directory([variation_to_run.generate_code(), 'Classifier'])
-            variation_summary = { 'Key': variation_to_run.generate_code(), 'Classifier': variation_to_run.classifier_code, 
-                'Features': variation_to_run.features_code, 'Tasks': variation_to_run.tasks_code, 'Genders': variation_to_run.genders_code, 'Data': variation_to_run.data_code,
-                'Repetition': str(variation_to_run.repetition), 'Feature Importance': str(variation_to_run.study_feature_importance) }
-            classifier.export_variations_results(variation_summary, self.TARGET_METRIC)
-            # Export Best Classifier Variation Results
-            best_scorer_key, best_scorer = classifier.get_best_scorer(self.TARGET_METRIC)
-            best_scorer.export_results('results')
-            if variation.record_subjects: best_scorer.export_subjects_results('subjects-results')
-
-            best_scorers.append((best_scorer_key, best_scorer, variation_to_run))
+        print("🚀 Running variation '{0}'".format(variation.generate_code()))
+        if prepared_dataset is None: prepared_dataset = self.prepare_dataset(variation)
+        elif prepared_dataset.get_code() != variation.generate_code_prepared_dataset():
+            exit(f"🚨 Dataset '{prepared_dataset.get_code()}' can not be used by variation '{variation.generate_code()}'")
+        dataframe_X, dataframe_Y = prepared_dataset.get_full_df()
+
+        # Do profiling of current dataset
+        self.profile_dataset(variation, prepared_dataset)
+
+        # Running the classifier itself
+        print("🚀 Running model ...")
+        data_splits = prepared_dataset.get_data_splits()
+        classifier = variation.develop_classifier(['Psychosis', 'Control'])
+        # Features importance is studied once the search concluded, permuting each feature on the test rows of every split
+        if variation.study_features_importance: classifier.study_features_importance(['Psychosis', 'Control'], list(dataframe_X.columns), self.search.seed)
+        classifier.set_train_scoring(self.arguments.train_scoring, self.arguments.train_sample, self.search.seed)
+
+        def get_split(split_index: int) -> Optional[module_search.Split]:
+            module_exporter.change_current_directory([variation.generate_code(), 'Feature Extraction', f'split {split_index}'])
+            (X_train, y_train), (X_test, y_test) = prepared_dataset.get_split_df(split_index)
+            return (X_train, y_train, X_test, y_test)
+
+        self.search.run(classifier, len(data_splits), get_split, self.TARGET_METRIC)
+        best_scorer_key, best_scorer = classifier.get_best_scorer(self.TARGET_METRIC)
+        # Train set of the best variation, when it is the only one scored there, and features importance in the same final pass
+        importance_scorers = classifier.score_best_variation(best_scorer_key, len(data_splits), get_split)
+
+        # Export Classifier Variations Results
+        module_exporter.change_current_directory([variation.generate_code(), 'Classifier'])
+        variation_summary = { 'Key': variation.generate_code(), 'Classifier': variation.classifier_code, 
+            'Features': variation.features_code, 'Tasks': variation.tasks_code, 'Genders': variation.genders_code, 'Data': variation.data_code,
+            'Repetition': str(variation.repetition), 'Feature Importance': str(variation.study_feature_importance) }
+        classifier.export_variations_results(variation_summary, self.TARGET_METRIC)
+        # Export Best Classifier Variation Results
+        best_scorer.export_results('results')
+        if variation.record_subjects: best_scorer.export_subjects_results('subjects-results')
+
+        # Return value
+        best_scorers : List[Tuple[str, module_scorer.Scorer, module_variations.Variation]] = [ (best_scorer_key, best_scorer, variation) ]
+        if variation.study_features_importance:
+            # Each feature is reported as a sub variation, scored by the best variation refitted on each split on its permuted rows
+            best_score = module_search.get_score(best_scorer, self.TARGET_METRIC)
+            importance_summary : List[Dict[str, Any]] = []
+            best_scorers = []
+            for sub_variation in variation.generate_sub_variations(list(dataframe_X.columns)):
+                feature_scorer = importance_scorers[sub_variation.study_feature_importance]
+                # Features not found on any split have nothing to report
+                if feature_scorer.get_number_folds() == 0: continue
+                module_exporter.change_current_directory([sub_variation.generate_code(), 'Classifier'])
+                feature_scorer.export_results('results')
+                if variation.record_subjects: feature_scorer.export_subjects_results('subjects-results')
+
+                feature_score = module_search.get_score(feature_scorer, self.TARGET_METRIC)
+                importance_summary.append({ 'Feature': sub_variation.study_feature_importance, self.TARGET_METRIC: feature_score, f'{self.TARGET_METRIC} Drop': best_score - feature_score })
+                best_scorers.append((best_scorer_key, feature_scorer, sub_variation))
+
+            module_exporter.change_current_directory([variation.generate_code(), 'Classifier'])
+            module_exporter.export_csv(pd.DataFrame(importance_summary), 'features importance', False)
 
         print("✅ Completed variation")
         return best_scorers
 
+    def record_variation(self, variation: module_variations.Variation, prepared_dataset: Optional[module_featureset.PreparedDataset] = None) -> List[Dict[str, Any]]:
+
+        variations_records : List[Dict[str, Any]] = []
+        for best_scorer_key, best_scorer, variation_ran in self.run_variation(variation, prepared_dataset):
+            # Update General Scores
+            variation_summary = { 'Key': variation_ran.generate_code(), 'Classifier': variation_ran.classifier_code, 'Classifier Variation': best_scorer_key,
+                'Features': variation_ran.features_code, 'Tasks': variation_ran.tasks_code, 'Genders': variation_ran.genders_code, 'Data': variation_ran.data_code,
+                'Repetition': str(variation_ran.repetition), 'Feature Importance': str(variation_ran.study_feature_importance) }
+            for score in best_scorer.export_metrics(module_scorer.ScorerSet.Test): variation_summary[score['name']] = score['score']
+            # Besides the summary, the scores of both sets and the predictions by subject are kept by the results store
+            variations_records.append({ 'summary': variation_summary, 'subjects': best_scorer.get_subjects_df(),
+                'metrics': { scorer_set.name: best_scorer.export_metrics(scorer_set) for scorer_set in module_scorer.ScorerSet } })
+        return variations_records
+
+    def summarize_variation(self, variation: module_variations.Variation, prepared_dataset: Optional[module_featureset.PreparedDataset] = None) -> List[Dict[str, Any]]:
+        return [ variation_record['summary'] for variation_record in self.record_variation(variation, prepared_dataset) ]
+
     def export_final_results(self):
 
         print()
@@ -321,20 +470,47 @@ class SequentialModel(ModelAbstraction):
         # Run Super Initialization
         super().__init__(arguments)
 
+        # Workers are forked now, before any feature set is extracted or loaded
+        self.executor : Optional[module_executor.VariationsExecutor] = None
+        parallel_jobs = arguments.parallel_jobs
+        if parallel_jobs is not None and parallel_jobs > 1 and not arguments.print_variations:
+            self.executor = module_executor.VariationsExecutor(parallel_jobs,
+                lambda variation, prepared_dataset: self.summarize_variation(variation, prepared_dataset))
+
     def run_variations(self):
 
         print()
         print("🚀 Running solution variations ...")
 
-        for variation in self.variations_to_test:
+        # Variations sharing a dataset are run together, building its matrices and splits only once
+        variations_results : Dict[int, List[Dict[str, Any]]] = {}
+        groups = list(self.group_variations_by_dataset(self.variations_to_test).values())
+        if self.executor is not None:
+            variations_results = self.run_variations_in_executor(groups)
+
+        else:
+            for variation_indexes in groups:
+                prepared_dataset : Optional[module_featureset.PreparedDataset] = None
+                for variation_index in variation_indexes:
+                    variation = self.variations_to_test[variation_index]
+                    if prepared_dataset is None: prepared_dataset = self.prepare_dataset(variation)
+                    variations_results[variation_index] = self.summarize_variation(variation, prepared_dataset)
+
+        # Results kept in the order of the variations
+        for variation_index in sorted(variations_results): self.variations_results.extend(variations_results[variation_index])
+
+    def run_variations_in_executor(self, groups: List[List[int]]) -> Dict[int, List[Dict[str, Any]]]:
+
+        print(f"🚀 Running variations on {self.executor.number_jobs} processes ...")
 
-            for best_scorer_key, best_scorer, variation_ran in self.run_variation(variation):
-                # Update General Scores
-                variation_summary = { 'Key': variation_ran.generate_code(), 'Classifier': variation_ran.classifier_code, 'Classifier Variation': best_scorer_key,
-                    'Features': variation_ran.features_code, 'Tasks': variation_ran.tasks_code, 'Genders': variation_ran.genders_code, 'Data': variation_ran.data_code,
-                    'Repetition': str(variation_ran.repetition), 'Feature Importance': str(variation_ran.study_feature_importance) }
-                for score in best_scorer.export_metrics(module_scorer.ScorerSet.Test): variation_summary[score['name']] = score['score']
-                self.variations_results.append(variation_summary)
+        def prepare(variation_index: int) -> module_featureset.PreparedDataset:
+            # Prepared and profiled here, workers then attach the published frame and develop its splits themselves
+            variation = self.variations_to_test[variation_index]
+            prepared_dataset = self.prepare_dataset(variation)
+            self.profile_dataset(variation, prepared_dataset)
+            return prepared_dataset
+
+        return self.executor.execute(groups, self.variations_to_test, prepare)
 
     def execute(self, feature_sets: Optional[List[module_featureset.FeatureSetAbstraction]] = None):
 
@@ -360,18 +536,52 @@ class SequentialModel(ModelAbstraction):
 
 class ParallelModel(ModelAbstraction):
 
+    scratch_directory       : Optional[str]     = None
+    scratch_job_directory   : Optional[str]     = None
+    scratch_destinations    : Dict[str, str]    = {}
+
+    # Store written by this job, and where it is published to
+    results_store           : Optional[module_results.ResultsStore]     = None
+    results_store_path      : Optional[str]                             = None
+    executed_codes          : Optional[Set[str]]                        = None
+
     def __init__(self, arguments: argparse.Namespace) -> None:
         # Run Super Initialization
         super().__init__(arguments)
 
+    def init_scratch(self, scratch_directory: str):
+
+        # Checkpoints keep being loaded from the shared results, everything else is written to the job directory
+        self.scratch_directory = scratch_directory
+        self.scratch_job_directory = module_scratch.create_job_directory(scratch_directory)
+        # Absolute, since the bundle may be unpacked by a manager running elsewhere on the shared file system
+        self.scratch_destinations = { SCRATCH_RESULTS: os.path.abspath(module_exporter.EXPORT_DIRECTORY),
+            SCRATCH_STORE: os.path.abspath(module_exporter.get_tmp_directory([PARALLEL_RESULTS_DIRECTORY])) }
+        if module_exporter.CHECKPOINT_DIRECTORY is None:
+            module_exporter.change_checkpoint_directory(module_exporter.get_checkpoint_load_directory())
+        module_exporter.change_export_directory(os.path.join(self.scratch_job_directory, SCRATCH_RESULTS))
+
+    def ship_scratch(self):
+
+        # Handed to the parallelization manager when executed by it, otherwise unpacked by the job itself
+        bundle_path = os.environ.get(module_scratch.BUNDLE_VARIABLE, None)
+        # The store is shipped within the bundle, variations only count as executed once it is unpacked
+        if self.results_store is not None: self.results_store.close()
+        module_scratch.ship(self.scratch_job_directory, self.scratch_destinations, bundle_path)
+        self.scratch_job_directory = None
+        self.results_store = None
+
+    def get_input_path(self, full_path: str) -> str:
+
+        # Pickles held by a worker daemon are used as they are, others are staged to the node-local scratch
+        if self.scratch_directory is None or os.path.abspath(full_path) in PICKLES_CACHE: return full_path
+        return module_scratch.stage_file(full_path, self.scratch_directory)
+
     def load_feature_sets_from_memory(self):
 
         directory_path = module_exporter.get_tmp_directory()
         full_path = os.path.join(directory_path, PARALLEL_FEATURE_SETS_FILE)
-
-        file = open(full_path, 'rb')
-        self.load_feature_sets(pickle.load(file))
-        file.close()
+        self.load_feature_sets(load_pickle(self.get_input_path(full_path)))
 
     def save_feature_sets(self):
 
@@ -382,6 +592,90 @@ class ParallelModel(ModelAbstraction):
         pickle.dump(self.feature_sets, file)
         file.close()
 
+    def save_feature_set(self, feature_set: module_featureset.FeatureSetAbstraction):
+
+        directory_path = module_exporter.get_tmp_directory()
+        full_path = os.path.join(directory_path, PARALLEL_FEATURE_SET_FILE.format(feature_set.id))
+
+        file = open(full_path, 'wb')
+        pickle.dump(feature_set, file)
+        file.close()
+
+    def load_feature_set_from_memory(self, feature_set_id: str):
+
+        directory_path = module_exporter.get_tmp_directory()
+        full_path = os.path.join(directory_path, PARALLEL_FEATURE_SET_FILE.format(feature_set_id))
+        if not os.path.exists(full_path):
+            exit(f"🚨 File for feature set '{feature_set_id}' not found in '{directory_path}'")
+        self.feature_sets = [ load_pickle(self.get_input_path(full_path)) ]
+
+    def get_extraction_order(self) -> List[module_featureset.FeatureSetAbstraction]:
+
+        # Merged feature sets come after the feature sets they are built from
+        extraction_order : List[module_featureset.FeatureSetAbstraction] = []
+        for feature_set in self.feature_sets:
+            components = feature_set.feature_sets if isinstance(feature_set, module_featureset.MergedFeatureSetAbstraction) else []
+            for candidate in components + [feature_set]:
+                if candidate.id not in map(lambda extracted: extracted.id, extraction_order): extraction_order.append(candidate)
+
+        return extraction_order
+
+    def save_plan(self):
+
+        extraction_order = self.get_extraction_order()
+        extraction_indexes : Dict[str, int] = dict((feature_set.id, index) for index, feature_set in enumerate(extraction_order))
+
+        extractions : List[Dict[str, Any]] = []
+        for feature_set in extraction_order:
+            components = feature_set.feature_sets if isinstance(feature_set, module_featureset.MergedFeatureSetAbstraction) else []
+            extractions.append({ 'feature_set': feature_set.id, 'after': [ extraction_indexes[component.id] for component in components ],
+                'resources': feature_set.extraction_resources })
+
+        feature_sets_by_id = dict((feature_set.id, feature_set) for feature_set in self.feature_sets)
+        variations : List[Dict[str, Any]] = []
+        for variation in self.variations_to_test:
+            variations.append({ 'feature_set': variation.features_code, 'after': extraction_indexes[variation.features_code],
+                'job_class': variation.generate_code_job_class(), 'resources': feature_sets_by_id[variation.features_code].models_resources })
+
+        directory_path = module_exporter.get_tmp_directory()
+        full_path = os.path.join(directory_path, PARALLEL_PLAN_FILE)
+
+        file = open(full_path, 'w')
+        json.dump({ 'feature_sets': list(map(lambda feature_set: feature_set.id, self.feature_sets)),
+            'extractions': extractions, 'variations': variations }, file, indent=1)
+        file.close()
+
+    def load_plan(self) -> Optional[Dict[str, Any]]:
+
+        # Only available when the pipeline is executed as a dependency graph
+        directory_path = module_exporter.get_tmp_directory()
+        full_path = os.path.join(directory_path, PARALLEL_PLAN_FILE)
+        if not os.path.exists(full_path): return None
+
+        file = open(full_path, 'r')
+        plan = json.load(file)
+        file.close()
+        return plan
+
+    def extract_feature_set(self, index: int):
+
+        extraction_order = self.get_extraction_order()
+        if index >= len(extraction_order):
+            exit(f"🚨 Extraction index '{index}' out of range, only {len(extraction_order)} feature sets exist")
+        feature_set = extraction_order[index]
+
+        # Feature sets it is built from were extracted by previous jobs and are loaded from their checkpoints
+        self.init_execution()
+        components = feature_set.feature_sets if isinstance(feature_set, module_featureset.MergedFeatureSetAbstraction) else []
+        for candidate in components + [feature_set]:
+            candidate.init_execution(self.subjects_paths, self.PREFERENCE_AUDIO_TRACKS,
+                self.PREFERENCE_TRANS, self.EXTENSION_TRANS, self.subjects_infos, self.GENERAL_DROP_COLUMNS)
+        feature_set.develop_static_df()
+
+        if feature_set.id in map(lambda variation_feature_set: variation_feature_set.id, self.feature_sets):
+            self.study_feature_sets([feature_set])
+            self.save_feature_set(feature_set)
+
     def save_number_of_variations(self):
 
         directory_path = module_exporter.get_tmp_directory()
@@ -390,41 +684,116 @@ class ParallelModel(ModelAbstraction):
         file = open(full_path, 'w')
         file.write(str(len(self.variations_to_test)))
         file.close()
-    
-    def run_variation_by_index(self, index: int):
 
-        variation = self.variations_to_test[index]
-        # Check whether variation has already been executed and saved, if so exit out
+    def save_variations_job_classes(self):
+
         directory_path = module_exporter.get_tmp_directory()
-        full_path = os.path.join(directory_path, variation.generate_code() + PICKLE_EXTENSION)
+        full_path = os.path.join(directory_path, PARALLEL_JOB_CLASSES_FILE)
+
+        # One line per variation index, used by the parallelization manager to estimate execution times
+        file = open(full_path, 'w')
+        for variation in self.variations_to_test: file.write(variation.generate_code_job_class() + '\n')
+        file.close()
+    
+    def get_results_stores(self) -> module_results.ResultsStores:
+        return module_results.ResultsStores(module_exporter.get_tmp_directory([PARALLEL_RESULTS_DIRECTORY]))
+
+    def get_results_store(self) -> module_results.ResultsStore:
+
+        # Written by this job alone, on node-local storage, and published as a whole
+        if self.results_store is None:
+            store_name = module_results.create_store_name()
+            if self.scratch_job_directory is not None:
+                os.makedirs(os.path.join(self.scratch_job_directory, SCRATCH_STORE), exist_ok=True)
+                self.results_store = module_results.ResultsStore(os.path.join(self.scratch_job_directory, SCRATCH_STORE, store_name))
+                self.results_store_path = None
+            else:
+                self.results_store = module_results.ResultsStore(os.path.join(tempfile.gettempdir(), store_name))
+                self.results_store_path = os.path.join(module_exporter.get_tmp_directory([PARALLEL_RESULTS_DIRECTORY]), store_name)
+        return self.results_store
+
+    def is_variation_executed(self, index: int) -> bool:
+
+        # Results of executed variations are published to the shared temporary directory, allowing executions to be resumed
+        variation_code = self.variations_to_test[index].generate_code()
+        if self.executed_codes is None: self.executed_codes = self.get_results_stores().get_codes()
+        if variation_code in self.executed_codes:
+            print(f"✅ Variation has already been executed since it is already in the results store!")
+            return True
+        directory_path = module_exporter.get_tmp_directory()
+        full_path = os.path.join(directory_path, variation_code + PICKLE_EXTENSION)
         if os.path.exists(full_path) and os.path.isfile(full_path):
             print(f"✅ Variation has already been executed since file '{full_path}' already exists!")
-            return
-        
-        variations_summary : List[Dict[str, Any]] = []
-        # Run Variation
-        for best_scorer_key, best_scorer, variation_ran in self.run_variation(variation):
-            # Update General Scores
-            variation_summary = { 'Key': variation_ran.generate_code(), 'Classifier': variation_ran.classifier_code, 'Classifier Variation': best_scorer_key,
-                'Features': variation_ran.features_code, 'Tasks': variation_ran.tasks_code, 'Genders': variation_ran.genders_code, 'Data': variation_ran.data_code,
-                'Repetition': str(variation_ran.repetition), 'Feature Importance': str(variation_ran.study_feature_importance) }
-            for score in best_scorer.export_metrics(module_scorer.ScorerSet.Test): variation_summary[score['name']] = score['score']
-            variations_summary.append(variation_summary)
+            return True
+        return False
 
-        # Save Temporarily Variation Summary
-        file = open(full_path, 'wb')
-        pickle.dump(variations_summary, file)
-        file.close()
+    def run_variation_by_index(self, index: int, prepared_dataset: Optional[module_featureset.PreparedDataset] = None):
+
+        variation = self.variations_to_test[index]
+        # Check whether variation has already been executed and saved, if so exit out
+        if self.is_variation_executed(index): return
+
+        # Run Variation
+        variation_records = self.record_variation(variation, prepared_dataset)
+
+        # Save Variation Results, published right away unless shipped within the scratch bundle
+        results_store = self.get_results_store()
+        results_store.add_variation(variation.generate_code(), index, variation_records)
+        if self.results_store_path is not None: results_store.publish(self.results_store_path)
+        if self.executed_codes is not None: self.executed_codes.add(variation.generate_code())
+
+    def close_results_store(self):
+
+        # Once published, the node-local copy of the store is no longer needed
+        if self.results_store is None: return
+        self.results_store.close()
+        if self.results_store_path is not None: os.remove(self.results_store.path)
+        self.results_store = None
+
+    def run_variations_by_indexes(self, indexes: List[int], plan: Optional[Dict[str, Any]]):
+
+        pending_indexes = [ index for index in indexes if not self.is_variation_executed(index) ]
+        if len(pending_indexes) == 0: return
+        print(f"🚀 Running {len(pending_indexes)} of {len(indexes)} variations in the same process ...")
+
+        # Variations using the same feature set and then the same dataset are run one after the other, so that each is loaded once
+        def get_feature_set_id(index: int) -> str:
+            if plan is None: return ''
+            return plan['variations'][index]['feature_set']
+        pending_indexes.sort(key=lambda index: (get_feature_set_id(index), self.variations_to_test[index].generate_code_prepared_dataset()))
+
+        loaded_feature_set_id : Optional[str] = None
+        prepared_dataset : Optional[module_featureset.PreparedDataset] = None
+        for index in tqdm(pending_indexes, desc="👉 Running variations:", disable=len(pending_indexes) == 1):
+            if plan is not None and get_feature_set_id(index) != loaded_feature_set_id:
+                loaded_feature_set_id = get_feature_set_id(index)
+                self.load_feature_set_from_memory(loaded_feature_set_id)
+                prepared_dataset = None
+
+            variation = self.variations_to_test[index]
+            if prepared_dataset is None or prepared_dataset.get_code() != variation.generate_code_prepared_dataset():
+                prepared_dataset = self.prepare_dataset(variation)
+            self.run_variation_by_index(index, prepared_dataset)
 
     def load_variations_results(self):
 
-        # Iterate Variation Summaries which should have been created
+        # Summaries of every variation executed so far, read at once from the stores of the jobs, which are merged for later queries
+        results_stores = self.get_results_stores()
+        stored_summaries = results_stores.get_summaries()
         directory_path = module_exporter.get_tmp_directory()
+        results_stores.merge(os.path.join(directory_path, PARALLEL_RESULTS_FILE))
+        missing_variations : List[str] = []
         for variation in self.variations_to_test:
-            full_path = os.path.join(directory_path, variation.generate_code() + PICKLE_EXTENSION)
+            variation_code = variation.generate_code()
+            if variation_code in stored_summaries:
+                self.variations_results.extend(stored_summaries[variation_code])
+                continue
 
+            # Variations of executions previous to the results store
+            full_path = os.path.join(directory_path, variation_code + PICKLE_EXTENSION)
             if not os.path.exists(full_path):
-                exit(f"🚨 File for variation '{variation.generate_code()}' not found in '{directory_path}'")
+                missing_variations.append(variation_code)
+                continue
 
             file = open(full_path, 'rb')
             variations_summary = pickle.load(file)
@@ -432,6 +801,11 @@ class ParallelModel(ModelAbstraction):
             # Save back variation summary
             self.variations_results.extend(variations_summary)
 
+        # Results are exported while the execution is still running (or after some variations failed) as well
+        if len(missing_variations) == len(self.variations_to_test): exit(f"🚨 No variation has been executed yet in '{directory_path}'")
+        if len(missing_variations) != 0:
+            print(f"⚠️  Exporting partial results, {len(missing_variations)} of {len(self.variations_to_test)} variations not executed yet")
+
     def execute(self, feature_sets: Optional[List[module_featureset.FeatureSetAbstraction]] = None):
 
         # Get pertinent arguments
@@ -461,16 +835,48 @@ class ParallelModel(ModelAbstraction):
                 self.study_feature_sets()
                 self.save_feature_sets()
                 self.save_number_of_variations()
+                self.save_variations_job_classes()
+
+            elif parallelization == PARALLEL_PLAN:
+
+                if feature_sets is None:
+                    exit("🚨 Execute on 'ParallelModel' requires 'feature_sets'")
+
+                self.load_feature_sets(feature_sets)
+                self.save_plan()
+                self.save_number_of_variations()
+                self.save_variations_job_classes()
+
+            elif parallelization == PARALLEL_EXTRACT_FEATURE_SET:
+
+                if feature_sets is None:
+                    exit("🚨 Execute on 'ParallelModel' requires 'feature_sets'")
+                if parallelization_index is None:
+                    exit(f"🚨 Execute on 'ParallelModel' when '{PARALLEL_EXTRACT_FEATURE_SET}' requires argument 'parallelization_index'")
+
+                self.load_feature_sets(feature_sets)
+                self.extract_feature_set(int(parallelization_index))
 
             elif parallelization == PARALLEL_RUN_MODELS:
 
                 if parallelization_index is None:
                     exit(f"🚨 Execute on 'ParallelModel' when '{PARALLEL_RUN_MODELS}' requires argument 'parallelization_index'")
 
-                self.load_feature_sets_from_memory()
-                self.run_variation_by_index(int(parallelization_index))
+                scratch_directory = self.arguments.scratch_directory
+                if scratch_directory: self.init_scratch(scratch_directory)
+
+                # With a plan, only the feature sets required by the variations are loaded (and only once)
+                plan = self.load_plan()
+                if plan is None: self.load_feature_sets_from_memory()
+                else: self.generate_variations(plan['feature_sets'])
+                indexes = parse_indexes(str(parallelization_index), len(self.variations_to_test))
+                self.run_variations_by_indexes(indexes, plan)
+                if scratch_directory: self.ship_scratch()
+                else: self.close_results_store()
 
             elif parallelization == PARALLEL_RUN_FINAL:
-                self.load_feature_sets_from_memory()
+                plan = self.load_plan()
+                if plan is None: self.load_feature_sets_from_memory()
+                else: self.generate_variations(plan['feature_sets'])
                 self.load_variations_results()
                 self.export_final_results()
\ No newline at end of file
@@ -1,5 +1,11 @@
 import argparse
 
+from typing import Optional
+
+# Local Modules
+import modules_abstraction.module_search        as module_search
+import modules_abstraction.module_classifier    as module_classifier
+
 # Define Parser
 parser = argparse.ArgumentParser()
 # Define Arguments
@@ -16,9 +22,18 @@ parser.add_argument("-trans_bipolars",  help="path to transcription files from b
 parser.add_argument("-variations_key",          help="key for the generation of variations, by default all are created")
 parser.add_argument("-timestamp",               help="key for the timestamp identifier, if not given current timestamp is used")
 parser.add_argument("-parallelization_key",     help="key for the parallelized model, if not given is executed sequentially")
-parser.add_argument("-parallelization_index",   help="key index for the parallelized model, must be given if task is to be parallelized")
+parser.add_argument("-parallelization_index",   help="key index for the parallelized model, must be given if task is to be parallelized (models accept several: '0-99', '3%%8' or '@file', comma separated)")
 parser.add_argument("-print_variations",        help="tag as boolean to print only variations and their indexes", action='store_const', const=True, default=False)
 parser.add_argument("-data_checkpoint",         help="path to data checkpoint, if not given it is assumed that there is no checkpoint")
+parser.add_argument("-parallel_jobs",           help="number of processes running variations at once when executed sequentially (without 'parallelization_key'), by default one", type=int, default=1)
+parser.add_argument("-scratch_directory",       help="path to node-local scratch, if given parallelized models stage their inputs and write their outputs there, shipping them back as a single bundle")
+# Choices taken from the search strategies registry, accepting every strategy as soon as it is registered
+parser.add_argument("-search",                  help="strategy searching each classifier's parameters along the leave one out splits, by default every variation is evaluated on every split", choices=module_search.SEARCH_OPTIONS, default=module_search.SEARCH_EXHAUSTIVE)
+parser.add_argument("-search_seed",             help="seed of the search strategy (order of the splits and variations evaluated), by default zero", type=int, default=0)
+parser.add_argument("-search_budget",           help="number of parameters variations evaluated on every split by the 'random' and 'bayesian' searches, by default sixteen", type=int)
+# Choices taken from the classifier, which checks them again when the train scoring is set
+parser.add_argument("-train_scoring",           help="train set scored on every split by every variation ('full'), by none, by the best variation in a final pass ('best') or on a fixed sample of subjects ('sample'), by default 'full'", choices=module_classifier.TRAIN_SCORING_OPTIONS, default=module_classifier.TRAIN_SCORING_FULL)
+parser.add_argument("-train_sample",            help="number of subjects scored on the train set with 'sample' train scoring, by default thirty two", type=int)
 
 # Define Requirements
 arguments_requirements = [
@@ -33,18 +48,25 @@ arguments_requirements = [
     { 'key': 'trans_bipolars',      'help': 'path to transcriptions files from bipolars'},
 ]
 
-# Get Arguments and Map to Requirements
-arguments = parser.parse_args()
-arguments_dict = vars(arguments)
-for requirement in arguments_requirements:
-    requirement['arg'] = arguments_dict[requirement['key']]
-
-# Check Requirements if not simply printing variations
-if not arguments_dict['print_variations']:
-    if ( any(not req['arg'] for req in arguments_requirements) ):
-        print("🙏 Please provide a:")
-        for requirement in arguments_requirements:
-            print('\t\'{}\': {}'.format(requirement['key'], requirement['help']))
-        exit(1)
-
-def get_arguments() -> argparse.Namespace: return arguments
\ No newline at end of file
+# Parsed on the first request, so that the module can be imported ahead of time (e.g. by 'worker_daemon.py')
+arguments : Optional[argparse.Namespace] = None
+
+def get_arguments() -> argparse.Namespace:
+    global arguments
+    if arguments is not None: return arguments
+
+    # Get Arguments and Map to Requirements
+    arguments = parser.parse_args()
+    arguments_dict = vars(arguments)
+    for requirement in arguments_requirements:
+        requirement['arg'] = arguments_dict[requirement['key']]
+
+    # Check Requirements if not simply printing variations
+    if not arguments_dict['print_variations']:
+        if ( any(not req['arg'] for req in arguments_requirements) ):
+            print("🙏 Please provide a:")
+            for requirement in arguments_requirements:
+                print('\t\'{}\': {}'.format(requirement['key'], requirement['help']))
+            exit(1)
+
+    return arguments
\ No newline at end of file
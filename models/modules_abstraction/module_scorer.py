@@ -2,12 +2,45 @@ import numpy as np
 import pandas as pd
 
 from enum import Enum
-from typing import Dict, List
+from typing import Any, Dict, List, Optional
 
 # Local Modules - Auxiliary
 import modules_aux.module_exporter  as module_exporter
 
-# =================================== PRIVATE CLASS DEFINITIONS ===================================
+# =================================== CONSTANTS DEFINITION ===================================
+
+# Order of the confusion counts, indexed by '2 * label + prediction'
+POINTS_KEYS     : List[str] = [ 'true_negatives', 'false_positives', 'false_negatives', 'true_positives' ]
+METRICS_NAMES   : List[str] = [ 'Accuracy', 'Precision', 'Recall', 'Sensitivity', 'Specificity', 'F1-Measure', 'UAR' ]
+
+# =================================== PRIVATE METHODS ===================================
+
+def count_points(labels: Any, predictions: Any) -> np.ndarray:
+    # Confusion counts of each row of predictions (several variations predicting the same labels at once)
+    predictions = np.asarray(predictions, dtype=bool)
+    cells = 2 * np.asarray(labels, dtype=bool) + predictions
+    if cells.ndim == 1: return np.bincount(cells, minlength=4).reshape(1, 4)
+    number_rows = cells.shape[0]
+    cells = cells + 4 * np.arange(number_rows)[:, np.newaxis]
+    return np.bincount(cells.ravel(), minlength=4 * number_rows).reshape(number_rows, 4)
+
+def compute_metrics_from_points(points: np.ndarray) -> np.ndarray:
+
+    true_negatives, false_positives, false_negatives, true_positives = np.moveaxis(np.asarray(points, dtype=float), -1, 0)
+    numerators = np.stack([ true_positives + true_negatives, true_positives, true_positives, true_negatives ])
+    denominators = np.stack([ true_positives + true_negatives + false_positives + false_negatives,
+        true_positives + false_positives, true_positives + false_negatives, true_negatives + false_positives ])
+    # Zero when there is nothing to divide by, as each metric did when computed by itself
+    quotients = np.divide(numerators, denominators, out=np.zeros_like(numerators), where=denominators != 0)
+    accuracy, precision, recall, specificity = quotients
+
+    f1_sum = precision + recall
+    f1_measure = np.divide(2 * precision * recall, f1_sum, out=np.zeros_like(f1_sum), where=f1_sum != 0)
+    unweighted_average_recall = (recall + specificity) * 0.5
+
+    # Same order as 'METRICS_NAMES', along the last axis (not a number when there are no points, as for unscored train sets)
+    metrics = np.stack([ accuracy, precision, recall, recall, specificity, f1_measure, unweighted_average_recall ], axis=-1)
+    return np.where(np.expand_dims(denominators[0] == 0, -1), np.nan, metrics)
 
 # =================================== PUBLIC CLASS DEFINITIONS ===================================
 
@@ -16,97 +49,107 @@ class ScorerSet(Enum):
     Train = 0,
     Test = 1,
 
+class SubjectsStore():
+
+    # Outcome of each test subject by split, as typed arrays grown by doubling instead of a dictionary per subject
+    def __init__(self) -> None:
+        self.size       : int           = 0
+        self.keys       : np.ndarray    = np.empty(0, dtype=object)
+        self.folds      : np.ndarray    = np.empty(0, dtype=np.int32)
+        self.labels     : np.ndarray    = np.empty(0, dtype=bool)
+        self.predicted  : np.ndarray    = np.empty(0, dtype=bool)
+
+    def reserve(self, size: int) -> None:
+        if size <= len(self.folds): return
+        capacity = max(size, 2 * len(self.folds), 16)
+        for attribute in ['keys', 'folds', 'labels', 'predicted']:
+            array = getattr(self, attribute)
+            grown = np.empty(capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            setattr(self, attribute, grown)
+
+    def append(self, keys: np.ndarray, fold: int, labels: Any, predicted: Any) -> None:
+        start, end = self.size, self.size + len(keys)
+        self.reserve(end)
+        self.keys[start:end] = keys
+        self.folds[start:end] = fold
+        self.labels[start:end] = np.asarray(labels, dtype=bool)
+        self.predicted[start:end] = np.asarray(predicted, dtype=bool)
+        self.size = end
+
+    def __len__(self) -> int: return self.size
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Unused capacity is not pickled
+        return { 'size': self.size, 'keys': self.keys[:self.size], 'folds': self.folds[:self.size],
+            'labels': self.labels[:self.size], 'predicted': self.predicted[:self.size] }
+
+    def get_df(self) -> pd.DataFrame:
+        return pd.DataFrame({ 'key': self.keys[:self.size], 'label': self.labels[:self.size],
+            'predicted': self.predicted[:self.size], 'fold': self.folds[:self.size] })
+
 class Scorer():
 
     def __init__(self, categories: List[str]):
         self.categories = categories
-        # Scores - Train
-        self.train_true_positives   = 0.0
-        self.train_true_negatives   = 0.0
-        self.train_false_positives  = 0.0
-        self.train_false_negatives  = 0.0
-        # Scores - Test
-        self.test_true_positives    = 0.0
-        self.test_true_negatives    = 0.0
-        self.test_false_positives   = 0.0
-        self.test_false_negatives   = 0.0
+        # Integer confusion counts of each set, by number of samples of the splits they came from
+        # (each split weighs the same, its samples weighing one over its size)
+        self.counts : Dict[ScorerSet, Dict[int, np.ndarray]] = { scorer_set: {} for scorer_set in ScorerSet }
+        self.number_folds : int = 0
+        # Metrics are read several times (search, variations results, best variation) between additions
+        self.metrics_cache : Dict[ScorerSet, np.ndarray] = {}
         # Subjects' Information
-        self.subjects_results = []
-
-    def add_points(self, train_Y: pd.Series, train_pred_Y: pd.Series, test_Y: pd.Series, test_pred_Y: pd.Series):
-        
-        number_of_train_samples = len(train_Y)
-        for (train_y_elem, pred_Y_elem) in zip(train_Y, train_pred_Y):
-            
-            if train_y_elem and pred_Y_elem: self.train_true_positives += 1 / number_of_train_samples
-            elif not train_y_elem and pred_Y_elem: self.train_false_positives += 1 / number_of_train_samples
-            elif train_y_elem and not pred_Y_elem: self.train_false_negatives += 1 / number_of_train_samples
-            elif not train_y_elem and not pred_Y_elem: self.train_true_negatives += 1 / number_of_train_samples
-
-        number_of_test_samples = len(test_Y)
-        for (test_y_elem, pred_Y_elem) in zip(test_Y, test_pred_Y):
-            
-            if test_y_elem and pred_Y_elem: self.test_true_positives += 1 / number_of_test_samples
-            elif not test_y_elem and pred_Y_elem: self.test_false_positives += 1 / number_of_test_samples
-            elif test_y_elem and not pred_Y_elem: self.test_false_negatives += 1 / number_of_test_samples
-            elif not test_y_elem and not pred_Y_elem: self.test_true_negatives += 1 / number_of_test_samples
+        self.subjects_results : SubjectsStore = SubjectsStore()
 
-    def get_points_from_set(self, scorer_set: ScorerSet) -> Dict[str, float]:
+    def add_counts(self, scorer_set: ScorerSet, number_samples: int, counts: np.ndarray) -> None:
+        if number_samples == 0: return
+        set_counts = self.counts[scorer_set]
+        if number_samples not in set_counts: set_counts[number_samples] = np.zeros(4, dtype=np.int64)
+        set_counts[number_samples] += counts
+        self.metrics_cache.pop(scorer_set, None)
 
-        if scorer_set == ScorerSet.Train: return { 'true_positives': self.train_true_positives, 'true_negatives': self.train_true_negatives,
-            'false_positives': self.train_false_positives, 'false_negatives': self.train_false_negatives }
-        if scorer_set == ScorerSet.Test: return { 'true_positives': self.test_true_positives, 'true_negatives': self.test_true_negatives,
-            'false_positives': self.test_false_positives, 'false_negatives': self.test_false_negatives }
-
-    def number_points(self, scorer_set: ScorerSet) -> float:
-        points = self.get_points_from_set(scorer_set)
-        return sum(list(points.values()))
+    def add_points(self, train_Y: pd.Series, train_pred_Y: Optional[pd.Series], test_Y: pd.Series, test_pred_Y: pd.Series):
+        # Train predictions may be left out, when the train set is not scored
+        if train_pred_Y is not None: self.add_train_points(train_Y, train_pred_Y)
+        self.add_counts(ScorerSet.Test, len(test_Y), count_points(test_Y, test_pred_Y)[0])
+        self.number_folds += 1
 
-    def add_subjects_information(self, test_Y: pd.Series, test_pred_Y: pd.Series):
+    def add_train_points(self, train_Y: pd.Series, train_pred_Y: pd.Series):
+        self.add_counts(ScorerSet.Train, len(train_Y), count_points(train_Y, train_pred_Y)[0])
 
-        for (subject_key, test_y_elem, pred_Y_elem) in zip(test_Y.index, test_Y, test_pred_Y):
+    def get_points(self, scorer_set: ScorerSet) -> np.ndarray:
+        points = np.zeros(4, dtype=float)
+        for number_samples, counts in self.counts[scorer_set].items(): points += counts / number_samples
+        return points
 
-            subject_information = {
-                'key': subject_key,
-                'label': test_y_elem,
-                'predicted': pred_Y_elem
-            }
-
-            self.subjects_results.append(subject_information)
-
-    # ============================================= METRICS RETRIEVAL =============================================
-    def calculate_accuracy(self, scorer_set: ScorerSet) -> float:
-        points = self.get_points_from_set(scorer_set)
-        return (points['true_positives'] + points['true_negatives']) / self.number_points(scorer_set)
-
-    def calculate_precision(self, scorer_set: ScorerSet) -> float:
-        points = self.get_points_from_set(scorer_set)
-        if points['true_positives'] == 0 and points['false_positives'] == 0: return 0
-        return points['true_positives'] / (points['true_positives'] + points['false_positives'])
+    def get_points_from_set(self, scorer_set: ScorerSet) -> Dict[str, float]:
+        return dict(zip(POINTS_KEYS, self.get_points(scorer_set).tolist()))
 
-    def calculate_recall(self, scorer_set: ScorerSet) -> float:
-        points = self.get_points_from_set(scorer_set)
-        if points['true_positives'] == 0 and points['false_negatives'] == 0: return 0
-        return points['true_positives'] / (points['true_positives'] + points['false_negatives'])
+    def number_points(self, scorer_set: ScorerSet) -> float:
+        return float(self.get_points(scorer_set).sum())
 
-    def calculate_sensitivity(self, scorer_set: ScorerSet) -> float:
-        points = self.get_points_from_set(scorer_set)
-        if points['true_positives'] == 0 and points['false_negatives'] == 0: return 0
-        return points['true_positives'] / (points['true_positives'] + points['false_negatives'])
+    def get_number_folds(self) -> int: return self.number_folds
 
-    def calculate_specificity(self, scorer_set: ScorerSet) -> float:
-        points = self.get_points_from_set(scorer_set)
-        if points['false_positives'] == 0 and points['true_negatives'] == 0: return 0
-        return points['true_negatives'] / (points['false_positives'] + points['true_negatives'])
+    def add_subjects_information(self, test_Y: pd.Series, test_pred_Y: pd.Series, fold: int, subjects_keys: Optional[np.ndarray] = None):
+        # Fold is the index of the split predicted (searches may go through the splits in any order, or only through some of them)
+        # Keys may be given by the caller, for scorers of the same split to share them
+        if subjects_keys is None: subjects_keys = test_Y.index.to_numpy()
+        self.subjects_results.append(subjects_keys, fold, test_Y.to_numpy(), test_pred_Y)
 
-    def calculate_f1_measure(self, scorer_set: ScorerSet) -> float:
-        precision = self.calculate_precision(scorer_set)
-        recall = self.calculate_recall(scorer_set)
-        if precision == 0 and recall == 0: return 0
-        return (2 * precision * recall) / (precision + recall)
+    def get_subjects_df(self) -> pd.DataFrame: return self.subjects_results.get_df()
 
-    def calculate_unweighted_average_recall(self, scorer_set: ScorerSet) -> float:
-        return (self.calculate_sensitivity(scorer_set) + self.calculate_specificity(scorer_set)) * 0.5
+    # ============================================= METRICS RETRIEVAL =============================================
+    def compute_metrics(self, scorer_set: ScorerSet) -> np.ndarray:
+        if scorer_set not in self.metrics_cache: self.metrics_cache[scorer_set] = compute_metrics_from_points(self.get_points(scorer_set))
+        return self.metrics_cache[scorer_set]
+
+    def calculate_accuracy(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('Accuracy')])
+    def calculate_precision(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('Precision')])
+    def calculate_recall(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('Recall')])
+    def calculate_sensitivity(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('Sensitivity')])
+    def calculate_specificity(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('Specificity')])
+    def calculate_f1_measure(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('F1-Measure')])
+    def calculate_unweighted_average_recall(self, scorer_set: ScorerSet) -> float: return float(self.compute_metrics(scorer_set)[METRICS_NAMES.index('UAR')])
     # ============================================= METRICS RETRIEVAL =============================================
 
     def compute_confusion_matrix(self, scorer_set: ScorerSet) -> np.ndarray:
@@ -118,24 +161,17 @@ class Scorer():
         return np.array(confusion_matrix)
 
     def export_metrics(self, scorer_set: ScorerSet) -> List[module_exporter.ExportMetric]:
-        metrics = [
-            { 'name': 'Accuracy', 'score': self.calculate_accuracy(scorer_set) },
-            { 'name': 'Precision', 'score': self.calculate_precision(scorer_set) },
-            { 'name': 'Recall', 'score': self.calculate_recall(scorer_set) },
-            { 'name': 'Sensitivity', 'score': self.calculate_sensitivity(scorer_set) },
-            { 'name': 'Specificity', 'score': self.calculate_specificity(scorer_set) },
-            { 'name': 'F1-Measure', 'score': self.calculate_f1_measure(scorer_set) },
-            { 'name': 'UAR', 'score': self.calculate_unweighted_average_recall(scorer_set) },
-        ]
-
-        return metrics
+        # Every metric out of a single vectorized computation
+        return [ { 'name': name, 'score': score } for name, score in zip(METRICS_NAMES, self.compute_metrics(scorer_set).tolist()) ]
 
     def export_results(self, filename: str = 'temp'):
 
-        confusion_matrix = self.compute_confusion_matrix(ScorerSet.Train)
-        metrics = self.export_metrics(ScorerSet.Train)
-        module_exporter.export_confusion_matrix(confusion_matrix, self.categories, filename + ' - confusion matrix (train)')
-        module_exporter.export_metrics_bar_graph(metrics, filename + ' - scores (train)')
+        # Train set results are only exported when it was scored
+        if self.number_points(ScorerSet.Train) != 0:
+            confusion_matrix = self.compute_confusion_matrix(ScorerSet.Train)
+            metrics = self.export_metrics(ScorerSet.Train)
+            module_exporter.export_confusion_matrix(confusion_matrix, self.categories, filename + ' - confusion matrix (train)')
+            module_exporter.export_metrics_bar_graph(metrics, filename + ' - scores (train)')
 
         confusion_matrix = self.compute_confusion_matrix(ScorerSet.Test)
         metrics = self.export_metrics(ScorerSet.Test)
@@ -144,8 +180,23 @@ class Scorer():
 
     def export_subjects_results(self, filename: str = 'tmp'):
 
-        subjects_results_df = pd.DataFrame.from_dict(self.subjects_results)
+        subjects_results_df = self.get_subjects_df()
         module_exporter.export_csv(subjects_results_df, filename, False)
         
 
 # =================================== PUBLIC METHODS ===================================
+
+def add_points_batch(scorers: List[Scorer], train_Y: pd.Series, train_preds_Y: Optional[np.ndarray], test_Y: pd.Series, test_preds_Y: np.ndarray) -> None:
+    # Predictions of several variations on the same split, one row each, counted at once
+    train_counts = count_points(train_Y, train_preds_Y) if train_preds_Y is not None else [ None ] * len(scorers)
+    test_counts = count_points(test_Y, test_preds_Y)
+    for scorer, scorer_train_counts, scorer_test_counts in zip(scorers, train_counts, test_counts):
+        if scorer_train_counts is not None: scorer.add_counts(ScorerSet.Train, len(train_Y), scorer_train_counts)
+        scorer.add_counts(ScorerSet.Test, len(test_Y), scorer_test_counts)
+        scorer.number_folds += 1
+
+def compute_metrics_batch(scorers: List[Scorer], scorer_set: ScorerSet) -> pd.DataFrame:
+    # Metrics of several scorers at once, one row each (ordered as given) and a column by metric
+    if len(scorers) == 0: return pd.DataFrame(columns=METRICS_NAMES)
+    points = np.stack([ scorer.get_points(scorer_set) for scorer in scorers ])
+    return pd.DataFrame(compute_metrics_from_points(points), columns=METRICS_NAMES)
@@ -0,0 +1,157 @@
+import abc
+import math
+import random
+
+import numpy    as np
+import pandas   as pd
+
+from tqdm       import tqdm
+from typing     import Any, Callable, Dict, List, Optional, Tuple
+
+from sklearn.ensemble import RandomForestRegressor
+
+# Local Modules
+import modules_abstraction.module_scorer        as module_scorer
+import modules_abstraction.module_classifier    as module_classifier
+
+# =================================== CONSTANTS ===================================
+
+SEARCH_EXHAUSTIVE   : str       = 'exhaustive'
+SEARCH_HALVING      : str       = 'halving'
+SEARCH_RANDOM       : str       = 'random'
+SEARCH_BAYESIAN     : str       = 'bayesian'
+SEARCH_OPTIONS      : List[str] = [SEARCH_EXHAUSTIVE, SEARCH_HALVING, SEARCH_RANDOM, SEARCH_BAYESIAN]
+
+# Parameter variations evaluated (on every split) by the budgeted strategies, when no budget is given
+DEFAULT_BUDGET      : int       = 16
+
+# Fraction of the configurations kept after each round, the folds evaluated are multiplied by the same factor
+HALVING_FACTOR      : int       = 2
+HALVING_MIN_FOLDS   : int       = 4
+
+# Variations sampled at random before the surrogate model is trusted, and weight of its uncertainty when choosing the next one
+SMBO_INITIAL        : int       = 4
+SMBO_EXPLORATION    : float     = 1.0
+SMBO_ESTIMATORS     : int       = 50
+
+# Train and test sets of a split, or None when the split is to be skipped
+Split = Tuple[pd.DataFrame, pd.Series, pd.DataFrame, pd.Series]
+
+# =================================== PRIVATE METHODS ===================================
+
+def get_score(scorer: module_scorer.Scorer, metric: str) -> float:
+    if scorer.get_number_folds() == 0: return 0.0
+    scorer_metrics = scorer.export_metrics(module_scorer.ScorerSet.Test)
+    return list(filter(lambda score_metric: score_metric['name'] == metric, scorer_metrics))[0]['score']
+
+def encode_variations(variations: Dict[str, Dict[str, Any]], variation_keys: List[str]) -> np.ndarray:
+
+    parameters = sorted(set(parameter for variation_key in variation_keys for parameter in variations[variation_key]))
+    columns : List[List[float]] = []
+    for parameter in parameters:
+        values = [ variations[variation_key].get(parameter, None) for variation_key in variation_keys ]
+        # Numeric parameters keep their order, the remaining ones are encoded by the index of their value
+        if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in values): columns.append([ float(value) for value in values ])
+        else:
+            categories = sorted(set(map(str, values)))
+            columns.append([ float(categories.index(str(value))) for value in values ])
+
+    return np.array(columns, dtype=float).T.reshape(len(variation_keys), len(parameters))
+
+# =================================== PRIVATE CLASS DEFINITIONS ===================================
+
+class SearchStrategy(metaclass=abc.ABCMeta):
+
+    def __init__(self, seed: int = 0, budget: Optional[int] = None) -> None:
+        self.seed = seed
+        self.budget = budget if budget is not None else DEFAULT_BUDGET
+
+    @abc.abstractmethod
+    def run(self, classifier: module_classifier.Classifier, number_splits: int, get_split: Callable[[int], Optional[Split]], metric: str) -> None:
+        exit("🚨 Method 'run' not defined")
+
+    def evaluate(self, classifier: module_classifier.Classifier, scorer_keys: Optional[List[str]], split_indexes: List[int], get_split: Callable[[int], Optional[Split]]) -> None:
+        for split_index in tqdm(split_indexes, desc="👉 Running classifier:", leave=False):
+            split = get_split(split_index)
+            if split is None: continue
+            train_X, train_Y, test_X, test_Y = split
+            classifier.process_iteration(train_X, train_Y, test_X, test_Y, split_index, scorer_keys)
+
+# =================================== PUBLIC CLASS DEFINITIONS ===================================
+
+class ExhaustiveSearch(SearchStrategy):
+
+    def run(self, classifier: module_classifier.Classifier, number_splits: int, get_split: Callable[[int], Optional[Split]], metric: str) -> None:
+        # Every configuration on every split
+        self.evaluate(classifier, None, list(range(number_splits)), get_split)
+
+class SuccessiveHalvingSearch(SearchStrategy):
+
+    def run(self, classifier: module_classifier.Classifier, number_splits: int, get_split: Callable[[int], Optional[Split]], metric: str) -> None:
+
+        # Folds taken in a (seeded) random order, so that the first ones are not all from the same class
+        split_indexes = list(range(number_splits))
+        random.Random(self.seed).shuffle(split_indexes)
+
+        candidates : List[str] = list(classifier.get_scorers().keys())
+        number_rounds = math.ceil(math.log(max(len(candidates), 1), HALVING_FACTOR))
+        budget = min(number_splits, max(HALVING_MIN_FOLDS, math.ceil(number_splits / pow(HALVING_FACTOR, number_rounds))))
+
+        evaluated = 0
+        while True:
+            # Candidates share the folds evaluated so far, each round only extends them
+            self.evaluate(classifier, candidates, split_indexes[evaluated:budget], get_split)
+            evaluated = budget
+            if evaluated == number_splits: break
+
+            scorers = classifier.get_scorers()
+            candidates = sorted(candidates, key=lambda scorer_key: get_score(scorers[scorer_key], metric), reverse=True)
+            candidates = candidates[:max(1, math.ceil(len(candidates) / HALVING_FACTOR))]
+            # The last one standing goes straight to the complete leave one out
+            if len(candidates) == 1: budget = number_splits
+            else: budget = min(number_splits, budget * HALVING_FACTOR)
+
+class RandomSearch(SearchStrategy):
+
+    def run(self, classifier: module_classifier.Classifier, number_splits: int, get_split: Callable[[int], Optional[Split]], metric: str) -> None:
+        # Sampled variations run exactly as the exhaustive search would run them, the remaining ones are left without results
+        variation_keys = list(classifier.get_scorers().keys())
+        sampled_keys = random.Random(self.seed).sample(variation_keys, min(self.budget, len(variation_keys)))
+        self.evaluate(classifier, sampled_keys, list(range(number_splits)), get_split)
+
+class BayesianSearch(SearchStrategy):
+
+    def run(self, classifier: module_classifier.Classifier, number_splits: int, get_split: Callable[[int], Optional[Split]], metric: str) -> None:
+
+        generator = random.Random(self.seed)
+        variation_keys = list(classifier.get_scorers().keys())
+        encoded = encode_variations(classifier.get_variations(), variation_keys)
+        budget = min(self.budget, len(variation_keys))
+
+        evaluated : List[int] = generator.sample(range(len(variation_keys)), min(SMBO_INITIAL, budget))
+        self.evaluate(classifier, [ variation_keys[index] for index in evaluated ], list(range(number_splits)), get_split)
+
+        while len(evaluated) < budget:
+            scorers = classifier.get_scorers()
+            scores = [ get_score(scorers[variation_keys[index]], metric) for index in evaluated ]
+            remaining = sorted(set(range(len(variation_keys))) - set(evaluated))
+
+            # Random forest surrogate, its trees' spread standing for the uncertainty of each prediction
+            surrogate = RandomForestRegressor(n_estimators=SMBO_ESTIMATORS, random_state=self.seed, n_jobs=1)
+            surrogate.fit(encoded[evaluated], scores)
+            predictions = np.array([ tree.predict(encoded[remaining]) for tree in surrogate.estimators_ ])
+            acquisition = predictions.mean(axis=0) + SMBO_EXPLORATION * predictions.std(axis=0)
+
+            chosen = remaining[int(np.argmax(acquisition))]
+            self.evaluate(classifier, [ variation_keys[chosen] ], list(range(number_splits)), get_split)
+            evaluated.append(chosen)
+
+# =================================== PUBLIC METHODS ===================================
+
+def create_search(key: str, seed: int = 0, budget: Optional[int] = None) -> SearchStrategy:
+
+    if key == SEARCH_EXHAUSTIVE: return ExhaustiveSearch(seed, budget)
+    elif key == SEARCH_HALVING: return SuccessiveHalvingSearch(seed, budget)
+    elif key == SEARCH_RANDOM: return RandomSearch(seed, budget)
+    elif key == SEARCH_BAYESIAN: return BayesianSearch(seed, budget)
+    else: exit(f"🚨 Search strategy '{key}' not recognized")
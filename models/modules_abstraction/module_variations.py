@@ -1,9 +1,6 @@
 import copy
-import random
 import itertools
 
-import pandas as pd
-
 from typing     import Any, Dict, List, Optional, Tuple
 
 # Local Modules
@@ -82,6 +79,7 @@ class Variation():
 
     def load_preprocessing(self, keys_preprocessing: str) -> None:
 
+        self.preprocessing_code = ' + '.join(keys_preprocessing)
         self.preprocesser = module_preprocessing.Preprocesser(keys_preprocessing)
 
     def develop_classifier(self, categories: List[str]) -> module_classifier.Classifier:
@@ -97,6 +95,13 @@ class Variation():
 
         return ' - '.join([self.classifier_code_small, self.features_code, self.tasks_code, self.genders_code, self.data_code, f'Repetition {self.repetition:02d}', feature_importance_str])
 
+    def generate_code_job_class(self) -> str:
+        # Repetitions share the same cost, so they are left out of the code used to estimate execution times
+        feature_importance_str : str = "No Feature Importance"
+        if self.study_features_importance: feature_importance_str : str = "Feature Importance"
+
+        return ' - '.join([self.classifier_code_small, self.features_code, self.tasks_code, self.genders_code, self.data_code, feature_importance_str])
+
     def generate_code_dataset(self, replace_feature_code: Optional[str] = None) -> str:
         feature_importance_str : str = "No Feature Importance"
         if self.study_features_importance and self.study_feature_importance is None: feature_importance_str : str = f"Feature Importance"
@@ -107,6 +112,10 @@ class Variation():
         if replace_feature_code is None: return ' - '.join([self.features_code, self.tasks_code, self.genders_code, self.data_code, f'Repetition {self.repetition:02d}'])
         else: return ' - '.join([replace_feature_code, self.tasks_code, self.genders_code, self.data_code, f'Repetition {self.repetition:02d}'])
 
+    def generate_code_prepared_dataset(self) -> str:
+        # Variations sharing this code train and test on exactly the same (preprocessed) matrices, only their classifier differs
+        return ' - '.join([self.generate_code_dataset(), f'Preprocessing {self.preprocessing_code}'])
+
     def generate_sub_variations(self, features: List[str]) -> List['Variation']:
 
         sub_variations : List[Variation] = []
@@ -118,25 +127,6 @@ class Variation():
 
         return sub_variations
 
-    def random_for_feature_importance(self, X_train: pd.DataFrame, X_test: pd.DataFrame) -> pd.DataFrame:
-
-        column_sample : pd.Series = X_train[self.study_feature_importance]
-        column_dtype : Any = column_sample.dtype
-
-        if column_dtype == int:
-            minimum : int = int(column_sample.min())
-            maximum : int = int(column_sample.max())
-            X_test[self.study_feature_importance] = X_test[self.study_feature_importance].apply(lambda _: random.randint(minimum, maximum))
-        elif column_dtype == float:
-            minimum : float = float(column_sample.min())
-            maximum : float = float(column_sample.max())
-            X_test[self.study_feature_importance] = X_test[self.study_feature_importance].apply(lambda _: random.uniform(minimum, maximum))
-        else:
-            possible_values : List[Any] = column_sample.unique().tolist()
-            X_test[self.study_feature_importance] = X_test[self.study_feature_importance].apply(lambda _: random.choice(possible_values))
-
-        return X_test
-
 class VariationGenerator():
 
     def __init__(self, variations_key: Optional[str], variations_by_key: Dict[str, Dict[str, List[str]]],
@@ -1,6 +1,7 @@
 import os
 import sys
 import math
+import shutil
 import warnings
 import matplotlib
 
@@ -65,6 +66,10 @@ def change_execution_timestamp(timestamp: str):
     global EXECUTION_TIMESTAMP
     EXECUTION_TIMESTAMP = datetime.strptime(timestamp, "%Y.%m.%d %H.%M.%S")
 
+def change_export_directory(directory_path: str):
+    global EXPORT_DIRECTORY
+    EXPORT_DIRECTORY = directory_path
+
 def change_checkpoint_directory(directory_path: str):
     global CHECKPOINT_DIRECTORY
     CHECKPOINT_DIRECTORY = directory_path
@@ -117,6 +122,15 @@ def get_tmp_directory(sub_directories: List[str] = []):
     if not os.path.exists(directory_path): os.makedirs(directory_path, exist_ok=True)
     return directory_path
 
+def copy_to_current_path(source_directory: str):
+
+    # Reuses exports already made for an equivalent execution (e.g. profiling of the same dataset)
+    directory_path = get_current_path()
+    for directory, _, filenames in os.walk(source_directory):
+        target_directory = os.path.join(directory_path, os.path.relpath(directory, source_directory))
+        if not os.path.exists(target_directory): os.makedirs(target_directory, exist_ok=True)
+        for filename in filenames: shutil.copyfile(os.path.join(directory, filename), os.path.join(target_directory, filename))
+
 # =================================== PUBLIC FUNCTIONS - SPECIFIC PARAMETERS ===================================
 
 def export_csv(dataframe: pd.DataFrame, filename: str = 'temp', index = True):
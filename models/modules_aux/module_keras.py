@@ -15,6 +15,7 @@ from typing                         import Any, Dict, Iterable, List
 from tensorflow                     import keras
 
 import modules_aux.module_exporter  as module_exporter
+import modules_aux.module_threads   as module_threads
 
 NDArray = Iterable
 
@@ -86,6 +87,9 @@ class NeuralNetworkRezaii():
         self.matrix_embeddings : NDArray[np.float64] = matrix_embeddings
         self.sentence_embedding : NDArray[np.float64] = sentence_embedding
 
+        # Session sized to the thread budget of the job, created here so that importing the module stays cheap
+        module_threads.limit_tensorflow()
+
         self.epochs : int = ephocs
         self.number_of_words : int = self.matrix_embeddings.shape[0]
         self.embedding_dimensionality : int = self.matrix_embeddings.shape[1]
@@ -0,0 +1,167 @@
+import os
+import glob
+import json
+import time
+import shutil
+import sqlite3
+import urllib.parse
+
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+# Every job writes its own store, published once complete, so that no store is ever written by two processes
+STORE_EXTENSION         : str   = '.sqlite'
+STORE_PART_EXTENSION    : str   = '.part'
+
+TABLES : List[str] = ['variations', 'summaries', 'metrics', 'subjects']
+SCHEMA : List[str] = [
+    "CREATE TABLE IF NOT EXISTS variations (code TEXT PRIMARY KEY, variation_index INTEGER, finished REAL)",
+    # One summary per variation ran (several when studying features importance), as exported by the final results
+    "CREATE TABLE IF NOT EXISTS summaries (code TEXT, position INTEGER, key TEXT, classifier_variation TEXT, summary TEXT, PRIMARY KEY (code, position))",
+    "CREATE TABLE IF NOT EXISTS metrics (code TEXT, position INTEGER, scorer_set TEXT, name TEXT, score REAL, PRIMARY KEY (code, position, scorer_set, name))",
+    "CREATE TABLE IF NOT EXISTS subjects (code TEXT, position INTEGER, subject TEXT, fold INTEGER, label TEXT, predicted TEXT)",
+    "CREATE INDEX IF NOT EXISTS subjects_code ON subjects (code, position)",
+]
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def to_value(value: Any) -> Any:
+    # Numpy scalars are stored as their python counterparts
+    if hasattr(value, 'item'): return value.item()
+    return value
+
+def to_json(value: Any) -> Any:
+    if hasattr(value, 'item'): return value.item()
+    return str(value)
+
+def to_uri(path: str, read_only: bool) -> str:
+    # Published stores are never modified in place (only replaced), hence they are read without any locking
+    return 'file:' + urllib.parse.quote(os.path.abspath(path)) + ('?mode=ro&immutable=1' if read_only else '?mode=rwc')
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def create_store_name() -> str:
+    return f'{os.uname().nodename}-{os.getpid()}-{int(time.time() * 1000)}' + STORE_EXTENSION
+
+# =================================== PUBLIC CLASSES ===================================
+
+class ResultsStore():
+
+    def __init__(self, path: str, read_only: bool = False) -> None:
+        self.path       : str                           = path
+        self.read_only  : bool                          = read_only
+        self.connection : Optional[sqlite3.Connection]  = None
+
+    def connect(self) -> sqlite3.Connection:
+        if self.connection is None:
+            self.connection = sqlite3.connect(to_uri(self.path, self.read_only), uri=True)
+            if not self.read_only: self.transaction(lambda connection: [ connection.execute(statement) for statement in SCHEMA ])
+        return self.connection
+
+    def close(self) -> None:
+        if self.connection is not None: self.connection.close()
+        self.connection = None
+
+    def transaction(self, function: Callable[[sqlite3.Connection], Any]) -> Any:
+        with self.connection: return function(self.connection)
+
+    def add_variation(self, code: str, variation_index: Optional[int], records: List[Dict[str, Any]]) -> None:
+
+        def write(connection: sqlite3.Connection) -> None:
+            # Executions of the same variation replace each other
+            for table in TABLES: connection.execute(f"DELETE FROM {table} WHERE code = ?", (code,))
+            for position, record in enumerate(records):
+                summary = record['summary']
+                connection.execute("INSERT INTO summaries VALUES (?, ?, ?, ?, ?)", (code, position, summary['Key'],
+                    summary.get('Classifier Variation', None), json.dumps(summary, default=to_json)))
+                connection.executemany("INSERT INTO metrics VALUES (?, ?, ?, ?, ?)", [ (code, position, scorer_set, metric['name'], to_value(metric['score']))
+                    for scorer_set, metrics in record['metrics'].items() for metric in metrics ])
+                subjects = record['subjects']
+                connection.executemany("INSERT INTO subjects VALUES (?, ?, ?, ?, ?, ?)", [ (code, position, str(key), int(to_value(fold)), str(to_value(label)), str(to_value(predicted)))
+                    for key, fold, label, predicted in zip(subjects['key'], subjects['fold'], subjects['label'], subjects['predicted']) ])
+            # Marks the variation as executed
+            connection.execute("INSERT INTO variations VALUES (?, ?, ?)", (code, variation_index, time.time()))
+
+        self.connect()
+        self.transaction(write)
+
+    def publish(self, path: str) -> None:
+        # Copied as a whole (every transaction is committed by then) and replaced at once, readers never see a partial store
+        shutil.copyfile(self.path, path + STORE_PART_EXTENSION)
+        os.replace(path + STORE_PART_EXTENSION, path)
+
+    def get_finished(self) -> Dict[str, float]:
+        cursor = self.connect().execute("SELECT code, finished FROM variations")
+        return dict((code, finished) for code, finished in cursor.fetchall())
+
+    def get_codes(self) -> Set[str]:
+        return set(self.get_finished().keys())
+
+    def has_variation(self, code: str) -> bool:
+        cursor = self.connect().execute("SELECT 1 FROM variations WHERE code = ?", (code,))
+        return cursor.fetchone() is not None
+
+    def get_summaries(self) -> Dict[str, List[Dict[str, Any]]]:
+        # Summaries of every executed variation, read at once instead of variation by variation
+        cursor = self.connect().execute("SELECT summaries.code, summaries.summary FROM summaries JOIN variations ON summaries.code = variations.code " +
+            "ORDER BY summaries.code, summaries.position")
+        summaries : Dict[str, List[Dict[str, Any]]] = {}
+        for code, summary in cursor.fetchall(): summaries.setdefault(code, []).append(json.loads(summary))
+        return summaries
+
+class ResultsStores():
+
+    # Stores published by the jobs to the same directory, each variation taken from the store that executed it last
+
+    def __init__(self, directory_path: str) -> None:
+        self.directory_path : str = directory_path
+
+    def get_paths(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(glob.escape(self.directory_path), '*' + STORE_EXTENSION)))
+
+    def get_latest(self) -> Dict[str, str]:
+
+        latest : Dict[str, Any] = {}
+        for path in self.get_paths():
+            store = ResultsStore(path, read_only=True)
+            for code, finished in store.get_finished().items():
+                if code not in latest or finished > latest[code][0]: latest[code] = (finished, path)
+            store.close()
+        return dict((code, path) for code, (_, path) in latest.items())
+
+    def get_codes(self) -> Set[str]:
+        return set(self.get_latest().keys())
+
+    def get_summaries(self) -> Dict[str, List[Dict[str, Any]]]:
+
+        latest = self.get_latest()
+        summaries : Dict[str, List[Dict[str, Any]]] = {}
+        for path in sorted(set(latest.values())):
+            store = ResultsStore(path, read_only=True)
+            for code, code_summaries in store.get_summaries().items():
+                if latest[code] == path: summaries[code] = code_summaries
+            store.close()
+        return summaries
+
+    def merge(self, path: str) -> None:
+
+        # Written by a single process to the side and replaced at once, as published stores are
+        latest = self.get_latest()
+        if os.path.exists(path + STORE_PART_EXTENSION): os.remove(path + STORE_PART_EXTENSION)
+        merged = ResultsStore(path + STORE_PART_EXTENSION)
+        connection = merged.connect()
+        connection.execute("CREATE TEMP TABLE codes (code TEXT PRIMARY KEY)")
+        for source_path in sorted(set(latest.values())):
+            codes = [ code for code, code_path in latest.items() if code_path == source_path ]
+
+            def copy(connection: sqlite3.Connection) -> None:
+                connection.execute("DELETE FROM temp.codes")
+                connection.executemany("INSERT INTO temp.codes VALUES (?)", [ (code,) for code in codes ])
+                for table in TABLES: connection.execute(f"INSERT INTO main.{table} SELECT * FROM source.{table} WHERE code IN (SELECT code FROM temp.codes)")
+
+            connection.execute("ATTACH DATABASE ? AS source", (to_uri(source_path, True),))
+            merged.transaction(copy)
+            connection.execute("DETACH DATABASE source")
+        merged.close()
+        os.replace(path + STORE_PART_EXTENSION, path)
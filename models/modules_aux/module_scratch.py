@@ -0,0 +1,116 @@
+import os
+import json
+import time
+import fcntl
+import shutil
+import hashlib
+import tarfile
+
+from typing import Dict, Optional
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+# Exported by 'parallelization.py' to every job, the path where the job leaves its bundle for the manager to unpack
+BUNDLE_VARIABLE         : str   = 'PARALLELIZATION_BUNDLE'
+BUNDLE_MANIFEST         : str   = 'bundle.json'
+
+INPUTS_DIRECTORY        : str   = 'inputs'
+JOBS_DIRECTORY          : str   = 'jobs'
+# Staged inputs and directories left behind by crashed jobs are removed once unused for this long
+SCRATCH_TTL_SECONDS     : float = 2 * 24 * 60 * 60
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def prune(directory_path: str, ttl_seconds: float) -> None:
+    if not os.path.isdir(directory_path): return
+    for entry in os.listdir(directory_path):
+        entry_path = os.path.join(directory_path, entry)
+        try:
+            if time.time() - os.path.getmtime(entry_path) > ttl_seconds: shutil.rmtree(entry_path, ignore_errors=True)
+        except OSError: continue
+
+def check_member(member: tarfile.TarInfo, name: str) -> None:
+    # Bundles only hold regular files and directories inside their own top level directories
+    parts = member.name.split('/')
+    if member.name.startswith('/') or '..' in parts or parts[0] != name or not (member.isfile() or member.isdir()):
+        raise ValueError(f"member '{member.name}' not allowed in bundle")
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def stage_file(source_path: str, scratch_directory: str) -> str:
+    # Copied once per host, jobs using the same version of the file (path, size and modification) share the copy
+    status = os.stat(source_path)
+    key = hashlib.sha1(f'{os.path.abspath(source_path)}\n{status.st_size}\n{status.st_mtime_ns}'.encode('utf-8')).hexdigest()[:16]
+    inputs_directory = os.path.join(scratch_directory, INPUTS_DIRECTORY)
+    staged_directory = os.path.join(inputs_directory, key)
+    staged_path = os.path.join(staged_directory, os.path.basename(source_path))
+
+    os.makedirs(staged_directory, exist_ok=True)
+    lock_file = open(os.path.join(staged_directory, '.lock'), 'w')
+    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    try:
+        if not os.path.exists(staged_path):
+            prune(inputs_directory, SCRATCH_TTL_SECONDS)
+            shutil.copyfile(source_path, staged_path + '.tmp')
+            os.replace(staged_path + '.tmp', staged_path)
+        # Marks the copy as used, so that it is not pruned
+        os.utime(staged_directory)
+    finally: lock_file.close()
+    return staged_path
+
+def create_job_directory(scratch_directory: str) -> str:
+    jobs_directory = os.path.join(scratch_directory, JOBS_DIRECTORY)
+    prune(jobs_directory, SCRATCH_TTL_SECONDS)
+    job_directory = os.path.join(jobs_directory, f'{os.uname().nodename}-{os.getpid()}-{int(time.time() * 1000)}')
+    os.makedirs(job_directory, exist_ok=True)
+    return job_directory
+
+def write_bundle(bundle_path: str, job_directory: str, destinations: Dict[str, str]) -> None:
+    # Each top level directory of the job directory is unpacked into its destination (relative to the working directory), in the order of the destinations
+    bundle = tarfile.open(bundle_path + '.tmp', 'w:gz')
+    manifest = json.dumps(destinations).encode('utf-8')
+    manifest_path = os.path.join(job_directory, BUNDLE_MANIFEST)
+    file = open(manifest_path, 'wb')
+    file.write(manifest)
+    file.close()
+    bundle.add(manifest_path, BUNDLE_MANIFEST)
+    for name in destinations:
+        if os.path.isdir(os.path.join(job_directory, name)): bundle.add(os.path.join(job_directory, name), name)
+    bundle.close()
+    os.replace(bundle_path + '.tmp', bundle_path)
+
+def unpack_bundle(bundle_path: str, base_directory: str = '.') -> int:
+    # Returns the number of files unpacked
+    bundle = tarfile.open(bundle_path, 'r:gz')
+    try:
+        destinations : Dict[str, str] = json.load(bundle.extractfile(BUNDLE_MANIFEST))
+        members = [ member for member in bundle.getmembers() if member.name != BUNDLE_MANIFEST ]
+        for member in members:
+            name = member.name.split('/')[0]
+            if name not in destinations: raise ValueError(f"member '{member.name}' has no destination in bundle")
+            check_member(member, name)
+
+        number_files = 0
+        for member in members:
+            if not member.isfile(): continue
+            name, _, relative_path = member.name.partition('/')
+            target_path = os.path.join(base_directory, destinations[name], relative_path)
+            os.makedirs(os.path.dirname(target_path), exist_ok=True)
+            source = bundle.extractfile(member)
+            target = open(target_path + '.tmp', 'wb')
+            shutil.copyfileobj(source, target)
+            target.close()
+            os.replace(target_path + '.tmp', target_path)
+            number_files = number_files + 1
+    finally: bundle.close()
+    return number_files
+
+def ship(job_directory: str, destinations: Dict[str, str], bundle_path: Optional[str] = None) -> None:
+    # Without a manager to hand the bundle to, the job unpacks it into the shared directories itself
+    unpack_locally = bundle_path is None
+    if unpack_locally: bundle_path = job_directory + '.tar.gz'
+    write_bundle(bundle_path, job_directory, destinations)
+    shutil.rmtree(job_directory, ignore_errors=True)
+    if unpack_locally:
+        unpack_bundle(bundle_path)
+        os.remove(bundle_path)
@@ -0,0 +1,62 @@
+import os
+import sys
+
+from typing import List, Optional
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+# Exported by 'parallelization.py' to every job, as the cores of the host divided by its concurrent jobs
+THREAD_BUDGET_VARIABLE  : str       = 'THREAD_BUDGET'
+THREAD_VARIABLES        : List[str] = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS']
+# The budget goes to the threads within each operation, operations themselves run one at a time
+INTER_OP_THREADS        : int       = 1
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def get_available_cores() -> int:
+    if hasattr(os, 'sched_getaffinity'): return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+def compute_thread_budget(cores: int, concurrent_jobs: int) -> int:
+    return max(1, cores // max(1, concurrent_jobs))
+
+def get_thread_budget() -> int:
+    # Without a budget (e.g. sequential executions) every available core is used
+    value = os.environ.get(THREAD_BUDGET_VARIABLE, '').strip()
+    if value.isdigit() and int(value) > 0: return int(value)
+    return get_available_cores()
+
+def limit_torch(budget: Optional[int] = None) -> None:
+    # Starts torch's thread pools, hence only called by the process running the job (never by a daemon forking jobs)
+    import torch
+    if budget is None: budget = get_thread_budget()
+    torch.set_num_threads(budget)
+    # Only allowed before any inter-op parallel work started
+    try: torch.set_num_interop_threads(INTER_OP_THREADS)
+    except RuntimeError: pass
+
+def limit_tensorflow(budget: Optional[int] = None) -> None:
+    import tensorflow as tf
+    if budget is None: budget = get_thread_budget()
+    config = tf.ConfigProto(intra_op_parallelism_threads=budget, inter_op_parallelism_threads=INTER_OP_THREADS)
+    tf.keras.backend.set_session(tf.Session(config=config))
+
+def limit_threads() -> int:
+    # Called before numerical libraries are imported, since BLAS libraries size their thread pools when loaded
+    budget = get_thread_budget()
+    explicit = THREAD_BUDGET_VARIABLE in os.environ
+    for variable in THREAD_VARIABLES:
+        if explicit or variable not in os.environ: os.environ[variable] = str(budget)
+
+    # Libraries loaded already (e.g. ahead of time by 'worker_daemon.py') are resized instead
+    try:
+        import threadpoolctl
+        threadpoolctl.threadpool_limits(budget)
+    except ImportError: pass
+    if 'torch' in sys.modules: limit_torch(budget)
+
+    return budget
+
+def get_n_jobs() -> int:
+    # Number of jobs given to estimators parallelized through 'joblib'
+    return get_thread_budget()
@@ -9,6 +9,9 @@ from typing         import Any, Dict, List, Optional, Tuple
 
 import pandas       as pd
 
+# Local Modules - Auxiliary
+import modules_aux.module_threads   as module_threads
+
 # =================================== DOWNLOADS FOR LANGUAGE PROCESSING ===================================
 
 
@@ -54,12 +57,14 @@ def get_training_args(output_dir: str, logging_dir: str) -> transformers.Trainin
     return training_args
 
 def get_xlm_roberta_base(num_labels: int = 2) -> Tuple[transformers.AutoTokenizer, transformers.AutoModelForSequenceClassification]:
+    module_threads.limit_torch()
     tokenizer   : transformers.AutoTokenizer                        = transformers.AutoTokenizer.from_pretrained('xlm-roberta-base')
     model       : transformers.AutoModelForSequenceClassification   = transformers.AutoModelForSequenceClassification.from_pretrained("xlm-roberta-base", num_labels=num_labels)
 
     return (tokenizer, model)
 
 def get_xlm_roberta_large(num_labels: int = 2) -> Tuple[transformers.AutoTokenizer, transformers.AutoModelForSequenceClassification]:
+    module_threads.limit_torch()
     tokenizer   : transformers.AutoTokenizer                        = transformers.AutoTokenizer.from_pretrained('xlm-roberta-large')
     model       : transformers.AutoModelForSequenceClassification   = transformers.AutoModelForSequenceClassification.from_pretrained("xlm-roberta-large", num_labels=num_labels)
 
@@ -85,6 +90,8 @@ class Dataset(torch.utils.data.Dataset):
 class TransformerModel():
 
     def __init__(self, tokenizer: transformers.PreTrainedTokenizer, model: Optional[transformers.PreTrainedModel], model_saved_path: Optional[str] = None) -> None:
+        # Thread pools sized when models are first built, not on import (modules imported ahead of time by 'worker_daemon.py' are forked)
+        module_threads.limit_torch()
         self.model_saved_path   : Optional[str]                     = model_saved_path
         self.tokenizer          : transformers.PreTrainedTokenizer  = tokenizer
 
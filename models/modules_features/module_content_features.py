@@ -27,6 +27,8 @@ class ContentFeatureSet(module_featureset.FeatureSetAbstraction):
         self.drop_columns = ['Trans Path', 'Trans File', 'Trans File Path', 'Trans Info', 'Text', 'Lemmatized Text', 'Lemmatized Filtered Text',
             'LCA - Word Groups', 'LCA - Embedding per Word Groups', 'LCA - Embedding Groups', 'LCA - Max Cossine w/ Frequent Words',
             'SentiLex - Extracted Scores' ]
+        # Valence is computed by a RoBERTa model during extraction
+        self.extraction_resources = module_featureset.RESOURCES_HEAVY_MODEL
 
     def _develop_basis_df(self):
         print(f"🚀 Preparing for '{self.id}' analysis ...")
@@ -22,6 +22,9 @@ class EntiretyFeatureSet(module_featureset.FeatureSetAbstraction):
     def __init__(self) -> None:
         super().__init__(FEATURE_SET_ID)
         self.drop_columns = ['Trans Path', 'Trans File', 'Trans File Path', 'Trans Info', 'Text']
+        # RoBERTa is used during extraction and fine-tuned again on every train split
+        self.extraction_resources = module_featureset.RESOURCES_HEAVY_MODEL
+        self.models_resources = module_featureset.RESOURCES_HEAVY_MODEL
 
     def _develop_basis_df(self):
         print(f"🚀 Preparing for '{self.id}' analysis ...")
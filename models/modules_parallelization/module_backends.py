@@ -0,0 +1,112 @@
+import os
+import abc
+import signal
+import subprocess
+
+from typing import Dict, List, Optional
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+BACKEND_SSH     : str   = 'ssh'
+BACKEND_LOCAL   : str   = 'local'
+BACKENDS        : List[str] = [BACKEND_SSH, BACKEND_LOCAL]
+
+LOCAL_HOSTNAME  : str   = 'localhost'
+
+# =================================== PUBLIC CLASSES ===================================
+
+class ExecutionHandle(metaclass=abc.ABCMeta):
+
+    # Both return the bytes available (up to 'size'), blocking only while none are, and b'' once the stream ends
+    @abc.abstractmethod
+    def read_stdout(self, size: int) -> bytes: exit("🚨 Method 'read_stdout' not defined")
+    @abc.abstractmethod
+    def read_stderr(self, size: int) -> bytes: exit("🚨 Method 'read_stderr' not defined")
+    @abc.abstractmethod
+    def wait(self) -> int: exit("🚨 Method 'wait' not defined")
+    @abc.abstractmethod
+    def kill(self) -> None: exit("🚨 Method 'kill' not defined")
+    @abc.abstractmethod
+    def close(self) -> None: exit("🚨 Method 'close' not defined")
+
+class ExecutionBackend(metaclass=abc.ABCMeta):
+
+    @abc.abstractmethod
+    def probe(self, addresses: List[str]) -> Dict[str, Optional[str]]: exit("🚨 Method 'probe' not defined")
+    @abc.abstractmethod
+    def launch(self, address: str, command: str) -> ExecutionHandle: exit("🚨 Method 'launch' not defined")
+    @abc.abstractmethod
+    def execute(self, address: str, command: str, timeout: Optional[float] = None) -> str: exit("🚨 Method 'execute' not defined")
+    @abc.abstractmethod
+    def close(self) -> None: exit("🚨 Method 'close' not defined")
+
+# ----------------------------------------- SSH Backend -----------------------------------------
+
+class SSHExecutionHandle(ExecutionHandle):
+
+    def __init__(self, channel) -> None:
+        self.channel = channel
+
+    def read_stdout(self, size: int) -> bytes: return self.channel.recv(size)
+    def read_stderr(self, size: int) -> bytes: return self.channel.recv_stderr(size)
+    def wait(self) -> int: return self.channel.recv_exit_status()
+    # Closing the channel hangs up its pseudo-terminal, which terminates the remote process
+    def kill(self) -> None: self.channel.close()
+    def close(self) -> None: self.channel.close()
+
+class SSHExecutionBackend(ExecutionBackend):
+
+    def __init__(self, username: str, password: str) -> None:
+        # Imported here so that other backends do not depend on 'paramiko'
+        import modules_parallelization.module_connections as module_connections
+        self.connection_pool = module_connections.ConnectionPool(username, password)
+
+    def probe(self, addresses: List[str]) -> Dict[str, Optional[str]]:
+        return self.connection_pool.probe(addresses)
+
+    def launch(self, address: str, command: str) -> ExecutionHandle:
+        channel = self.connection_pool.open_session(address)
+        channel.get_pty()
+        channel.exec_command(command)
+        return SSHExecutionHandle(channel)
+
+    def execute(self, address: str, command: str, timeout: Optional[float] = None) -> str:
+        return self.connection_pool.execute(address, command, timeout)
+
+    def close(self) -> None:
+        self.connection_pool.close()
+
+# ---------------------------------------- Local Backend ----------------------------------------
+
+class LocalExecutionHandle(ExecutionHandle):
+
+    def __init__(self, process: subprocess.Popen) -> None:
+        self.process : subprocess.Popen = process
+
+    def read_stdout(self, size: int) -> bytes: return self.process.stdout.read1(size)
+    def read_stderr(self, size: int) -> bytes: return self.process.stderr.read1(size)
+    def wait(self) -> int: return self.process.wait()
+
+    def kill(self) -> None:
+        # The job runs in its own session, so its whole process group is terminated
+        try: os.killpg(self.process.pid, signal.SIGTERM)
+        except ProcessLookupError: pass
+
+    def close(self) -> None:
+        self.process.stdout.close()
+        self.process.stderr.close()
+
+class LocalExecutionBackend(ExecutionBackend):
+
+    def probe(self, addresses: List[str]) -> Dict[str, Optional[str]]:
+        return dict((address, None) for address in addresses)
+
+    def launch(self, address: str, command: str) -> ExecutionHandle:
+        process = subprocess.Popen(command, shell=True, stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, start_new_session=True)
+        return LocalExecutionHandle(process)
+
+    def execute(self, address: str, command: str, timeout: Optional[float] = None) -> str:
+        return subprocess.run(command, shell=True, stdout=subprocess.PIPE, timeout=timeout).stdout.decode('utf-8', errors='ignore')
+
+    def close(self) -> None: return
@@ -0,0 +1,102 @@
+import socket
+import threading
+import warnings
+
+from concurrent.futures import ThreadPoolExecutor
+from typing             import Dict, List, Optional
+
+warnings.filterwarnings(action='ignore', module='paramiko')
+import paramiko
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+CONNECT_TIMEOUT_SECONDS     : float = 10.0
+KEEPALIVE_SECONDS           : int   = 30
+SESSION_RETRIES             : int   = 2
+PROBE_MAX_WORKERS           : int   = 16
+
+CONNECTION_ERRORS = (paramiko.SSHException, EOFError, socket.error, socket.timeout)
+
+# =================================== PUBLIC CLASSES ===================================
+
+class ConnectionPool():
+
+    def __init__(self, username: str, password: str, connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+        keepalive_seconds: int = KEEPALIVE_SECONDS) -> None:
+
+        self.username           : str   = username
+        self.password           : str   = password
+        self.connect_timeout    : float = connect_timeout
+        self.keepalive_seconds  : int   = keepalive_seconds
+
+        # One client (and therefore one transport) per address, each guarded by its own lock
+        self.clients        : Dict[str, paramiko.SSHClient] = {}
+        self.locks          : Dict[str, threading.Lock]     = {}
+        self.locks_guard    : threading.Lock                = threading.Lock()
+
+    def _get_lock(self, address: str) -> threading.Lock:
+        with self.locks_guard:
+            if address not in self.locks: self.locks[address] = threading.Lock()
+            return self.locks[address]
+
+    def _connect(self, address: str) -> paramiko.SSHClient:
+        client = paramiko.SSHClient()
+        client.load_system_host_keys()
+        client.connect(address, username=self.username, password=self.password, timeout=self.connect_timeout,
+            banner_timeout=self.connect_timeout, auth_timeout=self.connect_timeout)
+        client.get_transport().set_keepalive(self.keepalive_seconds)
+        return client
+
+    def get_transport(self, address: str) -> paramiko.Transport:
+        with self._get_lock(address):
+            client = self.clients.get(address, None)
+            transport = client.get_transport() if client is not None else None
+
+            # Reconnect whenever the transport was never opened or has dropped since
+            if transport is None or not transport.is_active():
+                if client is not None: client.close()
+                client = self._connect(address)
+                self.clients[address] = client
+                transport = client.get_transport()
+
+            return transport
+
+    def open_session(self, address: str, retries: int = SESSION_RETRIES) -> paramiko.Channel:
+        for attempt in range(retries + 1):
+            try:
+                transport = self.get_transport(address)
+                return transport.open_session(timeout=self.connect_timeout)
+            except CONNECTION_ERRORS:
+                self.drop(address)
+                if attempt == retries: raise
+
+    def execute(self, address: str, command: str, timeout: Optional[float] = None) -> str:
+        channel = self.open_session(address)
+        if timeout is not None: channel.settimeout(timeout)
+
+        try:
+            channel.exec_command(command)
+            output = channel.makefile('rb').read().decode('utf-8', errors='ignore')
+        finally: channel.close()
+        return output
+
+    def drop(self, address: str) -> None:
+        with self._get_lock(address):
+            client = self.clients.pop(address, None)
+            if client is not None: client.close()
+
+    def probe(self, addresses: List[str]) -> Dict[str, Optional[str]]:
+
+        def probe_address(address: str) -> Optional[str]:
+            try: self.get_transport(address)
+            except Exception as error: return str(error) or error.__class__.__name__
+            return None
+
+        number_workers = max(1, min(PROBE_MAX_WORKERS, len(addresses)))
+        with ThreadPoolExecutor(max_workers=number_workers) as executor:
+            results = list(executor.map(probe_address, addresses))
+
+        return dict(zip(addresses, results))
+
+    def close(self) -> None:
+        for address in list(self.clients.keys()): self.drop(address)
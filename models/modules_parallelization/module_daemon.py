@@ -0,0 +1,270 @@
+import os
+import sys
+import json
+import time
+import array
+import fcntl
+import signal
+import socket
+import struct
+import hashlib
+import tempfile
+import selectors
+import traceback
+import subprocess
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+SOCKET_NAME_FORMAT          : str       = 'worker_daemon_{user}_{key}.sock'
+LOCK_EXTENSION              : str       = '.lock'
+
+DAEMON_IDLE_SECONDS         : float     = 30 * 60
+DAEMON_POLL_SECONDS         : float     = 1.0
+REQUEST_TIMEOUT_SECONDS     : float     = 10.0
+REQUEST_MAX_BYTES           : int       = 1024 * 1024
+
+# Standard input, output and error of the client, handed over so that the job writes straight to them
+STANDARD_FDS                : List[int] = [0, 1, 2]
+HEADER_FORMAT               : str       = '!I'
+EXIT_CODE_FORMAT            : str       = '!i'
+ACKNOWLEDGE                 : bytes     = b'S'
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def send_request(connection: socket.socket, request: Dict[str, Any]) -> None:
+    payload = json.dumps(request).encode('utf-8')
+    message = struct.pack(HEADER_FORMAT, len(payload)) + payload
+    # The descriptors travel with the first bytes of the message
+    sent = connection.sendmsg([message], [(socket.SOL_SOCKET, socket.SCM_RIGHTS, array.array('i', STANDARD_FDS))])
+    connection.sendall(message[sent:])
+
+def receive_request(connection: socket.socket) -> Tuple[Dict[str, Any], List[int]]:
+    fds = array.array('i')
+    data, ancillary, _, _ = connection.recvmsg(REQUEST_MAX_BYTES, socket.CMSG_SPACE(len(STANDARD_FDS) * fds.itemsize))
+    for level, kind, content in ancillary:
+        if level == socket.SOL_SOCKET and kind == socket.SCM_RIGHTS:
+            fds.frombytes(content[:len(content) - (len(content) % fds.itemsize)])
+
+    header_size = struct.calcsize(HEADER_FORMAT)
+    while len(data) < header_size or len(data) < header_size + struct.unpack(HEADER_FORMAT, data[:header_size])[0]:
+        chunk = connection.recv(REQUEST_MAX_BYTES)
+        if chunk == b'':
+            for fd in fds: os.close(fd)
+            raise ConnectionError('request interrupted by the client')
+        data = data + chunk
+
+    length = struct.unpack(HEADER_FORMAT, data[:header_size])[0]
+    return (json.loads(data[header_size:header_size + length].decode('utf-8')), list(fds))
+
+def receive_exactly(connection: socket.socket, size: int) -> bytes:
+    data = b''
+    while len(data) < size:
+        chunk = connection.recv(size - len(data))
+        if chunk == b'': break
+        data = data + chunk
+    return data
+
+def get_exit_code(error: SystemExit) -> int:
+    # Mirrors the interpreter, messages given to 'exit' are printed and treated as failures
+    if error.code is None: return 0
+    if isinstance(error.code, int): return error.code
+    print(error.code, file=sys.stderr)
+    return 1
+
+def get_status_code(status: int) -> int:
+    if os.WIFEXITED(status): return os.WEXITSTATUS(status)
+    if os.WIFSIGNALED(status): return 128 + os.WTERMSIG(status)
+    return 1
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def get_socket_path(key_parts: List[str]) -> str:
+    # Unix socket paths are limited in length, hence the key is hashed
+    key = hashlib.sha1('\n'.join(key_parts).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), SOCKET_NAME_FORMAT.format(user=os.getuid(), key=key))
+
+def submit(socket_path: str, request: Dict[str, Any]) -> Optional[int]:
+    # Returns the exit code of the job, or None when no daemon accepted it and it is yet to be executed
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try: connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+
+    try:
+        send_request(connection, request)
+        if connection.recv(1) != ACKNOWLEDGE: return None
+    except OSError:
+        connection.close()
+        return None
+
+    try: data = receive_exactly(connection, struct.calcsize(EXIT_CODE_FORMAT))
+    except OSError: data = b''
+    connection.close()
+
+    if len(data) != struct.calcsize(EXIT_CODE_FORMAT):
+        print("🚨 Worker daemon terminated before the job concluded", file=sys.stderr)
+        return 1
+    return struct.unpack(EXIT_CODE_FORMAT, data)[0]
+
+def spawn(command: List[str], log_path: str) -> None:
+    # Detached from the job, so that the daemon outlives it and is not killed along with it
+    log_file = open(log_path, 'ab')
+    subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=log_file, stderr=subprocess.STDOUT,
+        start_new_session=True, close_fds=True)
+    log_file.close()
+
+# =================================== PUBLIC CLASSES ===================================
+
+class ForkServer():
+
+    def __init__(self, socket_path: str, warm: Callable[[], None], prepare: Callable[[Dict[str, Any]], None],
+        run: Callable[[Dict[str, Any]], int], idle_seconds: float = DAEMON_IDLE_SECONDS) -> None:
+
+        self.socket_path    : str                                   = socket_path
+        self.warm           : Callable[[], None]                    = warm
+        self.prepare        : Callable[[Dict[str, Any]], None]      = prepare
+        self.run            : Callable[[Dict[str, Any]], int]       = run
+        self.idle_seconds   : float                                 = idle_seconds
+
+        self.lock_file      : Optional[Any]                         = None
+        self.listener       : Optional[socket.socket]               = None
+        self.selector       : selectors.BaseSelector                = selectors.DefaultSelector()
+        # Children still running, mapped to the connection of their client (None once it hung up)
+        self.children       : Dict[int, Optional[socket.socket]]    = {}
+        # Written on 'SIGCHLD', so that concluded children are reaped without waiting for the next poll
+        self.wakeup         : Tuple[int, int]                       = os.pipe()
+
+    def acquire_lock(self) -> bool:
+        # Several jobs may try to start a daemon at once, only the first one proceeds
+        self.lock_file = open(self.socket_path + LOCK_EXTENSION, 'w')
+        try: fcntl.flock(self.lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            self.lock_file.close()
+            return False
+        return True
+
+    def serve(self) -> None:
+        if not self.acquire_lock():
+            print(f"✅ Worker daemon already running for '{self.socket_path}'")
+            return
+
+        # Imports are done before listening, jobs arriving meanwhile are executed directly by their clients
+        self.warm()
+        if os.path.exists(self.socket_path): os.unlink(self.socket_path)
+        self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self.listener.listen(64)
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        os.set_blocking(self.wakeup[0], False)
+        os.set_blocking(self.wakeup[1], False)
+        self.selector.register(self.wakeup[0], selectors.EVENT_READ)
+        signal.signal(signal.SIGCHLD, lambda signal_number, frame: None)
+        signal.set_wakeup_fd(self.wakeup[1])
+        print(f"🚀 Worker daemon listening on '{self.socket_path}'", flush=True)
+
+        last_activity = time.time()
+        try:
+            while len(self.children) != 0 or time.time() - last_activity < self.idle_seconds:
+                for key, _ in self.selector.select(DAEMON_POLL_SECONDS):
+                    if key.fileobj is self.listener: self.accept()
+                    elif key.fileobj == self.wakeup[0]: os.read(self.wakeup[0], 4096)
+                    else: self.hang_up(key.fileobj)
+                    last_activity = time.time()
+                if self.reap() != 0: last_activity = time.time()
+        finally:
+            self.listener.close()
+            if os.path.exists(self.socket_path): os.unlink(self.socket_path)
+            self.lock_file.close()
+            print(f"💤 Worker daemon stopped after {self.idle_seconds:.0f} idle seconds", flush=True)
+
+    def accept(self) -> None:
+        connection, _ = self.listener.accept()
+        connection.settimeout(REQUEST_TIMEOUT_SECONDS)
+        try: request, fds = receive_request(connection)
+        except (OSError, ValueError) as error:
+            print(f"⚠️  Worker daemon discarded a request: {error}", flush=True)
+            connection.close()
+            return
+
+        try: self.prepare(request)
+        except Exception as error: print(f"⚠️  Worker daemon could not prepare a request: {error}", flush=True)
+
+        sys.stdout.flush()
+        sys.stderr.flush()
+        pid = os.fork()
+        if pid == 0: self.execute_child(connection, request, fds)
+
+        for fd in fds: os.close(fd)
+        self.children[pid] = connection
+        connection.settimeout(None)
+        try: connection.sendall(ACKNOWLEDGE)
+        except OSError: pass
+        self.selector.register(connection, selectors.EVENT_READ)
+
+    def execute_child(self, connection: socket.socket, request: Dict[str, Any], fds: List[int]) -> None:
+        code = 1
+        try:
+            # Own session, so that the job and everything it starts can be terminated as a group
+            os.setsid()
+            signal.set_wakeup_fd(-1)
+            for signal_number in [signal.SIGTERM, signal.SIGINT, signal.SIGHUP, signal.SIGCHLD]: signal.signal(signal_number, signal.SIG_DFL)
+            self.selector.close()
+            os.close(self.wakeup[0])
+            os.close(self.wakeup[1])
+            self.listener.close()
+            self.lock_file.close()
+            for other_connection in self.children.values():
+                if other_connection is not None: other_connection.close()
+            connection.close()
+
+            for target, fd in zip(STANDARD_FDS, fds):
+                os.dup2(fd, target)
+                os.close(fd)
+            os.chdir(request['cwd'])
+            os.environ.clear()
+            os.environ.update(request['environment'])
+
+            code = self.run(request)
+        except SystemExit as error: code = get_exit_code(error)
+        except BaseException: traceback.print_exc()
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally: os._exit(code)
+
+    def hang_up(self, connection: socket.socket) -> None:
+        # The client only closes its connection once terminated (e.g. killed by the manager), so is the job
+        try: data = connection.recv(1)
+        except OSError: data = b''
+        if data != b'': return
+
+        self.selector.unregister(connection)
+        connection.close()
+        for pid, child_connection in self.children.items():
+            if child_connection is not connection: continue
+            self.children[pid] = None
+            try: os.killpg(pid, signal.SIGTERM)
+            except OSError:
+                try: os.kill(pid, signal.SIGTERM)
+                except OSError: pass
+
+    def reap(self) -> int:
+        reaped = 0
+        while len(self.children) != 0:
+            try: pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError: break
+            if pid == 0: break
+
+            reaped = reaped + 1
+            connection = self.children.pop(pid, None)
+            if connection is None: continue
+            self.selector.unregister(connection)
+            try: connection.sendall(struct.pack(EXIT_CODE_FORMAT, get_status_code(status)))
+            except OSError: pass
+            connection.close()
+        return reaped
@@ -0,0 +1,79 @@
+import os
+import json
+import threading
+
+from typing import Dict, List, Optional
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+HISTORY_FILE_NAME           : str   = 'runtime_history.json'
+# Estimates follow the most recent executions, so that code or hardware changes are picked up
+HISTORY_WINDOW              : int   = 20
+
+JOB_CLASS_SEPARATOR         : str   = ' - '
+FEATURE_IMPORTANCE_TAG      : str   = 'Feature Importance'
+
+# Relative cost of each classifier, used for job classes never executed before
+COST_BY_CLASSIFIER          : Dict[str, float]  = { 'NB': 1.0, 'DT': 2.0, 'SVM': 4.0, 'RF': 8.0, 'MLP': 16.0 }
+COST_DEFAULT                : float             = 1.0
+COST_FEATURE_IMPORTANCE     : float             = 10.0
+SECONDS_PER_COST_DEFAULT    : float             = 60.0
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def job_class_cost(job_class: Optional[str]) -> float:
+    if job_class is None: return COST_DEFAULT
+
+    fields = job_class.split(JOB_CLASS_SEPARATOR)
+    cost = COST_BY_CLASSIFIER.get(fields[0], COST_DEFAULT)
+    if fields[-1] == FEATURE_IMPORTANCE_TAG: cost = cost * COST_FEATURE_IMPORTANCE
+    return cost
+
+# =================================== PUBLIC CLASSES ===================================
+
+class RuntimeHistory():
+
+    def __init__(self, directory: str) -> None:
+        if not os.path.exists(directory) or not os.path.isdir(directory): os.makedirs(directory, exist_ok=True)
+        self.path       : str                           = os.path.join(directory, HISTORY_FILE_NAME)
+        self.lock       : threading.Lock                = threading.Lock()
+        self.entries    : Dict[str, Dict[str, float]]   = {}
+
+        if os.path.exists(self.path):
+            file = open(self.path, 'r')
+            try: self.entries = json.load(file)
+            except ValueError: print(f"⚠️  Runtime history at '{self.path}' is corrupted, starting from scratch")
+            file.close()
+
+    def record(self, job_class: Optional[str], duration: float) -> None:
+        if job_class is None: return
+
+        with self.lock:
+            entry = self.entries.setdefault(job_class, { 'count': 0, 'mean': 0.0 })
+            entry['count'] = entry['count'] + 1
+            entry['mean'] = entry['mean'] + (duration - entry['mean']) / min(entry['count'], HISTORY_WINDOW)
+            self.save()
+
+    def save(self) -> None:
+        # Called while holding the lock, replaced atomically so that concurrent sweeps never read a partial file
+        temporary_path = self.path + f'.{os.getpid()}.tmp'
+        file = open(temporary_path, 'w')
+        json.dump(self.entries, file, indent=1, sort_keys=True)
+        file.close()
+        os.replace(temporary_path, self.path)
+
+    def is_known(self, job_class: Optional[str]) -> bool:
+        with self.lock:
+            return job_class is not None and job_class in self.entries
+
+    def seconds_per_cost(self) -> float:
+        # Calibrates the cost model against the classes already executed
+        ratios : List[float] = [ entry['mean'] / job_class_cost(job_class) for job_class, entry in self.entries.items() ]
+        if len(ratios) == 0: return SECONDS_PER_COST_DEFAULT
+        return sorted(ratios)[len(ratios) // 2]
+
+    def estimate(self, job_class: Optional[str], seconds_per_cost: Optional[float] = None) -> float:
+        with self.lock:
+            if job_class is not None and job_class in self.entries: return self.entries[job_class]['mean']
+            if seconds_per_cost is None: seconds_per_cost = self.seconds_per_cost()
+            return job_class_cost(job_class) * seconds_per_cost
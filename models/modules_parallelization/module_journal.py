@@ -0,0 +1,83 @@
+import os
+import json
+import time
+import threading
+
+from typing import Any, Dict, List, Optional, Tuple
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+JOURNAL_FILE_NAME   : str   = 'journal.jsonl'
+
+EVENT_QUEUED        : str   = 'queued'
+EVENT_STARTED       : str   = 'started'
+EVENT_FINISHED      : str   = 'finished'
+EVENT_FAILED        : str   = 'failed'
+# Statuses no later event moves a script out of (failed scripts are retried, by this execution or by the next one)
+TERMINAL_EVENTS     : List[str] = [EVENT_FINISHED]
+
+# =================================== PUBLIC CLASSES ===================================
+
+class JobState():
+
+    def __init__(self, execution_id: str) -> None:
+        self.execution_id   : str               = execution_id
+        self.status         : Optional[str]     = None
+        self.attempts       : int               = 0
+        self.exit_code      : Optional[int]     = None
+        self.duration       : Optional[float]   = None
+
+    def is_completed(self) -> bool: return self.status == EVENT_FINISHED
+    def is_failed(self) -> bool: return self.status == EVENT_FAILED
+
+class JobJournal():
+
+    def __init__(self, directory: str) -> None:
+        if not os.path.exists(directory) or not os.path.isdir(directory): os.makedirs(directory, exist_ok=True)
+        self.path : str             = os.path.join(directory, JOURNAL_FILE_NAME)
+        self.lock : threading.Lock  = threading.Lock()
+
+    def record(self, event: str, execution_id: str, **fields: Any) -> None:
+        self.record_many(event, [(execution_id, fields)])
+
+    def record_many(self, event: str, entries: List[Tuple[str, Dict[str, Any]]]) -> None:
+        current_time = time.time()
+        lines : List[str] = []
+        for execution_id, fields in entries:
+            entry : Dict[str, Any] = { 'time': current_time, 'event': event, 'execution_id': execution_id }
+            entry.update(fields)
+            lines.append(json.dumps(entry) + '\n')
+
+        # Append-only and synced, so that a crash never loses an already reported event
+        with self.lock:
+            file = open(self.path, 'a')
+            file.write(''.join(lines))
+            file.flush()
+            os.fsync(file.fileno())
+            file.close()
+
+    def replay(self) -> Dict[str, JobState]:
+        states : Dict[str, JobState] = {}
+        if not os.path.exists(self.path): return states
+
+        file = open(self.path, 'r')
+        for line in file:
+            # A line truncated by a crash while writing is simply ignored
+            try: entry = json.loads(line)
+            except ValueError: continue
+
+            execution_id = entry['execution_id']
+            if execution_id not in states: states[execution_id] = JobState(execution_id)
+            state = states[execution_id]
+
+            # Scripts queued again (or copies reporting late) after they concluded keep their outcome
+            if state.status in TERMINAL_EVENTS: continue
+            state.status = entry['event']
+            # Speculative copies run alongside an attempt, they do not take from the script's retries
+            if entry['event'] == EVENT_STARTED and not entry.get('speculative', False): state.attempts += 1
+            if entry['event'] in [EVENT_FINISHED, EVENT_FAILED]:
+                state.exit_code = entry.get('exit_code', None)
+                state.duration = entry.get('duration', None)
+        file.close()
+
+        return states
@@ -0,0 +1,137 @@
+import os
+import gzip
+import time
+import codecs
+import shutil
+import threading
+
+from typing import Callable, List
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+LOG_READ_BYTES          : int   = 32 * 1024
+LOG_FLUSH_BYTES         : int   = 64 * 1024
+LOG_FLUSH_SECONDS       : float = 5.0
+
+EXECUTION_HEADER        : str   = "=================================================== NEW EXECUTION ===================================================\n"
+
+# =================================== PUBLIC CLASSES ===================================
+
+class ProgressFilter():
+
+    def __init__(self, strip_progress: bool) -> None:
+        self.strip_progress : bool  = strip_progress
+        self.pending        : str   = ''
+
+    def feed(self, text: str) -> str:
+        if not self.strip_progress: return text
+
+        # Pseudo-terminals end lines with '\r\n', any other '\r' redraws the current line (e.g. 'tqdm' bars)
+        text = (self.pending + text).replace('\r\n', '\n')
+        lines = text.split('\n')
+        self.pending = lines.pop()
+
+        # Only the last redraw of an unfinished line is kept, a trailing '\r' may still be part of a '\r\n'
+        cut = self.pending.rfind('\r', 0, max(0, len(self.pending) - 1))
+        self.pending = self.pending[cut + 1:]
+
+        return ''.join(line.rstrip('\r').rsplit('\r', 1)[-1] + '\n' for line in lines)
+
+    def close(self) -> str:
+        pending = self.pending.rstrip('\r').rsplit('\r', 1)[-1]
+        self.pending = ''
+        return pending
+
+class BufferedLogWriter():
+
+    def __init__(self, path: str, flush_seconds: float = LOG_FLUSH_SECONDS, flush_bytes: int = LOG_FLUSH_BYTES,
+        strip_progress: bool = True, compress: bool = False) -> None:
+
+        self.path           : str                   = path
+        self.flush_seconds  : float                 = flush_seconds
+        self.flush_bytes    : int                   = flush_bytes
+        self.compress       : bool                  = compress
+
+        self.decoder                                = codecs.getincrementaldecoder('utf-8')(errors='ignore')
+        self.filter         : ProgressFilter        = ProgressFilter(strip_progress)
+        self.lock           : threading.Lock        = threading.Lock()
+        self.buffer         : List[str]             = []
+        self.buffer_size    : int                   = 0
+        self.bytes_written  : int                   = 0
+        self.last_flush     : float                 = time.time()
+
+        file_exists = (os.path.exists(path) and os.path.isfile(path)) or os.path.exists(path + '.gz')
+        # Written as utf-8, the encoding sizes are counted in (buffered and written bytes, not characters)
+        self.file = open(path, 'a', encoding='utf-8')
+        if file_exists: self.file.write("\n")
+        self.file.write(EXECUTION_HEADER)
+
+    def write(self, data: bytes) -> None:
+        text = self.filter.feed(self.decoder.decode(data))
+        with self.lock:
+            if text != '':
+                self.buffer.append(text)
+                self.buffer_size += len(text.encode('utf-8'))
+            if self.buffer_size >= self.flush_bytes: self.flush_buffer()
+
+    def flush_if_due(self) -> None:
+        with self.lock:
+            if time.time() - self.last_flush >= self.flush_seconds: self.flush_buffer()
+
+    def flush_buffer(self) -> None:
+        # Called while holding the lock
+        if self.buffer_size != 0:
+            self.file.write(''.join(self.buffer))
+            self.file.flush()
+            self.bytes_written += self.buffer_size
+        self.buffer = []
+        self.buffer_size = 0
+        self.last_flush = time.time()
+
+    def close(self) -> None:
+        text = self.filter.feed(self.decoder.decode(b'', final=True)) + self.filter.close()
+        with self.lock:
+            if text != '':
+                self.buffer.append(text)
+                self.buffer_size += len(text.encode('utf-8'))
+            self.flush_buffer()
+            os.fsync(self.file.fileno())
+            self.file.close()
+
+        # Appending to an existing archive adds a new gzip member, which is read back as a single stream
+        if self.compress:
+            with open(self.path, 'rb') as source, gzip.open(self.path + '.gz', 'ab') as destination:
+                shutil.copyfileobj(source, destination)
+            os.remove(self.path)
+
+class LogPipeline():
+
+    def __init__(self, read_stdout: Callable[[int], bytes], read_stderr: Callable[[int], bytes],
+        out_writer: BufferedLogWriter, err_writer: BufferedLogWriter) -> None:
+
+        self.streams : List = [ (read_stdout, out_writer), (read_stderr, err_writer) ]
+        self.errors  : List[Exception] = []
+
+    def drain(self, read: Callable[[int], bytes], writer: BufferedLogWriter) -> None:
+        try:
+            for data in iter(lambda: read(LOG_READ_BYTES), b''): writer.write(data)
+        except Exception as error: self.errors.append(error)
+
+    def run(self) -> None:
+        # Both streams are drained at the same time, so a full stderr buffer never stalls the job
+        threads = [ threading.Thread(target=self.drain, args=stream, daemon=True) for stream in self.streams ]
+        for thread in threads: thread.start()
+
+        # The calling thread takes care of time based flushes while the streams are silent
+        writers = [ writer for _, writer in self.streams ]
+        flush_seconds = min(map(lambda writer: writer.flush_seconds, writers))
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(flush_seconds)
+                for writer in writers: writer.flush_if_due()
+
+        for writer in writers: writer.close()
+        if len(self.errors) != 0: raise self.errors[0]
+
+    def get_bytes_written(self) -> int:
+        return sum(map(lambda stream: stream[1].bytes_written, self.streams))
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+
+from typing import Callable, Dict, List, Optional
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+STATUS_FILE_NAME        : str   = 'status.json'
+PROMETHEUS_FILE_NAME    : str   = 'metrics.prom'
+METRICS_WRITE_SECONDS   : float = 10.0
+
+METRIC_PREFIX           : str   = 'parallelization_'
+DURATION_BUCKETS        : List[float] = [10, 30, 60, 300, 600, 1800, 3600, 3 * 3600, 6 * 3600, 12 * 3600, 24 * 3600]
+DURATION_PERCENTILES    : List[float] = [0.50, 0.90, 0.99]
+
+COUNTER_STARTED         : str   = 'scripts_started'
+COUNTER_CONCLUDED       : str   = 'scripts_concluded'
+COUNTER_FAILED          : str   = 'scripts_failed'
+COUNTER_RETRIED         : str   = 'scripts_retried'
+COUNTER_GAVE_UP         : str   = 'scripts_gave_up'
+COUNTER_SPECULATIVE     : str   = 'scripts_speculative'
+COUNTER_LOG_BYTES       : str   = 'log_bytes'
+COUNTERS                : List[str] = [COUNTER_STARTED, COUNTER_CONCLUDED, COUNTER_FAILED, COUNTER_RETRIED,
+    COUNTER_GAVE_UP, COUNTER_SPECULATIVE, COUNTER_LOG_BYTES]
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    if len(values) == 0: return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def write_atomically(path: str, content: str) -> None:
+    # Readers (e.g. a node exporter) never see a partially written file
+    temporary_path = path + '.tmp'
+    file = open(temporary_path, 'w')
+    file.write(content)
+    file.close()
+    os.replace(temporary_path, path)
+
+# =================================== PUBLIC CLASSES ===================================
+
+class SchedulerMetrics():
+
+    def __init__(self, directory: str, hostnames: List[str], gauges: Callable[[], Dict[str, Dict[str, float]]],
+        write_seconds: float = METRICS_WRITE_SECONDS) -> None:
+
+        if not os.path.exists(directory) or not os.path.isdir(directory): os.makedirs(directory, exist_ok=True)
+        self.directory      : str                                       = directory
+        self.gauges         : Callable[[], Dict[str, Dict[str, float]]] = gauges
+        self.write_seconds  : float                                     = write_seconds
+        self.start_time     : float                                     = time.time()
+
+        self.lock           : threading.Lock                = threading.Lock()
+        # Counters are kept per host, the totals are derived when exported
+        self.counters       : Dict[str, Dict[str, float]]   = dict((counter, dict((hostname, 0) for hostname in hostnames)) for counter in COUNTERS)
+        self.durations      : List[float]                   = []
+
+        self.stop_event     : threading.Event               = threading.Event()
+        self.thread         : Optional[threading.Thread]    = None
+
+    def increment(self, counter: str, hostname: str, value: float = 1) -> None:
+        with self.lock:
+            self.counters[counter][hostname] = self.counters[counter].get(hostname, 0) + value
+
+    def observe_duration(self, duration: float) -> None:
+        with self.lock:
+            self.durations.append(duration)
+
+    def export_status(self) -> Dict:
+        gauges = self.gauges()
+        with self.lock:
+            counters = dict((counter, dict(values)) for counter, values in self.counters.items())
+            durations = list(self.durations)
+
+        return {
+            'timestamp':    time.time(),
+            'uptime':       time.time() - self.start_time,
+            'gauges':       gauges,
+            'counters':     dict((counter, { 'total': sum(values.values()), 'by_host': values }) for counter, values in counters.items()),
+            'durations':    {
+                'count':        len(durations),
+                'sum':          sum(durations),
+                'percentiles':  dict((f'p{int(fraction * 100)}', percentile(durations, fraction)) for fraction in DURATION_PERCENTILES),
+            },
+        }
+
+    def export_prometheus(self, status: Dict) -> str:
+        lines : List[str] = []
+
+        for gauge, values in status['gauges'].items():
+            lines.append(f'# TYPE {METRIC_PREFIX}{gauge} gauge')
+            for label, value in values.items():
+                if label == '': lines.append(f'{METRIC_PREFIX}{gauge} {value}')
+                else: lines.append(f'{METRIC_PREFIX}{gauge}{{hostname="{label}"}} {value}')
+
+        for counter, values in status['counters'].items():
+            lines.append(f'# TYPE {METRIC_PREFIX}{counter}_total counter')
+            for hostname, value in values['by_host'].items():
+                lines.append(f'{METRIC_PREFIX}{counter}_total{{hostname="{hostname}"}} {value}')
+
+        with self.lock: durations = list(self.durations)
+        lines.append(f'# TYPE {METRIC_PREFIX}script_duration_seconds histogram')
+        for bucket in DURATION_BUCKETS:
+            lines.append(f'{METRIC_PREFIX}script_duration_seconds_bucket{{le="{bucket}"}} {sum(1 for duration in durations if duration <= bucket)}')
+        lines.append(f'{METRIC_PREFIX}script_duration_seconds_bucket{{le="+Inf"}} {len(durations)}')
+        lines.append(f'{METRIC_PREFIX}script_duration_seconds_sum {sum(durations)}')
+        lines.append(f'{METRIC_PREFIX}script_duration_seconds_count {len(durations)}')
+
+        return '\n'.join(lines) + '\n'
+
+    def write(self) -> None:
+        status = self.export_status()
+        write_atomically(os.path.join(self.directory, STATUS_FILE_NAME), json.dumps(status, indent=2))
+        write_atomically(os.path.join(self.directory, PROMETHEUS_FILE_NAME), self.export_prometheus(status))
+
+    def start(self) -> None:
+
+        def write_loop():
+            while not self.stop_event.wait(self.write_seconds):
+                try: self.write()
+                except Exception as error: print(f"⚠️  Metrics could not be written: {error}")
+
+        self.thread = threading.Thread(target=write_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        # The final state is always written, so that the files describe the concluded execution
+        self.stop_event.set()
+        self.write()
@@ -0,0 +1,175 @@
+import time
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing             import Callable, Dict, List, Optional
+
+# =================================== CONSTANTS DEFINITION ===================================
+
+SAMPLE_COMMAND          : str   = "nproc; cat /proc/loadavg; grep -E '^(MemTotal|MemAvailable):' /proc/meminfo"
+SAMPLE_TIMEOUT_SECONDS  : float = 10.0
+SAMPLE_TTL_SECONDS      : float = 15.0
+SAMPLE_MAX_WORKERS      : int   = 16
+
+KILOBYTES_PER_GIGABYTE  : int   = 1024 * 1024
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def parse_sample(output: str) -> 'HostSample':
+    lines = [ line.strip() for line in output.splitlines() if line.strip() != '' ]
+
+    cores = int(lines[0])
+    load_1m = float(lines[1].split()[0])
+    memory : Dict[str, float] = {}
+    for line in lines[2:]:
+        key, value = line.split(':', 1)
+        memory[key] = float(value.split()[0]) / KILOBYTES_PER_GIGABYTE
+
+    return HostSample(cores, load_1m, memory['MemTotal'], memory['MemAvailable'])
+
+# =================================== PUBLIC FUNCTIONS ===================================
+
+def job_memory_gb(machine, job) -> float:
+    # Jobs not declaring their memory are estimated by the host
+    if job.get_memory_gb() is not None: return job.get_memory_gb()
+    return machine.get_job_memory_gb()
+
+def job_threads(job) -> int:
+    if job.get_threads() is not None: return job.get_threads()
+    return 1
+
+def memory_reserved_gb(machine, running: List) -> float:
+    return sum(job_memory_gb(machine, job) for job in running)
+
+def threads_reserved(running: List) -> int:
+    return sum(job_threads(job) for job in running)
+
+# =================================== PUBLIC CLASSES ===================================
+
+class HostSample():
+
+    def __init__(self, cores: int, load_1m: float, memory_total_gb: float, memory_available_gb: float) -> None:
+        self.cores                  : int   = cores
+        self.load_1m                : float = load_1m
+        self.memory_total_gb        : float = memory_total_gb
+        self.memory_available_gb    : float = memory_available_gb
+        self.timestamp              : float = time.time()
+        # Number of our own jobs running on the host when sampled, the load average lags behind new jobs
+        self.jobs_at_sample         : int   = 0
+
+class HostSampler():
+
+    def __init__(self, execute: Callable[[str, str, float], str], addresses: List[str],
+        ttl_seconds: float = SAMPLE_TTL_SECONDS, on_refresh: Optional[Callable[[], None]] = None) -> None:
+
+        self.execute        : Callable[[str, str, float], str]  = execute
+        self.addresses      : List[str]                         = addresses
+        self.ttl_seconds    : float                             = ttl_seconds
+        self.on_refresh     : Optional[Callable[[], None]]      = on_refresh
+
+        self.samples        : Dict[str, Optional[HostSample]]   = dict((address, None) for address in addresses)
+        self.jobs_running   : Callable[[str], int]              = lambda address: 0
+        self.stop_event     : threading.Event                   = threading.Event()
+        self.thread         : Optional[threading.Thread]        = None
+
+    def sample_address(self, address: str) -> Optional[HostSample]:
+        try: sample = parse_sample(self.execute(address, SAMPLE_COMMAND, SAMPLE_TIMEOUT_SECONDS))
+        except Exception: return None
+        sample.jobs_at_sample = self.jobs_running(address)
+        return sample
+
+    def refresh(self) -> None:
+        number_workers = max(1, min(SAMPLE_MAX_WORKERS, len(self.addresses)))
+        with ThreadPoolExecutor(max_workers=number_workers) as executor:
+            samples = list(executor.map(self.sample_address, self.addresses))
+
+        # A failed sample keeps the previous one until it expires
+        for address, sample in zip(self.addresses, samples):
+            if sample is not None: self.samples[address] = sample
+        if self.on_refresh is not None: self.on_refresh()
+
+    def get(self, address: str) -> Optional[HostSample]:
+        sample = self.samples.get(address, None)
+        if sample is None or time.time() - sample.timestamp > 2 * self.ttl_seconds: return None
+        return sample
+
+    def start(self, jobs_running: Callable[[str], int]) -> None:
+        self.jobs_running = jobs_running
+        self.refresh()
+
+        def refresh_loop():
+            while not self.stop_event.wait(self.ttl_seconds): self.refresh()
+
+        self.thread = threading.Thread(target=refresh_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        self.stop_event.set()
+
+class PlacementPolicy():
+
+    def __init__(self, sampler: Optional[HostSampler]) -> None:
+        self.sampler : Optional[HostSampler] = sampler
+
+    def projected_load(self, sample: HostSample, jobs_running: int) -> float:
+        # Jobs we started after the sample are not yet reflected in the load average
+        jobs_since_sample = max(0, jobs_running - sample.jobs_at_sample)
+        return (sample.load_1m + jobs_since_sample + 1) / sample.cores
+
+    def has_headroom(self, machine, sample: Optional[HostSample], running: List, job) -> bool:
+        if sample is None: return True
+
+        # Jobs started after the sample are accounted by their memory estimate, as is the job being placed
+        jobs_since_sample = max(0, len(running) - sample.jobs_at_sample)
+        memory_since_sample_gb = sum(job_memory_gb(machine, other) for other in running[len(running) - jobs_since_sample:])
+        memory_available_gb = sample.memory_available_gb - memory_since_sample_gb - job_memory_gb(machine, job)
+        if memory_available_gb < machine.get_min_free_memory_gb(): return False
+        if self.projected_load(sample, len(running)) > machine.get_max_load_per_core(): return False
+        return True
+
+    def can_fit(self, machine, job) -> bool:
+        # Whether the job fits on the host once it is empty, jobs fitting on no host can never be placed
+        if machine.get_tags() is not None and any(tag not in machine.get_tags() for tag in job.get_tags()): return False
+        if machine.get_memory_gb() is not None and job_memory_gb(machine, job) > machine.get_memory_gb(): return False
+        if machine.get_threads() is not None and job_threads(job) > machine.get_threads(): return False
+        return True
+
+    def fits(self, machine, running: List, job) -> bool:
+        # Capacities declared by the host are never exceeded, unlike the headroom measured from samples
+        if len(running) >= machine.get_max_jobs(): return False
+        if not self.can_fit(machine, job): return False
+        for tag in job.get_tags():
+            limit = machine.get_tag_limits().get(tag, None)
+            if limit is not None and sum(1 for other in running if tag in other.get_tags()) >= limit: return False
+        if machine.get_memory_gb() is not None and memory_reserved_gb(machine, running) + job_memory_gb(machine, job) > machine.get_memory_gb(): return False
+        if machine.get_threads() is not None and threads_reserved(running) + job_threads(job) > machine.get_threads(): return False
+        return True
+
+    def select(self, machines: List, running_jobs: Dict[str, List], job):
+
+        selected_machine = self.select_from(machines, running_jobs, job, True)
+        # When none of our jobs is running anywhere, waiting for other users would never end
+        if selected_machine is None and sum(map(len, running_jobs.values())) == 0:
+            selected_machine = self.select_from(machines, running_jobs, job, False)
+        return selected_machine
+
+    def select_from(self, machines: List, running_jobs: Dict[str, List], job, check_headroom: bool):
+
+        candidates = []
+        for machine in machines:
+            sample = self.sampler.get(machine.get_address()) if self.sampler is not None else None
+            running = running_jobs[machine.get_hostname()]
+            if not self.fits(machine, running, job): continue
+            if check_headroom and not self.has_headroom(machine, sample, running, job): continue
+
+            # Prefer least loaded hosts, hosts without samples are ranked by our own occupation
+            if sample is not None: score = self.projected_load(sample, len(running))
+            else: score = (len(running) + 1) / machine.get_max_jobs()
+            # Jobs declaring their memory go to the host they fill the most (best fit), keeping room for larger ones elsewhere
+            packing = 1.0
+            if job.get_memory_gb() is not None and machine.get_memory_gb() is not None and machine.get_memory_gb() > 0:
+                packing = (machine.get_memory_gb() - memory_reserved_gb(machine, running) - job_memory_gb(machine, job)) / machine.get_memory_gb()
+            candidates.append((packing, score, len(running), machine))
+
+        if len(candidates) == 0: return None
+        return min(candidates, key=lambda candidate: (candidate[0], candidate[1], candidate[2]))[3]
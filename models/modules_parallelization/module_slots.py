@@ -0,0 +1,89 @@
+import threading
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
+
+# =================================== PUBLIC CLASSES ===================================
+
+class SlotTracker():
+
+    def __init__(self, occupied: Dict[str, List[Any]], priority: Optional[Callable[[Any], float]] = None) -> None:
+        # Every read or write of 'occupied' (and of queues given to it) must happen while holding 'condition'
+        self.occupied   : Dict[str, List[Any]]              = occupied
+        # Queues are expected to be sorted by decreasing priority, deferred jobs are put back in their place
+        self.priority   : Optional[Callable[[Any], float]]  = priority
+        self.condition  : threading.Condition               = threading.Condition()
+        # Jobs waiting to be put back into a queue (e.g. retries waiting for their backoff)
+        self.deferred   : int                               = 0
+
+    def _number_running(self) -> int:
+        return sum(map(len, self.occupied.values()))
+
+    def defer(self, queue: List[Any], job: Any, delay: float) -> None:
+        # Must be called before releasing the job's slot, so that the dispatcher keeps waiting for it
+        with self.condition:
+            self.deferred += 1
+
+        def requeue():
+            with self.condition:
+                self.deferred -= 1
+                self.enqueue(queue, job)
+
+        timer = threading.Timer(delay, requeue)
+        timer.daemon = True
+        timer.start()
+
+    def enqueue(self, queue: List[Any], job: Any) -> None:
+        with self.condition:
+            position = len(queue)
+            if self.priority is not None:
+                job_priority = self.priority(job)
+                position = next((index for index, queued in enumerate(queue) if self.priority(queued) < job_priority), len(queue))
+            queue.insert(position, job)
+            self.condition.notify_all()
+
+    def acquire_next(self, queue: List[Any], select: Callable[[Any], Optional[str]], timeout: Optional[float] = None,
+        signature: Optional[Callable[[Any], Hashable]] = None) -> Optional[Tuple[Any, str]]:
+        # Blocks until 'select' finds a host for a queued job, re-evaluating on every release (or every 'timeout' seconds)
+        # Jobs further down the queue are placed while the first ones fit nowhere, None once all is done
+        with self.condition:
+            while True:
+                # Jobs with the same signature (e.g. resources) as one that did not fit are not evaluated again
+                unplaced : Set[Hashable] = set()
+                for index, job in enumerate(queue):
+                    job_signature = signature(job) if signature is not None else None
+                    if job_signature is not None and job_signature in unplaced: continue
+                    hostname = select(job)
+                    if hostname is not None:
+                        queue.pop(index)
+                        self.occupied[hostname].append(job)
+                        return (job, hostname)
+                    if job_signature is not None: unplaced.add(job_signature)
+
+                if len(queue) == 0 and self._number_running() == 0 and self.deferred == 0: return None
+                self.condition.wait(timeout)
+
+    def try_acquire(self, job: Any, select: Callable[[], Optional[str]]) -> Optional[str]:
+        # Non-blocking version of 'acquire', None when 'select' finds no host
+        with self.condition:
+            hostname = select()
+            if hostname is not None: self.occupied[hostname].append(job)
+            return hostname
+
+    def release(self, hostname: str, job: Any) -> None:
+        with self.condition:
+            if job in self.occupied[hostname]: self.occupied[hostname].remove(job)
+            self.condition.notify_all()
+
+    def notify(self) -> None:
+        # Wakes up the dispatcher so that it re-evaluates placement (e.g. after fresh host samples)
+        with self.condition:
+            self.condition.notify_all()
+
+    def number_running(self) -> int:
+        with self.condition:
+            return self._number_running()
+
+    def wait_until_idle(self) -> None:
+        with self.condition:
+            while self._number_running() != 0 or self.deferred != 0:
+                self.condition.wait()
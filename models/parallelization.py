@@ -1,33 +1,58 @@
 import os
 import time
+import shlex
+import fnmatch
 import pickle
 import argparse
-import warnings
 import threading
+import configparser
 
-from io     import TextIOWrapper
 from dotenv import load_dotenv
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
 from tqdm import tqdm
 
-warnings.filterwarnings(action='ignore', module='paramiko')
-import paramiko
+# Local Modules - Parallelization
+import modules_parallelization.module_logs         as module_logs
+import modules_parallelization.module_slots        as module_slots
+import modules_parallelization.module_metrics      as module_metrics
+import modules_parallelization.module_history      as module_history
+import modules_parallelization.module_journal      as module_journal
+import modules_parallelization.module_backends     as module_backends
+import modules_parallelization.module_placement    as module_placement
+# Local Modules - Auxiliary
+import modules_aux.module_threads                  as module_threads
+import modules_aux.module_scratch                  as module_scratch
 
 # =================================================== CONSTANTS DEFINITION ===================================================
 
 TMP_DIRECTORY = './tmp_parallelization/'
+BUNDLES_DIRECTORY = 'bundles'
 LOGS_DIRECTORY = 'logs/'
 FILE_SAVE_NAME = 'parallelization_manager.pkl'
+MACHINES_CONFIG = './machines_cpu.config'
+
+MAX_RETRIES = 2
+RETRY_BACKOFF_SECONDS = 30
+RETRY_BACKOFF_MAX_SECONDS = 600
+SPECULATION_MIN_SECONDS = 60
+
+# Optional manifest columns, given as '<key>=<value>' after the command
+MANIFEST_KEY_CLASS = 'class'
+MANIFEST_KEY_AFTER = 'after'
+# Scripts that only have to finish, the script still runs when they fail (e.g. aggregating partial results)
+MANIFEST_KEY_AFTER_ANY = 'after_any'
+# Resources of the script, bin-packed against the capacities declared by each host
+MANIFEST_KEY_MEMORY = 'memory'
+MANIFEST_KEY_THREADS = 'threads'
+MANIFEST_KEY_TAGS = 'tags'
+MANIFEST_KEYS = [MANIFEST_KEY_CLASS, MANIFEST_KEY_AFTER, MANIFEST_KEY_AFTER_ANY, MANIFEST_KEY_MEMORY, MANIFEST_KEY_THREADS, MANIFEST_KEY_TAGS]
 
 load_dotenv()
 
 SSH_USER = os.getenv('SSH_USER')
 SSH_KEY = os.getenv('SSH_KEY')
 
-if SSH_USER is None or SSH_KEY is None:
-    exit("🚨 Please create a '.env' file with 'SSH_USER' and 'SSH_KEY' defined")
-
 # =================================================== CLASSES DEFINITION ===================================================
 
 Hostname = str
@@ -35,50 +60,220 @@ FilePath = str
 
 class Machine():
 
-    def __init__(self, hostname : Hostname, address : str) -> None:
-        self.hostname   : Hostname  = hostname
-        self.address    : str       = address
+    def __init__(self, hostname : Hostname, address : str, max_jobs : int, min_free_memory_gb : float = 0.0,
+        max_load_per_core : float = float('inf'), job_memory_gb : float = 0.0, memory_gb : Optional[float] = None,
+        threads : Optional[int] = None, tags : Optional[List[str]] = None, tag_limits : Optional[Dict[str, int]] = None) -> None:
+        self.hostname           : Hostname          = hostname
+        self.address            : str               = address
+        self.max_jobs           : int               = max_jobs
+        self.min_free_memory_gb : float             = min_free_memory_gb
+        self.max_load_per_core  : float             = max_load_per_core
+        self.job_memory_gb      : float             = job_memory_gb
+        # Capacities shared by the resources declared by the scripts placed on the host (None when unlimited)
+        self.memory_gb          : Optional[float]   = memory_gb
+        self.threads            : Optional[int]     = threads
+        # Tags of the scripts the host accepts (None when it accepts any), and how many of them may run at once
+        self.tags               : Optional[List[str]] = list(tags) if tags is not None else None
+        self.tag_limits         : Dict[str, int]    = dict(tag_limits) if tag_limits is not None else {}
 
     def get_hostname(self) -> Hostname: return self.hostname
     def get_address(self) -> str: return self.address
+    def get_max_jobs(self) -> int: return self.max_jobs
+    def get_min_free_memory_gb(self) -> float: return self.min_free_memory_gb
+    def get_max_load_per_core(self) -> float: return self.max_load_per_core
+    def get_job_memory_gb(self) -> float: return self.job_memory_gb
+    def get_memory_gb(self) -> Optional[float]: return self.memory_gb
+    def get_threads(self) -> Optional[int]: return self.threads
+    def get_tags(self) -> Optional[List[str]]: return self.tags
+    def get_tag_limits(self) -> Dict[str, int]: return self.tag_limits
 
 class ExecutionScript():
 
-    def __init__(self, execution_id : str, file_path : FilePath) -> None:
-        self.execution_id   : str       = execution_id
-        self.file_path      : FilePath  = file_path
+    def __init__(self, execution_id : str, command : str, job_class : Optional[str] = None, dependencies : Optional[List[str]] = None,
+        memory_gb : Optional[float] = None, threads : Optional[int] = None, tags : Optional[List[str]] = None, any_dependencies : Optional[List[str]] = None) -> None:
+        self.execution_id   : str               = execution_id
+        self.command        : str               = command
+        self.job_class      : Optional[str]     = job_class
+        # Execution ids (or shell-style patterns) of the scripts that must conclude before this one starts
+        self.dependencies   : List[str]         = list(dependencies) if dependencies is not None else []
+        # Same, but only waiting for the scripts to finish, whether they concluded or were given up
+        self.any_dependencies : List[str]       = list(any_dependencies) if any_dependencies is not None else []
+        # Resources of the script, undeclared memory is estimated by each host
+        self.memory_gb      : Optional[float]   = memory_gb
+        self.threads        : Optional[int]     = threads
+        self.tags           : List[str]         = list(tags) if tags is not None else []
 
     def get_execution_id(self) -> str: return self.execution_id
-    def get_file_path(self) -> FilePath: return self.file_path
+    def get_command(self) -> str: return self.command
+    def get_job_class(self) -> Optional[str]: return self.job_class
+    def get_dependencies(self) -> List[str]: return self.dependencies
+    def get_any_dependencies(self) -> List[str]: return self.any_dependencies
+    def get_memory_gb(self) -> Optional[float]: return self.memory_gb
+    def get_threads(self) -> Optional[int]: return self.threads
+    def get_tags(self) -> List[str]: return self.tags
+    def get_resources(self) -> Tuple[Optional[float], Optional[int], Tuple[str, ...]]: return (self.memory_gb, self.threads, tuple(sorted(self.tags)))
+
+class ExecutionCopy():
+
+    def __init__(self, machine : Machine, speculative : bool) -> None:
+        self.machine        : Machine                                   = machine
+        self.speculative    : bool                                      = speculative
+        self.start_time     : float                                     = time.time()
+        self.handle         : Optional[module_backends.ExecutionHandle] = None
+
+    def get_machine(self) -> Machine: return self.machine
+    def is_speculative(self) -> bool: return self.speculative
+    def get_start_time(self) -> float: return self.start_time
+    def get_handle(self) -> Optional[module_backends.ExecutionHandle]: return self.handle
+    def set_handle(self, handle : module_backends.ExecutionHandle) -> None: self.handle = handle
 
 class ParallelizationManager():
 
     TMP_DIRECTORY = TMP_DIRECTORY
     FILE_SAVE_NAME = FILE_SAVE_NAME
 
-    def __init__(self, machines : List[Machine], timestamp_id : str, wait_seconds : float, max_jobs_per_machine : float) -> None:
+    def __init__(self, machines : List[Machine], timestamp_id : str, wait_seconds : float, max_jobs_per_machine : float,
+        max_retries : int = MAX_RETRIES, retry_backoff_seconds : float = RETRY_BACKOFF_SECONDS,
+        backend_name : str = module_backends.BACKEND_SSH, log_flush_seconds : float = module_logs.LOG_FLUSH_SECONDS,
+        strip_progress : bool = True, compress_logs : bool = False, speculation_factor : Optional[float] = None,
+        metrics_seconds : float = module_metrics.METRICS_WRITE_SECONDS) -> None:
+        self.backend_name           : str           = backend_name
         self.machines               : List[Machine] = machines
         self.timestamp_id           : str           = timestamp_id
         self.wait_seconds           : float         = wait_seconds
         self.max_jobs_per_machine   : float         = max_jobs_per_machine
+        self.max_retries            : int           = max_retries
+        self.retry_backoff_seconds  : float         = retry_backoff_seconds
+        self.log_flush_seconds      : float         = log_flush_seconds
+        self.strip_progress         : bool          = strip_progress
+        self.compress_logs          : bool          = compress_logs
+        self.speculation_factor     : Optional[float] = speculation_factor
+        self.metrics_seconds        : float         = metrics_seconds
 
         # Scripts Management
         self.scripts_stack      : List[ExecutionScript]                 = []
         self.current_scripts    : Dict[Hostname, List[ExecutionScript]] = dict((machine.get_hostname(), []) for machine in self.machines)
         self.concluded_scripts  : Dict[Hostname, List[ExecutionScript]] = dict((machine.get_hostname(), []) for machine in self.machines)
 
+        # Backend, Journal and History Management
+        self.backend            : Optional[module_backends.ExecutionBackend]  = None
+        self.journal            : Optional[module_journal.JobJournal]         = None
+        self.history            : Optional[module_history.RuntimeHistory]     = None
+
         self.check_connectability()
 
+    def __getstate__(self) -> Dict:
+        # Open connections and locks are bound to the running process and can not be pickled
+        state = self.__dict__.copy()
+        state.pop('backend', None)
+        state.pop('journal', None)
+        state.pop('history', None)
+        return state
+
+    def __setstate__(self, state: Dict) -> None:
+        self.__dict__.update(state)
+        self.backend = None
+        self.journal = None
+        self.history = None
+
+    def get_journal(self) -> module_journal.JobJournal:
+        if self.journal is None:
+            self.journal = module_journal.JobJournal(os.path.join(self.TMP_DIRECTORY, self.timestamp_id))
+        return self.journal
+
+    def get_history(self) -> module_history.RuntimeHistory:
+        # Shared by every execution, so that estimates improve from one sweep to the next
+        if self.history is None: self.history = module_history.RuntimeHistory(self.TMP_DIRECTORY)
+        return self.history
+
+    def get_backend(self) -> module_backends.ExecutionBackend:
+        if self.backend is None: self.backend = create_backend(self.backend_name)
+        return self.backend
+
     def add_script_to_queue(self, script_id : str, script_path : FilePath) -> None:
         if not os.path.exists(script_path) or not os.path.isfile(script_path):
             exit(f"🚨 File at '{script_path}' does not exist")
-        execution_script = ExecutionScript(script_id, script_path)
+        execution_script = ExecutionScript(script_id, f"\"{script_path}\"")
         self.scripts_stack.append(execution_script)
+        self.get_journal().record(module_journal.EVENT_QUEUED, script_id, command=execution_script.get_command())
+
+    def add_scripts_from_manifest(self, manifest_path : FilePath) -> None:
+        if not os.path.exists(manifest_path) or not os.path.isfile(manifest_path):
+            exit(f"🚨 Manifest at '{manifest_path}' does not exist")
+
+        execution_ids = set(map(lambda script: script.get_execution_id(), self.scripts_stack))
+        execution_scripts : List[ExecutionScript] = []
+
+        file = open(manifest_path, 'r')
+        for line_number, line in enumerate(file, start=1):
+            line = line.rstrip('\n')
+            if line.strip() == '' or line.startswith('#'): continue
+            fields = line.split('\t')
+            if len(fields) < 2 or any(map(lambda field: field.strip() == '', fields)):
+                exit(f"🚨 Line {line_number} of manifest '{manifest_path}' is not in the format '<execution_id>\\t<command>[\\t<key>=<value>...]'")
+
+            execution_id, command = fields[0].strip(), fields[1].strip()
+            options : Dict[str, str] = {}
+            for field in fields[2:]:
+                key, _, value = field.strip().partition('=')
+                if key not in MANIFEST_KEYS: exit(f"🚨 Line {line_number} of manifest '{manifest_path}' has unknown key '{key}', expected one of '{MANIFEST_KEYS}'")
+                options[key] = value.strip()
+
+            dependencies = split_list(options.get(MANIFEST_KEY_AFTER, ''))
+            any_dependencies = split_list(options.get(MANIFEST_KEY_AFTER_ANY, ''))
+            tags = split_list(options.get(MANIFEST_KEY_TAGS, ''))
+            try:
+                memory_gb = float(options[MANIFEST_KEY_MEMORY]) if MANIFEST_KEY_MEMORY in options else None
+                threads = int(options[MANIFEST_KEY_THREADS]) if MANIFEST_KEY_THREADS in options else None
+            except ValueError: exit(f"🚨 Line {line_number} of manifest '{manifest_path}' has '{MANIFEST_KEY_MEMORY}' or '{MANIFEST_KEY_THREADS}' not numeric")
+            if execution_id in execution_ids: exit(f"🚨 Execution id '{execution_id}' is already queued")
+            execution_ids.add(execution_id)
+            execution_scripts.append(ExecutionScript(execution_id, command, options.get(MANIFEST_KEY_CLASS, None), dependencies, memory_gb, threads, tags, any_dependencies))
+        file.close()
+
+        # Queued events are written in a single append, instead of one synced write per script
+        self.scripts_stack.extend(execution_scripts)
+        self.get_journal().record_many(module_journal.EVENT_QUEUED,
+            [ (script.get_execution_id(), { 'command': script.get_command(), 'job_class': script.get_job_class(),
+                'dependencies': script.get_dependencies(), 'any_dependencies': script.get_any_dependencies(), 'memory_gb': script.get_memory_gb(), 'threads': script.get_threads(),
+                'tags': script.get_tags() }) for script in execution_scripts ])
+        print(f"✅ Added {len(execution_scripts)} scripts from manifest '{manifest_path}'!")
+
+    def resolve_dependencies(self) -> Tuple[Dict[str, Set[str]], Dict[str, Set[str]]]:
+
+        # Every dependency of each script, and the ones among them which are only waited for
+        execution_ids : List[str] = list(map(lambda script: script.get_execution_id(), self.scripts_stack))
+        dependencies : Dict[str, Set[str]] = {}
+        any_dependencies : Dict[str, Set[str]] = {}
+        for script in self.scripts_stack:
+            dependencies[script.get_execution_id()] = set()
+            any_dependencies[script.get_execution_id()] = set()
+            for pattern, tolerant in [ (pattern, False) for pattern in script.get_dependencies() ] + [ (pattern, True) for pattern in script.get_any_dependencies() ]:
+                matches = [ execution_id for execution_id in fnmatch.filter(execution_ids, pattern) if execution_id != script.get_execution_id() ]
+                if len(matches) == 0: exit(f"🚨 Dependency '{pattern}' of script '{script.get_execution_id()}' does not match any script")
+                dependencies[script.get_execution_id()].update(matches)
+                if tolerant: any_dependencies[script.get_execution_id()].update(matches)
+        # A script listed under both keys has to conclude
+        for script in self.scripts_stack:
+            for pattern in script.get_dependencies():
+                any_dependencies[script.get_execution_id()].difference_update(fnmatch.filter(execution_ids, pattern))
+
+        # Scripts are removed once all of their dependencies are removed, the ones left are part of a cycle
+        remaining = dict((execution_id, set(script_dependencies)) for execution_id, script_dependencies in dependencies.items())
+        removed = [ execution_id for execution_id, script_dependencies in remaining.items() if len(script_dependencies) == 0 ]
+        while len(removed) != 0:
+            removed_ids = set(removed)
+            for execution_id in removed: remaining.pop(execution_id)
+            for script_dependencies in remaining.values(): script_dependencies.difference_update(removed_ids)
+            removed = [ execution_id for execution_id, script_dependencies in remaining.items() if len(script_dependencies) == 0 ]
+        if len(remaining) != 0: exit(f"🚨 Dependencies between scripts contain a cycle: {sorted(remaining.keys())}")
+
+        return dependencies, any_dependencies
 
     def machines_available(self) -> List[Machine]:
         available_machines  : List[Machine] = []
         for machine in self.machines:
-            if len(self.current_scripts[machine.get_hostname()]) < self.max_jobs_per_machine:
+            if len(self.current_scripts[machine.get_hostname()]) < machine.get_max_jobs():
                 available_machines.append(machine)
 
         return available_machines
@@ -93,18 +288,16 @@ class ParallelizationManager():
 
     def check_connectability(self) -> None:
 
-        for machine in self.machines:
-            client = paramiko.SSHClient()
-            client.load_system_host_keys()
+        addresses = list(map(lambda machine: machine.get_address(), self.machines))
+        probe_results = self.get_backend().probe(addresses)
 
-            try:
-                client.connect(machine.get_address(), username=SSH_USER, password=SSH_KEY)
-                client.close()
-            except: exit(f"🚨 Connectability could not be established with '{machine.get_address()}'")
+        failed_addresses = [ address for address in addresses if probe_results[address] is not None ]
+        for address in failed_addresses: print(f"🚨 Connectability could not be established with '{address}': {probe_results[address]}")
+        if len(failed_addresses) != 0: exit(f"🚨 Connectability could not be established with '{failed_addresses}'")
 
     def run(self) -> None:
 
-        def get_filepaths(self : ParallelizationManager, process_id : str) -> Tuple[TextIOWrapper, TextIOWrapper]:
+        def get_log_writers(self : ParallelizationManager, process_id : str) -> Tuple[module_logs.BufferedLogWriter, module_logs.BufferedLogWriter]:
             log_path = os.path.join(self.TMP_DIRECTORY, self.timestamp_id, LOGS_DIRECTORY)
             if not os.path.exists(log_path) or not os.path.isdir(log_path):
                 os.makedirs(log_path, exist_ok=True)
@@ -112,87 +305,293 @@ class ParallelizationManager():
             out_path = os.path.join(log_path, f'parallelization.out.{process_id}.log')
             err_path = os.path.join(log_path, f'parallelization.err.{process_id}.log')
 
-            out_exists = os.path.exists(out_path) and os.path.isfile(out_path)
-            err_exists = os.path.exists(err_path) and os.path.isfile(err_path)
-
-            out_file = open(out_path, 'a')
-            err_file = open(err_path, 'a')
-
-            if out_exists: out_file.write("\n")
-            if err_exists: err_file.write("\n")
-
-            out_file.write("=================================================== NEW EXECUTION ===================================================\n")
-            err_file.write("=================================================== NEW EXECUTION ===================================================\n")
-
-            return (out_file, err_file)
-
-        def run_process_in_thread(self : ParallelizationManager, on_exit_callback, execution_script : ExecutionScript, machine : Machine, tracker : Optional[tqdm] = None):
+            out_writer = module_logs.BufferedLogWriter(out_path, self.log_flush_seconds, strip_progress=self.strip_progress, compress=self.compress_logs)
+            err_writer = module_logs.BufferedLogWriter(err_path, self.log_flush_seconds, strip_progress=self.strip_progress, compress=self.compress_logs)
+            return (out_writer, err_writer)
 
-            current_scripts = self.current_scripts[machine.get_hostname()]
-            current_scripts.append(execution_script)
-            self.current_scripts[machine.get_hostname()] = current_scripts
-            out_file, err_file = get_filepaths(self, execution_script.get_execution_id())
+        def get_bundle_path(self : ParallelizationManager, process_id : str) -> str:
+            bundle_path = os.path.join(self.TMP_DIRECTORY, self.timestamp_id, BUNDLES_DIRECTORY)
+            if not os.path.exists(bundle_path) or not os.path.isdir(bundle_path):
+                os.makedirs(bundle_path, exist_ok=True)
+            return os.path.abspath(os.path.join(bundle_path, f'{process_id}.tar.gz'))
 
-            client = paramiko.SSHClient()
-            client.load_system_host_keys()
-            client.connect(machine.get_address(), username=SSH_USER, password=SSH_KEY)
-            _stdin, _stdout, _stderr = client.exec_command(f"\"{execution_script.get_file_path()}\"", get_pty=True)
+        def get_thread_budget(self : ParallelizationManager, machine : Machine, execution_script : ExecutionScript) -> Optional[int]:
 
-            _stdout._set_mode('b')
-            _stderr._set_mode('b')
+            # Declared threads are reserved for the script, otherwise the cores are split among the jobs the host may run at once
+            if execution_script.get_threads() is not None: return execution_script.get_threads()
+            sample = host_sampler.get(machine.get_address())
+            cores = machine.get_threads() if machine.get_threads() is not None else (sample.cores if sample is not None else None)
+            if cores is None: return None
+            return module_threads.compute_thread_budget(cores, machine.get_max_jobs())
 
-            for line in iter(lambda: _stdout.readline(2048), b""):
-                out_file.write(line.decode('utf-8', errors='ignore'))
-                out_file.flush()
-                os.fsync(out_file.fileno())
+        def run_process_in_thread(self : ParallelizationManager, on_exit_callback, execution_script : ExecutionScript, execution_copy : ExecutionCopy, tracker : Optional[tqdm] = None):
 
-            out_file.write(_stdout.read().decode('utf-8', errors='ignore'))
-            err_file.write(_stderr.read().decode('utf-8', errors='ignore'))
-
-            out_file.close()
-            err_file.close()
-            
-            client.close()
-            on_exit_callback(self, execution_script, machine, tracker)
+            machine = execution_copy.get_machine()
+            exit_code : Optional[int] = None
+            try:
+                # Copies have their own logs, since both may be writing at the same time
+                log_id = execution_script.get_execution_id() + ('.speculative' if execution_copy.is_speculative() else '')
+                out_writer, err_writer = get_log_writers(self, log_id)
+
+                # Jobs writing to node-local scratch leave their outputs bundled at this path, unpacked once they conclude
+                bundle_path = get_bundle_path(self, log_id)
+                if os.path.exists(bundle_path): os.remove(bundle_path)
+                exports = [ f"{module_scratch.BUNDLE_VARIABLE}={shlex.quote(bundle_path)}" ]
+                thread_budget = get_thread_budget(self, machine, execution_script)
+                if thread_budget is not None: exports.append(f"{module_threads.THREAD_BUDGET_VARIABLE}={thread_budget}")
+                command = f"export {' '.join(exports)}; {execution_script.get_command()}"
+                handle = self.get_backend().launch(machine.get_address(), command)
+                with slots.condition:
+                    execution_copy.set_handle(handle)
+                    # Another copy may have concluded while this one was being launched
+                    cancelled = execution_script.get_execution_id() in concluded_ids
+                if cancelled: handle.kill()
+                log_pipeline = module_logs.LogPipeline(handle.read_stdout, handle.read_stderr, out_writer, err_writer)
+                log_pipeline.run()
+                metrics.increment(module_metrics.COUNTER_LOG_BYTES, machine.get_hostname(), log_pipeline.get_bytes_written())
+
+                exit_code = handle.wait()
+                handle.close()
+                # Unpacked before dependents are released, a job whose outputs are lost is executed again
+                if exit_code == 0 and os.path.exists(bundle_path):
+                    try:
+                        module_scratch.unpack_bundle(bundle_path)
+                        os.remove(bundle_path)
+                    except Exception as error:
+                        tqdm.write(f"🚨 Outputs of script '{execution_script.get_execution_id()}' could not be unpacked from '{bundle_path}': {error}")
+                        exit_code = None
+            except Exception as error:
+                tqdm.write(f"🚨 Script '{execution_script.get_execution_id()}' could not be executed on machine '{machine.get_hostname()}': {error}")
+            finally:
+                # Always give the slot back, otherwise the dispatcher would wait for it forever
+                on_exit_callback(self, execution_script, execution_copy, exit_code, time.time() - execution_copy.get_start_time(), tracker)
             return
 
-        def on_process_exit(self : ParallelizationManager, execution_script : ExecutionScript, machine : Machine, tracker: Optional[tqdm] = None):
+        def on_process_exit(self : ParallelizationManager, execution_script : ExecutionScript, execution_copy : ExecutionCopy, exit_code : Optional[int], duration : float, tracker: Optional[tqdm] = None):
+
+            execution_id = execution_script.get_execution_id()
+            machine = execution_copy.get_machine()
+            attempt = attempts[execution_id]
+
+            with slots.condition:
+                copies[execution_id].remove(execution_copy)
+                other_copies = copies.pop(execution_id) if len(copies[execution_id]) == 0 else list(copies[execution_id])
+                already_concluded = execution_id in concluded_ids
+                if exit_code == 0: concluded_ids.add(execution_id)
+
+            if already_concluded:
+                # Copy killed (or beaten) after another copy of the same script concluded
+                pass
+
+            elif exit_code == 0:
+                journal.record(module_journal.EVENT_FINISHED, execution_id, hostname=machine.get_hostname(), attempt=attempt, exit_code=exit_code,
+                    duration=duration, speculative=execution_copy.is_speculative())
+                history.record(execution_script.get_job_class(), duration)
+                metrics.increment(module_metrics.COUNTER_CONCLUDED, machine.get_hostname())
+                metrics.observe_duration(duration)
+                self.concluded_scripts[machine.get_hostname()].append(execution_script)
+                tqdm.write(f"✅ Script '{execution_id}' concluded on machine '{machine.get_hostname()}'!")
+                if tracker is not None: tracker.update(1)
+
+                # Scripts whose last dependency just concluded become ready
+                with slots.condition:
+                    for dependent_id in dependents.get(execution_id, []):
+                        dependencies[dependent_id].discard(execution_id)
+                        if len(dependencies[dependent_id]) == 0 and dependent_id in blocked: slots.enqueue(queue, blocked.pop(dependent_id))
+
+                # First copy to conclude wins, the remaining ones are killed
+                for other_copy in other_copies:
+                    if other_copy.get_handle() is not None: other_copy.get_handle().kill()
+                    tqdm.write(f"🔪 Copy of script '{execution_id}' on machine '{other_copy.get_machine().get_hostname()}' killed!")
+
+            elif len(other_copies) != 0:
+                journal.record(module_journal.EVENT_FAILED, execution_id, hostname=machine.get_hostname(), attempt=attempt, exit_code=exit_code,
+                    duration=duration, speculative=execution_copy.is_speculative())
+                metrics.increment(module_metrics.COUNTER_FAILED, machine.get_hostname())
+                tqdm.write(f"⚠️  Copy of script '{execution_id}' failed on machine '{machine.get_hostname()}' with exit code '{exit_code}', another copy is still running!")
+
+            else:
+                journal.record(module_journal.EVENT_FAILED, execution_id, hostname=machine.get_hostname(), attempt=attempt, exit_code=exit_code,
+                    duration=duration, speculative=execution_copy.is_speculative())
+                metrics.increment(module_metrics.COUNTER_FAILED, machine.get_hostname())
+                if attempt <= self.max_retries:
+                    metrics.increment(module_metrics.COUNTER_RETRIED, machine.get_hostname())
+                    delay = min(self.retry_backoff_seconds * pow(2, attempt - 1), RETRY_BACKOFF_MAX_SECONDS)
+                    tqdm.write(f"⚠️  Script '{execution_id}' failed on machine '{machine.get_hostname()}' with exit code '{exit_code}', retrying in {delay:.0f} seconds!")
+                    slots.defer(queue, execution_script, delay)
+                else:
+                    tqdm.write(f"🚨 Script '{execution_id}' failed on machine '{machine.get_hostname()}' with exit code '{exit_code}', giving up!")
+                    metrics.increment(module_metrics.COUNTER_GAVE_UP, machine.get_hostname())
+                    failed_scripts.append(execution_script)
+                    with slots.condition: abandon_dependents(self, execution_id)
+
+            slots.release(machine.get_hostname(), execution_script)
+
+        def start_copy(self : ParallelizationManager, execution_script : ExecutionScript, machine : Machine, speculative : bool) -> None:
+
+            execution_copy = ExecutionCopy(machine, speculative)
+            metrics.increment(module_metrics.COUNTER_STARTED, machine.get_hostname())
+            if speculative: metrics.increment(module_metrics.COUNTER_SPECULATIVE, machine.get_hostname())
+            with slots.condition: copies.setdefault(execution_script.get_execution_id(), []).append(execution_copy)
+            thread = threading.Thread(target=run_process_in_thread, args=(self, on_process_exit, execution_script, execution_copy, progress_tracker_completed))
+            thread.start()
 
-            current_scripts_machine = self.current_scripts[machine.get_hostname()]
-            filtered_current_scripts = list(filter(lambda script_iter: script_iter.get_execution_id() != execution_script.get_execution_id(), current_scripts_machine))
-            self.current_scripts[machine.get_hostname()] = filtered_current_scripts
-            tqdm.write(f"✅ Script '{execution_script.get_execution_id()}' concluded on machine '{machine.get_hostname()}'!")
-            if tracker is not None: tracker.update(1)
+        def select_machine(self : ParallelizationManager, machines : List[Machine], execution_script : ExecutionScript) -> Optional[Hostname]:
+
+            # Called by the slot tracker while holding its lock
+            selected_machine : Optional[Machine] = placement_policy.select(machines, self.current_scripts, execution_script)
+            if selected_machine is None: return None
+            return selected_machine.get_hostname()
+
+        def export_gauges(self : ParallelizationManager) -> Dict[str, Dict[str, float]]:
+
+            with slots.condition:
+                gauges : Dict[str, Dict[str, float]] = {
+                    'queue_depth':          { '': len(queue) },
+                    'scripts_deferred':     { '': slots.deferred },
+                    'scripts_running':      dict((hostname, len(scripts)) for hostname, scripts in self.current_scripts.items()),
+                    'machine_max_jobs':     dict((machine.get_hostname(), machine.get_max_jobs()) for machine in self.machines),
+                    'machine_memory_reserved_gb':   dict((machine.get_hostname(), module_placement.memory_reserved_gb(machine,
+                        self.current_scripts[machine.get_hostname()])) for machine in self.machines),
+                    'machine_threads_reserved':     dict((machine.get_hostname(), module_placement.threads_reserved(
+                        self.current_scripts[machine.get_hostname()])) for machine in self.machines),
+                }
+
+            samples = dict((machine.get_hostname(), host_sampler.get(machine.get_address())) for machine in self.machines)
+            gauges['machine_load_per_core'] = dict((hostname, sample.load_1m / sample.cores) for hostname, sample in samples.items() if sample is not None)
+            gauges['machine_memory_available_gb'] = dict((hostname, sample.memory_available_gb) for hostname, sample in samples.items() if sample is not None)
+            return gauges
+
+        def speculate(self : ParallelizationManager) -> None:
+
+            # Once nothing is left to dispatch, stragglers get a copy on an idle machine
+            while not speculation_stop.wait(self.wait_seconds):
+                with slots.condition:
+                    if len(queue) != 0: continue
+                    for execution_id, script_copies in list(copies.items()):
+                        execution_script = scripts_by_id[execution_id]
+                        if len(script_copies) != 1 or execution_id in concluded_ids: continue
+                        # Cost model estimates are too rough to call a script a straggler
+                        if not history.is_known(execution_script.get_job_class()): continue
+                        elapsed = time.time() - script_copies[0].get_start_time()
+                        if elapsed < max(SPECULATION_MIN_SECONDS, self.speculation_factor * expected_durations[execution_id]): continue
+
+                        idle_machines = [ machine for machine in self.machines_unoccupied() if machine is not script_copies[0].get_machine() ]
+                        selected_hostname = slots.try_acquire(execution_script, lambda: select_machine(self, idle_machines, execution_script))
+                        if selected_hostname is None: break
+
+                        journal.record(module_journal.EVENT_STARTED, execution_id, hostname=selected_hostname, attempt=attempts[execution_id], speculative=True)
+                        tqdm.write(f"🐢 Script '{execution_id}' running for {elapsed:.0f} seconds (expected {expected_durations[execution_id]:.0f}), copy started on machine '{selected_hostname}'!")
+                        start_copy(self, execution_script, machines_by_hostname[selected_hostname], True)
+
+        def abandon_dependents(self : ParallelizationManager, execution_id : str) -> None:
+
+            # Called while holding the slot tracker lock, scripts depending on a failed one can never start
+            for dependent_id in dependents.get(execution_id, []):
+                if dependent_id not in blocked: continue
+                # Unless they only wait for it to finish, which it just did
+                if execution_id in any_dependencies[dependent_id]:
+                    dependencies[dependent_id].discard(execution_id)
+                    if len(dependencies[dependent_id]) == 0: slots.enqueue(queue, blocked.pop(dependent_id))
+                    continue
+                abandoned_scripts.append(blocked.pop(dependent_id))
+                abandon_dependents(self, dependent_id)
+
+        # Skip scripts which already concluded in a previous execution, failed ones are retried
+        journal = self.get_journal()
+        journal_states = journal.replay()
+        pending : List[ExecutionScript] = list(filter(lambda script: script.get_execution_id() not in journal_states
+            or not journal_states[script.get_execution_id()].is_completed(), self.scripts_stack))
+        if len(pending) != len(self.scripts_stack):
+            print(f"✅ Skipping {len(self.scripts_stack) - len(pending)} scripts already concluded in a previous execution!")
+
+        # Scripts wait in 'blocked' until every script they depend on concluded
+        pending_ids : Set[str] = set(map(lambda script: script.get_execution_id(), pending))
+        resolved_dependencies, any_dependencies = self.resolve_dependencies()
+        dependencies : Dict[str, Set[str]] = dict((execution_id, script_dependencies.intersection(pending_ids))
+            for execution_id, script_dependencies in resolved_dependencies.items() if execution_id in pending_ids)
+        dependents : Dict[str, List[str]] = {}
+        for execution_id, script_dependencies in dependencies.items():
+            for dependency_id in script_dependencies: dependents.setdefault(dependency_id, []).append(execution_id)
+        queue : List[ExecutionScript] = [ script for script in pending if len(dependencies[script.get_execution_id()]) == 0 ]
+        blocked : Dict[str, ExecutionScript] = dict((script.get_execution_id(), script) for script in pending if len(dependencies[script.get_execution_id()]) != 0)
+        abandoned_scripts : List[ExecutionScript] = []
+
+        # Longest expected scripts first, so that the sweep does not end with a single straggler
+        history = self.get_history()
+        seconds_per_cost = history.seconds_per_cost()
+        expected_durations : Dict[str, float] = dict((script.get_execution_id(), history.estimate(script.get_job_class(), seconds_per_cost)) for script in pending)
+        queue.sort(key=lambda script: expected_durations[script.get_execution_id()], reverse=True)
+
+        attempts        : Dict[str, int]                    = {}
+        failed_scripts  : List[ExecutionScript]             = []
+        # Running copies of each script (more than one when speculating) and scripts concluded by any copy
+        copies          : Dict[str, List[ExecutionCopy]]    = {}
+        concluded_ids   : Set[str]                          = set()
+        scripts_by_id   : Dict[str, ExecutionScript]        = dict((script.get_execution_id(), script) for script in pending)
 
         print("🚀 Started execution of scripts...")
-        progress_tracker_submitted = tqdm(total=len(self.scripts_stack), desc="⚙️  Submiting execution scripts", leave=True, position=0)
-        progress_tracker_completed = tqdm(total=len(self.scripts_stack), desc="⚙️  Completed execution scripts", leave=True, position=1)
-
-        # Submit jobs
-        while len(self.scripts_stack) != 0:
-
-            # Check for and get available machines
-            available_machines = self.machines_unoccupied()
-            if len(available_machines) == 0:
-                available_machines = self.machines_available()
-            if len(available_machines) == 0:
-                time.sleep(self.wait_seconds)
-                continue
-            selected_machine : Machine = available_machines[0]
+        progress_tracker_submitted = tqdm(total=len(pending), desc="⚙️  Submiting execution scripts", leave=True, position=0)
+        progress_tracker_completed = tqdm(total=len(pending), desc="⚙️  Completed execution scripts", leave=True, position=1)
+
+        # 'current_scripts' and 'queue' are only touched through the slot tracker from here on
+        slots = module_slots.SlotTracker(self.current_scripts, lambda script: expected_durations[script.get_execution_id()])
+        machines_by_hostname : Dict[Hostname, Machine] = dict((machine.get_hostname(), machine) for machine in self.machines)
+        machines_by_address : Dict[str, Machine] = dict((machine.get_address(), machine) for machine in self.machines)
+
+        # Host load and memory are sampled in the background, fresh samples wake up the dispatcher
+        host_sampler = module_placement.HostSampler(self.get_backend().execute, list(machines_by_address.keys()), on_refresh=slots.notify)
+        host_sampler.start(lambda address: len(self.current_scripts[machines_by_address[address].get_hostname()]))
+        placement_policy = module_placement.PlacementPolicy(host_sampler)
+
+        # Scripts whose resources fit no host would wait forever
+        unplaceable_ids = [ script.get_execution_id() for script in pending if not any(placement_policy.can_fit(machine, script) for machine in self.machines) ]
+        if len(unplaceable_ids) != 0:
+            host_sampler.stop()
+            exit(f"🚨 {len(unplaceable_ids)} scripts require resources (memory, threads or tags) no machine provides: {unplaceable_ids}")
+
+        # Counters and gauges are periodically written next to the journal
+        metrics = module_metrics.SchedulerMetrics(os.path.join(self.TMP_DIRECTORY, self.timestamp_id),
+            list(machines_by_hostname.keys()), lambda: export_gauges(self), self.metrics_seconds)
+        metrics.start()
+
+        speculation_stop = threading.Event()
+        if self.speculation_factor is not None: threading.Thread(target=speculate, args=(self,), daemon=True).start()
+
+        # Submit jobs, blocking until a slot frees up (re-checked every 'wait_seconds' at most)
+        while True:
+
+            placement = slots.acquire_next(queue, lambda script: select_machine(self, self.machines, script), self.wait_seconds,
+                lambda script: script.get_resources())
+            if placement is None: break
+            execution_script, selected_hostname = placement
+            execution_id = execution_script.get_execution_id()
+            selected_machine : Machine = machines_by_hostname[selected_hostname]
 
             # Execute script
-            execution_script = self.scripts_stack.pop(0)
-            thread = threading.Thread(target=run_process_in_thread, args=(self, on_process_exit, execution_script, selected_machine, progress_tracker_completed))
-            progress_tracker_submitted.update(1)
-            tqdm.write(f"🚀 Script '{execution_script.get_execution_id()}' started on machine '{selected_machine.get_hostname()}'!")
-            thread.start()
+            attempts[execution_id] = attempts.get(execution_id, 0) + 1
+            journal.record(module_journal.EVENT_STARTED, execution_id, hostname=selected_hostname, attempt=attempts[execution_id])
+            if attempts[execution_id] == 1: progress_tracker_submitted.update(1)
+            tqdm.write(f"🚀 Script '{execution_id}' started on machine '{selected_hostname}' (attempt {attempts[execution_id]})!")
+            start_copy(self, execution_script, selected_machine, False)
 
         # Wait for remaining jobs to finish
-        while len(self.machines_unoccupied()) != len(self.machines): time.sleep(self.wait_seconds)
+        slots.wait_until_idle()
+        speculation_stop.set()
+        host_sampler.stop()
+        metrics.stop()
         progress_tracker_submitted.close()
         progress_tracker_completed.close()
+        self.get_backend().close()
         print("🚀 Finished execution of scripts...")
 
+        if len(abandoned_scripts) != 0:
+            abandoned_ids = list(map(lambda script: script.get_execution_id(), abandoned_scripts))
+            print(f"🚨 {len(abandoned_scripts)} scripts were not executed since scripts they depend on failed: {abandoned_ids}")
+        if len(failed_scripts) != 0:
+            failed_ids = list(map(lambda script: script.get_execution_id(), failed_scripts))
+            exit(f"🚨 {len(failed_scripts)} scripts failed after {self.max_retries} retries: {failed_ids}")
+
     def save_model(self) -> None:
 
         path = os.path.join(self.TMP_DIRECTORY, self.timestamp_id)
@@ -204,6 +603,63 @@ class ParallelizationManager():
 
 # =================================================== AUXILIARY FUNCTIONS ===================================================
 
+def create_backend(backend_name : str) -> module_backends.ExecutionBackend:
+    if backend_name == module_backends.BACKEND_SSH:
+        if SSH_USER is None or SSH_KEY is None:
+            exit("🚨 Please create a '.env' file with 'SSH_USER' and 'SSH_KEY' defined")
+        return module_backends.SSHExecutionBackend(SSH_USER, SSH_KEY)
+    elif backend_name == module_backends.BACKEND_LOCAL:
+        return module_backends.LocalExecutionBackend()
+    else: exit(f"🚨 Backend '{backend_name}' not recognized")
+
+def split_list(value : str) -> List[str]:
+    return [ element.strip() for element in value.split(',') if element.strip() != '' ]
+
+def parse_tag_limits(value : str) -> Dict[str, int]:
+    # Given as '<tag>:<limit>[,<tag>:<limit>...]'
+    tag_limits : Dict[str, int] = {}
+    for element in split_list(value):
+        tag, _, limit = element.partition(':')
+        if not limit.strip().isdigit(): exit(f"🚨 Tag limit '{element}' is not in the format '<tag>:<limit>'")
+        tag_limits[tag.strip()] = int(limit)
+    return tag_limits
+
+def load_machine(hostname : Hostname, section : configparser.SectionProxy, max_jobs_per_machine : int) -> Machine:
+    return Machine(hostname, section.get('address', hostname),
+        section.getint('max_jobs', max_jobs_per_machine),
+        section.getfloat('min_free_memory_gb', 0.0),
+        section.getfloat('max_load_per_core', float('inf')),
+        section.getfloat('job_memory_gb', 0.0),
+        section.getfloat('memory_gb', None),
+        section.getint('threads', None),
+        split_list(section['tags']) if 'tags' in section else None,
+        parse_tag_limits(section.get('tag_limits', '')))
+
+def load_local_machines(local_jobs : int, config_path : FilePath) -> List[Machine]:
+    # Capacities of a '[localhost]' section are used when declared, e.g. to try out placement with synthetic hosts
+    if os.path.exists(config_path) and os.path.isfile(config_path):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        if config.has_section(module_backends.LOCAL_HOSTNAME):
+            return [ load_machine(module_backends.LOCAL_HOSTNAME, config[module_backends.LOCAL_HOSTNAME], local_jobs) ]
+    return [ Machine(module_backends.LOCAL_HOSTNAME, module_backends.LOCAL_HOSTNAME, local_jobs) ]
+
+def load_machines(config_path : FilePath, max_jobs_per_machine : int) -> List[Machine]:
+    if not os.path.exists(config_path) or not os.path.isfile(config_path):
+        exit(f"🚨 Machines configuration '{config_path}' does not exist")
+
+    config = configparser.ConfigParser()
+    config.read(config_path)
+
+    machines : List[Machine] = []
+    for hostname in config.sections():
+        # The local host is only used by the local backend
+        if hostname == module_backends.LOCAL_HOSTNAME: continue
+        machines.append(load_machine(hostname, config[hostname], max_jobs_per_machine))
+
+    if len(machines) == 0: exit(f"🚨 No machines declared in '{config_path}'")
+    return machines
+
 def load_manager(timestamp_id : str) -> ParallelizationManager:
     file_path = os.path.join(TMP_DIRECTORY, timestamp_id, FILE_SAVE_NAME)
     if not os.path.exists(file_path) or not os.path.isfile(file_path):
@@ -219,8 +675,9 @@ def load_manager(timestamp_id : str) -> ParallelizationManager:
 
 INITIALIZE_OPTION = 'init'
 ADD_EXECUTION_OPTION = 'add'
+ADD_BULK_EXECUTION_OPTION = 'add-bulk'
 RUN_OPTION = 'run'
-EXECUTION_OPTIONS = [INITIALIZE_OPTION, ADD_EXECUTION_OPTION, RUN_OPTION]
+EXECUTION_OPTIONS = [INITIALIZE_OPTION, ADD_EXECUTION_OPTION, ADD_BULK_EXECUTION_OPTION, RUN_OPTION]
 
 parser = argparse.ArgumentParser()
 parser.add_argument("-timestamp", required=True,    type=str,   help="key (timestamp) to uniquely identify execution")
@@ -228,9 +685,21 @@ parser.add_argument("-execution", required=True,    type=str,   help="execution
 # In case 'INITIALIZE_OPTION'
 parser.add_argument("-wait_seconds",                type=int,   help="number of seconds to wait until its check again for queue availability")
 parser.add_argument("-max_jobs_per_machine",        type=int,   help="maximum number of jobs to submit to each machine")
+parser.add_argument("-backend",                     type=str,   help="backend used to execute the scripts", choices=module_backends.BACKENDS, default=module_backends.BACKEND_SSH)
+parser.add_argument("-local_jobs",                  type=int,   help="number of concurrent scripts when using the local backend", default=os.cpu_count())
+parser.add_argument("-machines_config",             type=str,   help="path for the machines configuration file", default=MACHINES_CONFIG)
+parser.add_argument("-max_retries",                 type=int,   help="number of times a failed script is retried", default=MAX_RETRIES)
+parser.add_argument("-retry_backoff_seconds",       type=int,   help="number of seconds to wait before the first retry, doubled on each retry", default=RETRY_BACKOFF_SECONDS)
+parser.add_argument("-log_flush_seconds",           type=float, help="maximum number of seconds the output of a script is buffered before written to its log", default=module_logs.LOG_FLUSH_SECONDS)
+parser.add_argument("-keep_progress",               action='store_true', help="keep carriage return redraws (e.g. progress bars) in the logs")
+parser.add_argument("-compress_logs",               action='store_true', help="compress the logs of each script once it finishes")
+parser.add_argument("-metrics_seconds",             type=float, help="number of seconds between writes of the scheduler metrics", default=module_metrics.METRICS_WRITE_SECONDS)
+parser.add_argument("-speculation_factor",          type=float, help="once the queue is empty, start a copy of scripts running longer than this multiple of their expected duration")
 # In case 'ADD_EXECUTION_SCRIPT_OPTION'
 parser.add_argument("-execution_id",                type=str,   help="id for the execution")
 parser.add_argument("-execution_file",              type=str,   help="path for the execution script")
+# In case 'ADD_BULK_EXECUTION_OPTION'
+parser.add_argument("-manifest",                    type=str,   help="path for the manifest with one '<execution_id>\\t<command>[\\t<key>=<value>...]' per line")
 
 arguments = parser.parse_args()
 arguments_dict = vars(arguments)
@@ -242,22 +711,30 @@ if arguments_dict['execution'] == INITIALIZE_OPTION and any(map(lambda argument:
 requirements : List[str] = ['execution_id', 'execution_file']
 if arguments_dict['execution'] == ADD_EXECUTION_OPTION and any(map(lambda argument: arguments_dict[argument] is None, requirements)):
     exit(f"🚨 For execution mode '{arguments_dict['execution']}' the following is required: '{requirements}'")
-
-# Declare machines to use
-machines_cpu = [ Machine('x01', 'x01'), Machine('x02', 'x02'), Machine('x03', 'x03'), Machine('x04', 'x04'),
-    Machine('x05', 'x05'), Machine('x06', 'x06'), Machine('x07', 'x07'), Machine('x08', 'x08'),
-    Machine('x09', 'x09'), Machine('x10', 'x10'), Machine('x11', 'x11'), Machine('x12', 'x12') ]
+requirements : List[str] = ['manifest']
+if arguments_dict['execution'] == ADD_BULK_EXECUTION_OPTION and any(map(lambda argument: arguments_dict[argument] is None, requirements)):
+    exit(f"🚨 For execution mode '{arguments_dict['execution']}' the following is required: '{requirements}'")
 
 # Run main code - Init
 if arguments_dict['execution'] == INITIALIZE_OPTION:
-    parallelization_manager = ParallelizationManager(machines_cpu, arguments_dict['timestamp'],
-        arguments_dict['wait_seconds'], arguments_dict['max_jobs_per_machine'])
+    if arguments_dict['backend'] == module_backends.BACKEND_LOCAL: machines = load_local_machines(arguments_dict['local_jobs'], arguments_dict['machines_config'])
+    else: machines = load_machines(arguments_dict['machines_config'], arguments_dict['max_jobs_per_machine'])
+    parallelization_manager = ParallelizationManager(machines, arguments_dict['timestamp'],
+        arguments_dict['wait_seconds'], arguments_dict['max_jobs_per_machine'],
+        arguments_dict['max_retries'], arguments_dict['retry_backoff_seconds'], arguments_dict['backend'],
+        arguments_dict['log_flush_seconds'], not arguments_dict['keep_progress'], arguments_dict['compress_logs'],
+        arguments_dict['speculation_factor'], arguments_dict['metrics_seconds'])
     parallelization_manager.save_model()
 # Run main code - Add
 elif arguments_dict['execution'] == ADD_EXECUTION_OPTION:
     parallelization_manager = load_manager(arguments_dict['timestamp'])
     parallelization_manager.add_script_to_queue(arguments_dict['execution_id'], arguments_dict['execution_file'])
     parallelization_manager.save_model()
+# Run main code - Add Bulk
+elif arguments_dict['execution'] == ADD_BULK_EXECUTION_OPTION:
+    parallelization_manager = load_manager(arguments_dict['timestamp'])
+    parallelization_manager.add_scripts_from_manifest(arguments_dict['manifest'])
+    parallelization_manager.save_model()
 # Run main code - Run
 elif arguments_dict['execution'] == RUN_OPTION:
     parallelization_manager = load_manager(arguments_dict['timestamp'])
@@ -36,34 +36,29 @@ if [ ! -d "${TEMP_CONDOR_SCRIPTS_DIRECTORY}" ]; then mkdir -p "${TEMP_CONDOR_SCR
 echo
 echo "🚀 Running solution variations ..."
 typeset -i number_of_variations=$(cat "./tmp/${NOW}/tmp_number_variations.txt")
-for parallel_index in $(seq 0 $(expr $number_of_variations - 1)); do
-    process_id=$(printf "first_variation_%05d" $parallel_index)
-    script_file="${TEMP_CONDOR_SCRIPTS_DIRECTORY}${process_id}.sh"
+script_file="${TEMP_CONDOR_SCRIPTS_DIRECTORY}first_variation.sh"
+submit_file="${TEMP_CONDOR_DIRECTORY}/first_variations.submit"
 
-    echo "#!/bin/bash" > "${script_file}"
-    echo "source ./venv/bin/activate"                                                                                                                       >> "${script_file}"
-    echo "python3 model_first.py		                                                                                                                \\" >> "${script_file}"
-    echo "      -info_controls=${CONTROL_INFO}              -info_psychosis=${PSYCHOSIS_INFO}               -info_bipolars=${BIPOLAR_INFO}              \\" >> "${script_file}"
-    echo "      -audio_controls=${CONTROL_AUDIOS}           -audio_psychosis=${PSYCHOSIS_AUDIOS}            -audio_bipolars=${BIPOLAR_AUDIOS}           \\" >> "${script_file}"
-    echo "      -trans_controls=${CONTROL_TRANSCRIPTIONS}   -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS}    -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS}   \\" >> "${script_file}"
-    echo "      -parallelization_key=\"RUN_MODELS\"         -parallelization_index=${parallel_index}                                                    \\" >> "${script_file}"
-    echo "      -timestamp=\"${NOW}\"                                                                                                                   \\" >> "${script_file}"
-    echo "      -variations_key=\"${VARIATION_KEY}\""                                                                                                       >> "${script_file}"
+# Single script for every variation, receiving the variation index as its first argument
+echo "#!/bin/bash" > "${script_file}"
+echo "source ./venv/bin/activate"                                                                                                                       >> "${script_file}"
+echo "python3 model_first.py		                                                                                                                \\" >> "${script_file}"
+echo "      -info_controls=${CONTROL_INFO}              -info_psychosis=${PSYCHOSIS_INFO}               -info_bipolars=${BIPOLAR_INFO}              \\" >> "${script_file}"
+echo "      -audio_controls=${CONTROL_AUDIOS}           -audio_psychosis=${PSYCHOSIS_AUDIOS}            -audio_bipolars=${BIPOLAR_AUDIOS}           \\" >> "${script_file}"
+echo "      -trans_controls=${CONTROL_TRANSCRIPTIONS}   -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS}    -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS}   \\" >> "${script_file}"
+echo "      -parallelization_key=\"RUN_MODELS\"         -parallelization_index=\$1                                                                  \\" >> "${script_file}"
+echo "      -timestamp=\"${NOW}\"                                                                                                                   \\" >> "${script_file}"
+echo "      -variations_key=\"${VARIATION_KEY}\""                                                                                                       >> "${script_file}"
 
-    chmod a+x "${script_file}"
+chmod a+x "${script_file}"
 
-    # Fix Files for Condor Old Syntax
-    output="${TEMP_CONDOR_LOGS_DIRECTORY}condor.out.${process_id}.log"
-    error="${TEMP_CONDOR_LOGS_DIRECTORY}condor.err.${process_id}.log"
-    log="${TEMP_CONDOR_DIRECTORY}/first_variations_condor.log"
-
-    condor_submit \
-            -a "Executable = ${script_file}"    \
-            -a "Output = ${output}"             \
-            -a "Error = ${error}"               \
-            -a "Log = ${log}"                   \
-            `pwd`/condor_cpu.config;
-done
+# Single submission queueing every variation, indexed by '$(Process)'
+python3 ./submission.py -job_script="${script_file}" -number_jobs=${number_of_variations} -prefix="first_variation"  \
+    -condor_config="`pwd`/condor_cpu.config" -condor_submit="${submit_file}"                                          \
+    -condor_logs="${TEMP_CONDOR_LOGS_DIRECTORY}" -condor_log="${TEMP_CONDOR_DIRECTORY}/first_variations_condor.log"
+ret=$?
+if [ $ret -ne 0 ]; then exit; fi
+condor_submit "${submit_file}"
 
 echo "🚀 Waiting for models to finish ..."
 condor_wait "${TEMP_CONDOR_DIRECTORY}/first_variations_condor.log"
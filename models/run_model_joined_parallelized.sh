@@ -21,12 +21,22 @@ PARALLELIZATION_DIRECTORY="${CURRENT_DIR}/tmp_parallelization/${NOW}/scripts/"
 mkdir -p "${PARALLELIZATION_DIRECTORY}"
 
 VARIATION_KEY="joined-super-simple"
+# Set to true to fork jobs from a daemon kept warm on each host (imports and feature sets) instead of starting each from scratch
+USE_WORKER_DAEMON=false
+# Node-local directory (e.g. "/scratch/${USER}") where variations stage their inputs and write their outputs, empty to use the shared ones
+SCRATCH_DIRECTORY=""
+# Number of variations run by each job, one after the other in the same process (feature sets and datasets loaded once)
+VARIATIONS_PER_JOB=1
+# Search of each classifier's parameters: 'exhaustive' evaluates them all on every split, 'halving' drops the worst as splits are added
+SEARCH_STRATEGY="exhaustive"
+# Train set scored by every variation ('full'), by none, by the best one ('best') or on a sample of subjects ('sample')
+TRAIN_SCORING="full"
 
 python3 model_joined.py                                                                                                                     \
     -info_controls=${CONTROL_INFO}              -info_psychosis=${PSYCHOSIS_INFO}               -info_bipolars=${BIPOLAR_INFO}              \
     -audio_controls=${CONTROL_AUDIOS}           -audio_psychosis=${PSYCHOSIS_AUDIOS}            -audio_bipolars=${BIPOLAR_AUDIOS}           \
     -trans_controls=${CONTROL_TRANSCRIPTIONS}   -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS}    -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS}   \
-    -parallelization_key="FEATURE_EXTRACTION"                                                                                               \
+    -parallelization_key="PLAN"                                                                                                             \
     -timestamp="${NOW}"                                                                                                                     \
     -variations_key=${VARIATION_KEY}
 
@@ -36,36 +46,36 @@ if [ $ret -ne 0 ]; then exit; fi
 
 echo
 echo "🚀 Developing solution variations ..."
-typeset -i number_of_variations=$(cat "./tmp/${NOW}/tmp_number_variations.txt")
-for parallel_index in $(seq 0 $(expr $number_of_variations - 1)); do
-    process_id=$(printf "joined_variation_%05d" $parallel_index)
-    script_file="${PARALLELIZATION_DIRECTORY}${process_id}.sh"
+script_file="${PARALLELIZATION_DIRECTORY}joined_job.sh"
+manifest_file="${PARALLELIZATION_DIRECTORY}joined_pipeline.manifest"
 
-    echo "#!/bin/bash" > "${script_file}"
-    echo "cd ${CURRENT_DIR}"                                                                                                                                >> "${script_file}"
-    echo "source ./venv/bin/activate"                                                                                                                       >> "${script_file}"
-    echo "python3 model_joined.py		                                                                                                                \\" >> "${script_file}"
-    echo "      -info_controls=${CONTROL_INFO}              -info_psychosis=${PSYCHOSIS_INFO}               -info_bipolars=${BIPOLAR_INFO}              \\" >> "${script_file}"
-    echo "      -audio_controls=${CONTROL_AUDIOS}           -audio_psychosis=${PSYCHOSIS_AUDIOS}            -audio_bipolars=${BIPOLAR_AUDIOS}           \\" >> "${script_file}"
-    echo "      -trans_controls=${CONTROL_TRANSCRIPTIONS}   -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS}    -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS}   \\" >> "${script_file}"
-    echo "      -parallelization_key=\"RUN_MODELS\"         -parallelization_index=${parallel_index}                                                    \\" >> "${script_file}"
-    echo "      -timestamp=\"${NOW}\"                                                                                                                   \\" >> "${script_file}"
-    echo "      -variations_key=\"${VARIATION_KEY}\""                                                                                                       >> "${script_file}"                                                                                                                      >> "${script_file}"
+# Single script for every job of the pipeline (feature extraction, variations and final results),
+# receiving the parallelization key and index as its arguments
+if [ "${USE_WORKER_DAEMON}" = true ]; then JOB_ENTRY="python3 worker_daemon.py -script=model_joined.py -timestamp=\"${NOW}\" --"
+else JOB_ENTRY="python3 model_joined.py"; fi
 
-    chmod a+x "${script_file}"
-    python3 ./parallelization.py -timestamp="${NOW}" -execution="add" -execution_id="${process_id}" -execution_file="${script_file}"
-	ret=$?
-	if [ $ret -ne 0 ]; then exit; fi
-done
+echo "#!/bin/bash" > "${script_file}"
+echo "cd ${CURRENT_DIR}"                                                                                                                                >> "${script_file}"
+echo "source ./venv/bin/activate"                                                                                                                       >> "${script_file}"
+echo "${JOB_ENTRY}		                                                                                                                \\" >> "${script_file}"
+echo "      -info_controls=${CONTROL_INFO}              -info_psychosis=${PSYCHOSIS_INFO}               -info_bipolars=${BIPOLAR_INFO}              \\" >> "${script_file}"
+echo "      -audio_controls=${CONTROL_AUDIOS}           -audio_psychosis=${PSYCHOSIS_AUDIOS}            -audio_bipolars=${BIPOLAR_AUDIOS}           \\" >> "${script_file}"
+echo "      -trans_controls=${CONTROL_TRANSCRIPTIONS}   -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS}    -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS}   \\" >> "${script_file}"
+echo "      -parallelization_key=\"\$1\"                -parallelization_index=\$2                                                                  \\" >> "${script_file}"
+echo "      -timestamp=\"${NOW}\"                                                                                                                   \\" >> "${script_file}"
+echo "      -scratch_directory=\"${SCRATCH_DIRECTORY}\"                                                                                           \\" >> "${script_file}"
+echo "      -search=\"${SEARCH_STRATEGY}\"                                                                                                        \\" >> "${script_file}"
+echo "      -train_scoring=\"${TRAIN_SCORING}\"                                                                                                   \\" >> "${script_file}"
+echo "      -variations_key=\"${VARIATION_KEY}\""                                                                                                       >> "${script_file}"
 
-python3 ./parallelization.py -timestamp="${NOW}" -execution="run"
+chmod a+x "${script_file}"
+python3 ./submission.py -job_script="${script_file}" -prefix="joined" -plan="./tmp/${NOW}/tmp_plan.json" -variations_per_job=${VARIATIONS_PER_JOB} -manifest="${manifest_file}"
+ret=$?
+if [ $ret -ne 0 ]; then exit; fi
+python3 ./parallelization.py -timestamp="${NOW}" -execution="add-bulk" -manifest="${manifest_file}"
 ret=$?
 if [ $ret -ne 0 ]; then exit; fi
 
-python3 model_joined.py                                                                                                                      \
-    -info_controls=${CONTROL_INFO}              -info_psychosis=${PSYCHOSIS_INFO}               -info_bipolars=${BIPOLAR_INFO}              \
-    -audio_controls=${CONTROL_AUDIOS}           -audio_psychosis=${PSYCHOSIS_AUDIOS}            -audio_bipolars=${BIPOLAR_AUDIOS}           \
-    -trans_controls=${CONTROL_TRANSCRIPTIONS}   -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS}    -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS}   \
-    -parallelization_key="RUN_FINAL"                                                                                                        \
-    -timestamp="${NOW}"                                                                                                                     \
-    -variations_key=${VARIATION_KEY}
+python3 ./parallelization.py -timestamp="${NOW}" -execution="run"
+ret=$?
+if [ $ret -ne 0 ]; then exit; fi
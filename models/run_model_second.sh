@@ -13,8 +13,14 @@ PSYCHOSIS_TRANSCRIPTIONS="../data/fixed_transcriptions/psychosis/"
 BIPOLAR_TRANSCRIPTIONS="../data/fixed_transcriptions/bipolars/"
 
 VARIATION_KEY="simple"
+# Number of processes running variations at once on this machine
+PARALLEL_JOBS=1
+# Search of each classifier's parameters: 'exhaustive' evaluates them all on every split, 'halving' drops the worst as splits are added
+SEARCH_STRATEGY="exhaustive"
+# Train set scored by every variation ('full'), by none, by the best one ('best') or on a sample of subjects ('sample')
+TRAIN_SCORING="full"
 
 python3 model_second.py -info_controls=${CONTROL_INFO} -info_psychosis=${PSYCHOSIS_INFO} -info_bipolars=${BIPOLAR_INFO} \
     -audio_controls=${CONTROL_AUDIOS} -audio_psychosis=${PSYCHOSIS_AUDIOS} -audio_bipolars=${BIPOLAR_AUDIOS} \
     -trans_controls=${CONTROL_TRANSCRIPTIONS} -trans_psychosis=${PSYCHOSIS_TRANSCRIPTIONS} -trans_bipolars=${BIPOLAR_TRANSCRIPTIONS} \
-    -variations_key=${VARIATION_KEY}
\ No newline at end of file
+    -variations_key=${VARIATION_KEY} -parallel_jobs=${PARALLEL_JOBS} -search=${SEARCH_STRATEGY} -train_scoring=${TRAIN_SCORING}
\ No newline at end of file
@@ -0,0 +1,147 @@
+import os
+import json
+import argparse
+
+from typing import Any, Dict, List, Optional
+
+# =================================================== CONSTANTS DEFINITION ===================================================
+
+MANIFEST_FORMAT = "{prefix}_{index:05d}\t\"{job_script}\" {index}"
+
+# Pipeline executed as a dependency graph, the job script receives the parallelization key and index
+PLAN_EXTRACTION_FORMAT  = "{prefix}_extraction_{index:02d}\t\"{job_script}\" EXTRACT_FEATURE_SET {index}\tclass=Extraction - {feature_set}"
+PLAN_VARIATION_FORMAT   = "{prefix}_variation_{index:05d}\t\"{job_script}\" RUN_MODELS {indexes}\tclass={job_class}"
+# Final results are exported once every variation finished, even when some of them failed
+PLAN_FINAL_FORMAT       = "{prefix}_final\t\"{job_script}\" RUN_FINAL 0\tafter_any={prefix}_variation_*"
+
+# =================================================== AUXILIARY FUNCTIONS ===================================================
+
+def check_file(file_path : str) -> None:
+    if not os.path.exists(file_path) or not os.path.isfile(file_path):
+        exit(f"🚨 File at '{file_path}' does not exist")
+
+def load_job_classes(job_classes_path : str, number_jobs : int) -> List[str]:
+    check_file(job_classes_path)
+    file = open(job_classes_path, 'r')
+    job_classes = file.read().splitlines()
+    file.close()
+
+    if len(job_classes) != number_jobs: exit(f"🚨 File '{job_classes_path}' has {len(job_classes)} job classes instead of {number_jobs}")
+    return job_classes
+
+def write_manifest(manifest_path : str, job_script : str, prefix : str, number_jobs : int, job_classes : Optional[List[str]] = None) -> None:
+    # One line per job, every job runs the same script with its index as the first argument
+    lines = [ MANIFEST_FORMAT.format(prefix=prefix, index=index, job_script=job_script) for index in range(number_jobs) ]
+    if job_classes is not None: lines = [ line + '\tclass=' + job_class for line, job_class in zip(lines, job_classes) ]
+    lines = [ line + '\n' for line in lines ]
+
+    file = open(manifest_path, 'w')
+    file.write(''.join(lines))
+    file.close()
+
+def format_resources(resources : Dict[str, Any]) -> str:
+    # Resources declared by the plan, given to the manager as '<key>=<value>' columns
+    columns : List[str] = []
+    for key, value in sorted(resources.items()):
+        if isinstance(value, list): value = ','.join(value)
+        columns.append(f"\t{key}={value}")
+    return ''.join(columns)
+
+def group_plan_variations(variations : List[Dict[str, Any]], variations_per_job : int) -> List[List[int]]:
+    # Variations of a job share their feature set, which is then loaded only once by the job
+    indexes_by_extraction : Dict[int, List[int]] = {}
+    for index, variation in enumerate(variations): indexes_by_extraction.setdefault(variation['after'], []).append(index)
+
+    groups : List[List[int]] = []
+    for indexes in indexes_by_extraction.values():
+        groups.extend(indexes[start:start + variations_per_job] for start in range(0, len(indexes), variations_per_job))
+    return sorted(groups)
+
+def get_group_job_class(variations : List[Dict[str, Any]], group : List[int]) -> str:
+    job_classes = sorted(set(variations[index]['job_class'] for index in group))
+    if len(group) == 1: return job_classes[0]
+    if len(job_classes) == 1: return f"{job_classes[0]} x{len(group)}"
+    return f"Variations - {variations[group[0]]['feature_set']} x{len(group)}"
+
+def write_plan_manifest(manifest_path : str, job_script : str, prefix : str, plan_path : str, variations_per_job : int = 1) -> None:
+    check_file(plan_path)
+    file = open(plan_path, 'r')
+    plan = json.load(file)
+    file.close()
+
+    # Each feature set is extracted on its own, models only wait for the feature set they use
+    lines : List[str] = []
+    for index, extraction in enumerate(plan['extractions']):
+        line = PLAN_EXTRACTION_FORMAT.format(prefix=prefix, index=index, job_script=job_script, feature_set=extraction['feature_set'])
+        if len(extraction['after']) != 0: line = line + '\tafter=' + ','.join(f'{prefix}_extraction_{after:02d}' for after in extraction['after'])
+        lines.append(line + format_resources(extraction.get('resources', {})))
+    for index, group in enumerate(group_plan_variations(plan['variations'], variations_per_job)):
+        variation = plan['variations'][group[0]]
+        indexes = ','.join(map(str, group))
+        line = PLAN_VARIATION_FORMAT.format(prefix=prefix, index=index, job_script=job_script, indexes=indexes, job_class=get_group_job_class(plan['variations'], group))
+        lines.append(line + f"\tafter={prefix}_extraction_{variation['after']:02d}" + format_resources(variation.get('resources', {})))
+    lines.append(PLAN_FINAL_FORMAT.format(prefix=prefix, job_script=job_script))
+    lines = [ line + '\n' for line in lines ]
+
+    file = open(manifest_path, 'w')
+    file.write(''.join(lines))
+    file.close()
+
+def write_condor_submit(submit_path : str, base_config : str, job_script : str, prefix : str, number_jobs : int, logs_directory : str, log_file : str) -> None:
+    # The base configuration is reused without its 'QUEUE' statement, which is replaced by a single array statement
+    file = open(base_config, 'r')
+    lines : List[str] = [ line for line in file.read().splitlines() if line.strip().upper() != 'QUEUE' ]
+    file.close()
+
+    lines.append(f"Executable                  = {job_script}")
+    lines.append(f"Arguments                   = $(Process)")
+    lines.append(f"Output                      = {os.path.join(logs_directory, f'condor.out.{prefix}_$(Process).log')}")
+    lines.append(f"Error                       = {os.path.join(logs_directory, f'condor.err.{prefix}_$(Process).log')}")
+    lines.append(f"Log                         = {log_file}")
+    lines.append(f"QUEUE {number_jobs}")
+
+    file = open(submit_path, 'w')
+    file.write('\n'.join(lines) + '\n')
+    file.close()
+
+# ===================================================== MAIN EXECUTION =====================================================
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-job_script",      required=True,  type=str,   help="path for the script executed by every job, receiving the job index as its first argument")
+parser.add_argument("-number_jobs",                     type=int,   help="number of jobs to generate")
+parser.add_argument("-prefix",          required=True,  type=str,   help="prefix of the execution id of each job")
+# Parallelization manager submission
+parser.add_argument("-manifest",                        type=str,   help="path for the manifest used by 'parallelization.py -execution=add-bulk'")
+parser.add_argument("-job_classes",                     type=str,   help="path for the job class of each job, one per line, used to estimate execution times")
+parser.add_argument("-plan",                            type=str,   help="path for the plan of the pipeline, generating a manifest for the whole dependency graph instead")
+parser.add_argument("-variations_per_job",              type=int,   help="number of variations run by each job of the plan, in the same process", default=1)
+# Condor submission
+parser.add_argument("-condor_config",                   type=str,   help="path for the base condor configuration")
+parser.add_argument("-condor_submit",                   type=str,   help="path for the generated condor submit description")
+parser.add_argument("-condor_logs",                     type=str,   help="directory for the condor output and error logs")
+parser.add_argument("-condor_log",                      type=str,   help="path for the condor user log")
+
+arguments = parser.parse_args()
+arguments_dict = vars(arguments)
+
+check_file(arguments_dict['job_script'])
+if arguments_dict['manifest'] is None and arguments_dict['condor_submit'] is None:
+    exit("🚨 At least one of '-manifest' or '-condor_submit' is required")
+if arguments_dict['number_jobs'] is None and (arguments_dict['plan'] is None or arguments_dict['condor_submit'] is not None):
+    exit("🚨 Argument '-number_jobs' is required unless a '-plan' manifest is generated")
+
+requirements : List[str] = ['condor_config', 'condor_logs', 'condor_log']
+if arguments_dict['condor_submit'] is not None and any(map(lambda argument: arguments_dict[argument] is None, requirements)):
+    exit(f"🚨 For condor submissions the following is required: '{requirements}'")
+
+if arguments_dict['manifest'] is not None and arguments_dict['plan'] is not None:
+    if arguments_dict['variations_per_job'] < 1: exit("🚨 Argument '-variations_per_job' must be at least 1")
+    write_plan_manifest(arguments_dict['manifest'], arguments_dict['job_script'], arguments_dict['prefix'], arguments_dict['plan'], arguments_dict['variations_per_job'])
+elif arguments_dict['manifest'] is not None:
+    job_classes : Optional[List[str]] = None
+    if arguments_dict['job_classes'] is not None: job_classes = load_job_classes(arguments_dict['job_classes'], arguments_dict['number_jobs'])
+    write_manifest(arguments_dict['manifest'], arguments_dict['job_script'], arguments_dict['prefix'], arguments_dict['number_jobs'], job_classes)
+if arguments_dict['condor_submit'] is not None:
+    check_file(arguments_dict['condor_config'])
+    write_condor_submit(arguments_dict['condor_submit'], arguments_dict['condor_config'], arguments_dict['job_script'],
+        arguments_dict['prefix'], arguments_dict['number_jobs'], arguments_dict['condor_logs'], arguments_dict['condor_log'])
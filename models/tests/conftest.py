@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Modules are imported as the scripts import them, from the 'models' directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,28 @@
+import pytest
+
+import modules_abstraction.module_models as module_models
+
+# =================================== TESTS ===================================
+
+def test_single_indexes_and_ranges():
+    assert module_models.parse_indexes('3', 10) == [3]
+    assert module_models.parse_indexes('0-2,7', 10) == [0, 1, 2, 7]
+    assert module_models.parse_indexes(' 5 , 8-9 ', 10) == [5, 8, 9]
+
+def test_shards():
+    assert module_models.parse_indexes('1%3', 10) == [1, 4, 7]
+    # Every index belongs to exactly one shard
+    shards = [ module_models.parse_indexes(f'{shard}%4', 10) for shard in range(4) ]
+    assert sorted(index for shard in shards for index in shard) == list(range(10))
+
+def test_repeated_indexes_are_run_once():
+    assert module_models.parse_indexes('4,2-5,0%2', 8) == [4, 2, 3, 5, 0, 6]
+
+def test_indexes_from_file(tmp_path):
+    path = tmp_path / 'indexes.txt'
+    path.write_text('1 2\n5-6,\n0%5\n')
+    assert module_models.parse_indexes(f'@{path},9', 10) == [1, 2, 5, 6, 0, 9]
+
+@pytest.mark.parametrize('specification', ['10', '8-10', 'a', '1-b', '3%3', '0%0', '@missing-indexes.txt'])
+def test_invalid_indexes_exit(specification):
+    with pytest.raises(SystemExit): module_models.parse_indexes(specification, 10)
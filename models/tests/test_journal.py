@@ -0,0 +1,54 @@
+import modules_parallelization.module_journal as module_journal
+
+# =================================== TESTS ===================================
+
+def test_replay_without_journal_is_empty(tmp_path):
+    assert module_journal.JobJournal(str(tmp_path)).replay() == {}
+
+def test_replay_counts_attempts_and_keeps_outcome(tmp_path):
+    journal = module_journal.JobJournal(str(tmp_path))
+    journal.record_many(module_journal.EVENT_QUEUED, [('job-1', {}), ('job-2', {})])
+    journal.record(module_journal.EVENT_STARTED, 'job-1', hostname='host-a')
+    journal.record(module_journal.EVENT_FAILED, 'job-1', exit_code=1, duration=2.0)
+    journal.record(module_journal.EVENT_STARTED, 'job-1', hostname='host-a')
+    journal.record(module_journal.EVENT_FINISHED, 'job-1', exit_code=0, duration=3.0)
+    journal.record(module_journal.EVENT_STARTED, 'job-2', hostname='host-b')
+    journal.record(module_journal.EVENT_FAILED, 'job-2', exit_code=2, duration=1.0)
+
+    states = journal.replay()
+    assert states['job-1'].is_completed()
+    assert states['job-1'].attempts == 2
+    assert (states['job-1'].exit_code, states['job-1'].duration) == (0, 3.0)
+    assert states['job-2'].is_failed()
+    assert states['job-2'].attempts == 1
+    assert states['job-2'].exit_code == 2
+
+def test_replay_ignores_speculative_starts(tmp_path):
+    journal = module_journal.JobJournal(str(tmp_path))
+    journal.record(module_journal.EVENT_STARTED, 'job-1', hostname='host-a')
+    journal.record(module_journal.EVENT_STARTED, 'job-1', hostname='host-b', speculative=True)
+
+    state = journal.replay()['job-1']
+    assert state.status == module_journal.EVENT_STARTED
+    assert state.attempts == 1
+
+def test_replay_never_leaves_finished_status(tmp_path):
+    journal = module_journal.JobJournal(str(tmp_path))
+    journal.record(module_journal.EVENT_STARTED, 'job-1')
+    journal.record(module_journal.EVENT_FINISHED, 'job-1', exit_code=0, duration=1.0)
+    # A speculative copy reporting late, then the script queued again by a new execution
+    journal.record(module_journal.EVENT_FAILED, 'job-1', exit_code=137, duration=5.0)
+    journal.record(module_journal.EVENT_QUEUED, 'job-1')
+
+    state = journal.replay()['job-1']
+    assert state.is_completed()
+    assert (state.exit_code, state.duration) == (0, 1.0)
+
+def test_replay_ignores_truncated_line(tmp_path):
+    journal = module_journal.JobJournal(str(tmp_path))
+    journal.record(module_journal.EVENT_STARTED, 'job-1')
+    with open(journal.path, 'a') as file: file.write('{"time": 1.0, "event": "fin')
+
+    states = journal.replay()
+    assert list(states.keys()) == ['job-1']
+    assert states['job-1'].status == module_journal.EVENT_STARTED
@@ -0,0 +1,85 @@
+import modules_parallelization.module_logs as module_logs
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def read_log(path):
+    with open(path, 'r', encoding='utf-8') as file: return file.read()
+
+# =================================== TESTS ===================================
+
+def test_filter_keeps_last_redraw_of_each_line():
+    progress_filter = module_logs.ProgressFilter(strip_progress=True)
+    assert progress_filter.feed('start\n 10%\r 50%\r100%\ndone\n') == 'start\n100%\ndone\n'
+
+def test_filter_keeps_pseudo_terminal_line_endings():
+    progress_filter = module_logs.ProgressFilter(strip_progress=True)
+    assert progress_filter.feed('first\r\nsecond\r') == 'first\n'
+    # The '\r' ending the previous chunk was the start of a '\r\n'
+    assert progress_filter.feed('\nthird\r\n') == 'second\nthird\n'
+
+def test_filter_keeps_only_last_redraw_while_pending():
+    progress_filter = module_logs.ProgressFilter(strip_progress=True)
+    assert progress_filter.feed(' 10%\r 20%\r') == ''
+    assert progress_filter.feed(' 30%') == ''
+    assert progress_filter.pending == ' 30%'
+    assert progress_filter.close() == ' 30%'
+
+def test_filter_disabled_keeps_text():
+    progress_filter = module_logs.ProgressFilter(strip_progress=False)
+    assert progress_filter.feed(' 10%\r 50%\n') == ' 10%\r 50%\n'
+
+def test_writer_buffers_until_flush(tmp_path):
+    path = str(tmp_path / 'job.out')
+    writer = module_logs.BufferedLogWriter(path, flush_seconds=3600.0, flush_bytes=1024)
+    writer.write(b'line\n')
+    assert writer.buffer == ['line\n']
+    assert 'line' not in read_log(path)
+
+    writer.close()
+    assert read_log(path) == module_logs.EXECUTION_HEADER + 'line\n'
+
+def test_writer_flushes_once_buffer_is_full(tmp_path):
+    path = str(tmp_path / 'job.out')
+    writer = module_logs.BufferedLogWriter(path, flush_seconds=3600.0, flush_bytes=8)
+    writer.write(b'0123456789\n')
+    assert read_log(path) == module_logs.EXECUTION_HEADER + '0123456789\n'
+    writer.close()
+
+def test_writer_appends_new_execution(tmp_path):
+    path = str(tmp_path / 'job.out')
+    for text in [b'first\n', b'second\n']:
+        writer = module_logs.BufferedLogWriter(path)
+        writer.write(text)
+        writer.close()
+
+    header = module_logs.EXECUTION_HEADER
+    assert read_log(path) == header + 'first\n' + '\n' + header + 'second\n'
+
+def test_writer_decodes_characters_split_across_reads(tmp_path):
+    path = str(tmp_path / 'job.out')
+    data = '✅ ok\n'.encode('utf-8')
+    writer = module_logs.BufferedLogWriter(path)
+    writer.write(data[:2])
+    writer.write(data[2:])
+    writer.close()
+    assert read_log(path) == module_logs.EXECUTION_HEADER + '✅ ok\n'
+
+def test_writer_counts_encoded_bytes(tmp_path):
+    path = str(tmp_path / 'job.out')
+    writer = module_logs.BufferedLogWriter(path, flush_seconds=3600.0, flush_bytes=1024)
+    writer.write('✅ ok\n'.encode('utf-8'))
+    assert writer.buffer_size == 7
+    assert writer.bytes_written == 0
+
+    writer.close()
+    assert writer.bytes_written == 7
+
+def test_pipeline_sums_bytes_of_both_streams(tmp_path):
+    out_writer = module_logs.BufferedLogWriter(str(tmp_path / 'job.out'))
+    err_writer = module_logs.BufferedLogWriter(str(tmp_path / 'job.err'))
+    out_chunks = [b'\xc3\xa9t\xc3\xa9\n', b'']
+    err_chunks = [b'error\n', b'']
+    pipeline = module_logs.LogPipeline(lambda size: out_chunks.pop(0), lambda size: err_chunks.pop(0), out_writer, err_writer)
+
+    pipeline.run()
+    assert pipeline.get_bytes_written() == 6 + 6
@@ -0,0 +1,132 @@
+import modules_parallelization.module_placement as module_placement
+
+# =================================== PRIVATE CLASSES ===================================
+
+# Same getters as the 'Machine' and 'ExecutionScript' of 'parallelization', which parses its arguments on import
+class FakeMachine():
+
+    def __init__(self, hostname, max_jobs=4, min_free_memory_gb=0.0, max_load_per_core=float('inf'), job_memory_gb=0.0,
+        memory_gb=None, threads=None, tags=None, tag_limits=None):
+        self.hostname           = hostname
+        self.max_jobs           = max_jobs
+        self.min_free_memory_gb = min_free_memory_gb
+        self.max_load_per_core  = max_load_per_core
+        self.job_memory_gb      = job_memory_gb
+        self.memory_gb          = memory_gb
+        self.threads            = threads
+        self.tags               = tags
+        self.tag_limits         = tag_limits if tag_limits is not None else {}
+
+    def get_hostname(self): return self.hostname
+    def get_address(self): return self.hostname
+    def get_max_jobs(self): return self.max_jobs
+    def get_min_free_memory_gb(self): return self.min_free_memory_gb
+    def get_max_load_per_core(self): return self.max_load_per_core
+    def get_job_memory_gb(self): return self.job_memory_gb
+    def get_memory_gb(self): return self.memory_gb
+    def get_threads(self): return self.threads
+    def get_tags(self): return self.tags
+    def get_tag_limits(self): return self.tag_limits
+
+class FakeJob():
+
+    def __init__(self, memory_gb=None, threads=None, tags=None):
+        self.memory_gb  = memory_gb
+        self.threads    = threads
+        self.tags       = tags if tags is not None else []
+
+    def get_memory_gb(self): return self.memory_gb
+    def get_threads(self): return self.threads
+    def get_tags(self): return self.tags
+
+class FakeSampler():
+
+    def __init__(self, samples):
+        self.samples = samples
+
+    def get(self, address): return self.samples.get(address, None)
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def create_sample(cores, load_1m, memory_available_gb, jobs_at_sample=0):
+    sample = module_placement.HostSample(cores, load_1m, 64.0, memory_available_gb)
+    sample.jobs_at_sample = jobs_at_sample
+    return sample
+
+def select(machines, samples, job, running_jobs=None):
+    if running_jobs is None: running_jobs = dict((machine.get_hostname(), []) for machine in machines)
+    policy = module_placement.PlacementPolicy(FakeSampler(samples) if samples is not None else None)
+    selected = policy.select(machines, running_jobs, job)
+    return selected.get_hostname() if selected is not None else None
+
+# =================================== TESTS ===================================
+
+def test_parse_sample():
+    output = "8\n2.50 1.75 1.00 3/512 4242\nMemTotal:       16777216 kB\nMemAvailable:    8388608 kB\n"
+    sample = module_placement.parse_sample(output)
+    assert (sample.cores, sample.load_1m) == (8, 2.5)
+    assert (sample.memory_total_gb, sample.memory_available_gb) == (16.0, 8.0)
+
+def test_projected_load_counts_jobs_started_since_sample():
+    policy = module_placement.PlacementPolicy(None)
+    sample = create_sample(4, 1.0, 32.0, jobs_at_sample=1)
+    # One job started since the sample, plus the job being placed
+    assert policy.projected_load(sample, 2) == (1.0 + 1 + 1) / 4
+
+def test_select_prefers_least_loaded_host():
+    machines = [ FakeMachine('host-a'), FakeMachine('host-b') ]
+    samples = { 'host-a': create_sample(4, 3.0, 32.0), 'host-b': create_sample(4, 1.0, 32.0) }
+    assert select(machines, samples, FakeJob()) == 'host-b'
+
+def test_select_without_samples_prefers_least_occupied_host():
+    machines = [ FakeMachine('host-a', max_jobs=2), FakeMachine('host-b', max_jobs=4) ]
+    running_jobs = { 'host-a': [FakeJob()], 'host-b': [FakeJob()] }
+    assert select(machines, None, FakeJob(), running_jobs) == 'host-b'
+
+def test_select_skips_hosts_without_headroom():
+    machines = [ FakeMachine('host-a', min_free_memory_gb=4.0, job_memory_gb=2.0), FakeMachine('host-b', max_load_per_core=1.0) ]
+    samples = { 'host-a': create_sample(4, 0.0, 5.0), 'host-b': create_sample(2, 1.5, 32.0) }
+    running_jobs = { 'host-a': [], 'host-b': [FakeJob()] }
+    # Not enough memory left on host-a, host-b over its load once the job is added
+    assert select(machines, samples, FakeJob(), running_jobs) is None
+
+def test_select_ignores_headroom_when_nothing_is_running():
+    machines = [ FakeMachine('host-a', max_load_per_core=1.0) ]
+    samples = { 'host-a': create_sample(4, 8.0, 32.0) }
+    assert select(machines, samples, FakeJob()) == 'host-a'
+
+def test_select_respects_max_jobs():
+    machines = [ FakeMachine('host-a', max_jobs=1) ]
+    running_jobs = { 'host-a': [FakeJob()] }
+    assert select(machines, None, FakeJob(), running_jobs) is None
+
+def test_select_routes_jobs_by_tags():
+    machines = [ FakeMachine('host-cpu', tags=['cpu']), FakeMachine('host-gpu', tags=['cpu', 'gpu']) ]
+    assert select(machines, None, FakeJob(tags=['gpu'])) == 'host-gpu'
+    assert select(machines, None, FakeJob(tags=['tpu'])) is None
+
+def test_select_respects_tag_limits():
+    machines = [ FakeMachine('host-a', tag_limits={ 'gpu': 1 }) ]
+    running_jobs = { 'host-a': [FakeJob(tags=['gpu'])] }
+    assert select(machines, None, FakeJob(tags=['gpu']), running_jobs) is None
+    assert select(machines, None, FakeJob(), running_jobs) == 'host-a'
+
+def test_select_respects_capacities():
+    machines = [ FakeMachine('host-a', memory_gb=16.0, threads=8) ]
+    running_jobs = { 'host-a': [FakeJob(memory_gb=10.0, threads=4)] }
+    assert select(machines, None, FakeJob(memory_gb=8.0, threads=1), running_jobs) is None
+    assert select(machines, None, FakeJob(memory_gb=4.0, threads=8), running_jobs) is None
+    assert select(machines, None, FakeJob(memory_gb=4.0, threads=4), running_jobs) == 'host-a'
+
+def test_select_packs_memory_on_fullest_host():
+    machines = [ FakeMachine('host-empty', memory_gb=32.0), FakeMachine('host-busy', memory_gb=32.0) ]
+    running_jobs = { 'host-empty': [], 'host-busy': [FakeJob(memory_gb=20.0)] }
+    # The busier host is left with the least free memory, keeping the empty one for larger jobs
+    assert select(machines, None, FakeJob(memory_gb=8.0), running_jobs) == 'host-busy'
+
+def test_can_fit_on_empty_host():
+    policy = module_placement.PlacementPolicy(None)
+    machine = FakeMachine('host-a', memory_gb=16.0, threads=4)
+    assert policy.can_fit(machine, FakeJob(memory_gb=16.0, threads=4))
+    assert not policy.can_fit(machine, FakeJob(memory_gb=32.0))
+    assert not policy.can_fit(machine, FakeJob(threads=8))
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import modules_abstraction.module_scorer as module_scorer
+
+from modules_abstraction.module_scorer import ScorerSet
+
+# =================================== PRIVATE CLASSES ===================================
+
+# Scorer as it counted before being vectorized, one point at a time, the reference the vectorized one must match
+class ReferenceScorer():
+
+    def __init__(self):
+        self.points = { scorer_set: dict((key, 0.0) for key in module_scorer.POINTS_KEYS) for scorer_set in ScorerSet }
+
+    def add_set_points(self, scorer_set, labels, predictions):
+        points = self.points[scorer_set]
+        for label, prediction in zip(labels, predictions):
+            if label and prediction: points['true_positives'] += 1 / len(labels)
+            elif not label and prediction: points['false_positives'] += 1 / len(labels)
+            elif label and not prediction: points['false_negatives'] += 1 / len(labels)
+            elif not label and not prediction: points['true_negatives'] += 1 / len(labels)
+
+    def add_points(self, train_Y, train_pred_Y, test_Y, test_pred_Y):
+        self.add_set_points(ScorerSet.Train, train_Y, train_pred_Y)
+        self.add_set_points(ScorerSet.Test, test_Y, test_pred_Y)
+
+    def export_metrics(self, scorer_set):
+        points = self.points[scorer_set]
+        true_positives, true_negatives = points['true_positives'], points['true_negatives']
+        false_positives, false_negatives = points['false_positives'], points['false_negatives']
+
+        accuracy = (true_positives + true_negatives) / sum(points.values())
+        precision = 0 if true_positives == 0 and false_positives == 0 else true_positives / (true_positives + false_positives)
+        recall = 0 if true_positives == 0 and false_negatives == 0 else true_positives / (true_positives + false_negatives)
+        specificity = 0 if false_positives == 0 and true_negatives == 0 else true_negatives / (false_positives + true_negatives)
+        f1_measure = 0 if precision == 0 and recall == 0 else (2 * precision * recall) / (precision + recall)
+        return [ accuracy, precision, recall, recall, specificity, f1_measure, (recall + specificity) * 0.5 ]
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def create_splits(seed, number_splits, number_samples):
+    # Leave-one-out like splits (a single test sample) mixed with larger ones, of varying sizes
+    generator = np.random.RandomState(seed)
+    splits = []
+    for split_index in range(number_splits):
+        number_test = 1 if split_index % 2 == 0 else generator.randint(2, 8)
+        labels = pd.Series(generator.rand(number_samples) < 0.4, index=[ f'subject-{index}' for index in range(number_samples) ])
+        train_Y, test_Y = labels.iloc[number_test:], labels.iloc[:number_test]
+        splits.append((train_Y, generator.rand(len(train_Y)) < 0.5, test_Y, generator.rand(len(test_Y)) < 0.5))
+    return splits
+
+# =================================== TESTS ===================================
+
+def test_count_points_orders_cells():
+    labels = [False, False, True, True, True]
+    predictions = [False, True, False, True, True]
+    assert module_scorer.count_points(labels, predictions).tolist() == [[1, 1, 1, 2]]
+    assert module_scorer.count_points(labels, [predictions, [True] * 5]).tolist() == [[1, 1, 1, 2], [0, 2, 0, 3]]
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_scorer_matches_per_point_counting(seed):
+    scorer, reference = module_scorer.Scorer(['Negative', 'Positive']), ReferenceScorer()
+    for split in create_splits(seed, 12, 20):
+        scorer.add_points(*split)
+        reference.add_points(*split)
+
+    assert scorer.get_number_folds() == 12
+    for scorer_set in ScorerSet:
+        points = scorer.get_points_from_set(scorer_set)
+        for key in module_scorer.POINTS_KEYS: assert points[key] == pytest.approx(reference.points[scorer_set][key])
+        scores = [ metric['score'] for metric in scorer.export_metrics(scorer_set) ]
+        assert scores == pytest.approx(reference.export_metrics(scorer_set))
+
+def test_scorer_matches_per_point_counting_without_positives():
+    # Metrics dividing by zero are zero, as they were
+    scorer, reference = module_scorer.Scorer(['Negative', 'Positive']), ReferenceScorer()
+    labels = pd.Series([False, False, False])
+    scorer.add_points(labels, np.zeros(3, dtype=bool), labels, np.zeros(3, dtype=bool))
+    reference.add_points(labels, np.zeros(3, dtype=bool), labels, np.zeros(3, dtype=bool))
+
+    scores = [ metric['score'] for metric in scorer.export_metrics(ScorerSet.Test) ]
+    assert scores == pytest.approx(reference.export_metrics(ScorerSet.Test))
+    assert scorer.calculate_precision(ScorerSet.Test) == 0.0
+
+def test_unscored_train_set_has_no_metrics():
+    scorer = module_scorer.Scorer(['Negative', 'Positive'])
+    labels = pd.Series([True, False])
+    scorer.add_points(labels, None, labels, np.array([True, True]))
+
+    assert scorer.number_points(ScorerSet.Train) == 0
+    assert np.isnan(scorer.calculate_accuracy(ScorerSet.Train))
+    assert scorer.calculate_accuracy(ScorerSet.Test) == 0.5
+
+def test_batch_matches_scorers_added_one_by_one():
+    splits = create_splits(3, 6, 15)
+    number_variations = 4
+    generator = np.random.RandomState(4)
+
+    batch_scorers = [ module_scorer.Scorer(['Negative', 'Positive']) for _ in range(number_variations) ]
+    single_scorers = [ module_scorer.Scorer(['Negative', 'Positive']) for _ in range(number_variations) ]
+    for train_Y, _, test_Y, _ in splits:
+        train_preds_Y = generator.rand(number_variations, len(train_Y)) < 0.5
+        test_preds_Y = generator.rand(number_variations, len(test_Y)) < 0.5
+        module_scorer.add_points_batch(batch_scorers, train_Y, train_preds_Y, test_Y, test_preds_Y)
+        for scorer, train_pred_Y, test_pred_Y in zip(single_scorers, train_preds_Y, test_preds_Y):
+            scorer.add_points(train_Y, train_pred_Y, test_Y, test_pred_Y)
+
+    for scorer_set in ScorerSet:
+        metrics_df = module_scorer.compute_metrics_batch(batch_scorers, scorer_set)
+        assert list(metrics_df.columns) == module_scorer.METRICS_NAMES
+        for row, scorer in enumerate(single_scorers):
+            assert metrics_df.iloc[row].tolist() == pytest.approx(scorer.compute_metrics(scorer_set).tolist())
+
+def test_subjects_information_keeps_folds():
+    scorer = module_scorer.Scorer(['Negative', 'Positive'])
+    scorer.add_subjects_information(pd.Series([True], index=['subject-a']), np.array([False]), 3)
+    scorer.add_subjects_information(pd.Series([False, True], index=['subject-b', 'subject-c']), np.array([False, True]), 0)
+
+    subjects_df = scorer.get_subjects_df()
+    assert subjects_df['key'].tolist() == ['subject-a', 'subject-b', 'subject-c']
+    assert subjects_df['fold'].tolist() == [3, 0, 0]
+    assert subjects_df['label'].tolist() == [True, False, True]
+    assert subjects_df['predicted'].tolist() == [False, False, True]
@@ -0,0 +1,93 @@
+import threading
+
+import modules_parallelization.module_slots as module_slots
+
+# =================================== PRIVATE FUNCTIONS ===================================
+
+def create_tracker(hostnames, priority=None):
+    return module_slots.SlotTracker(dict((hostname, []) for hostname in hostnames), priority)
+
+# =================================== TESTS ===================================
+
+def test_acquire_places_first_job_that_fits():
+    tracker = create_tracker(['host-a'])
+    queue = ['job-1', 'job-2']
+
+    assert tracker.acquire_next(queue, lambda job: 'host-a') == ('job-1', 'host-a')
+    assert queue == ['job-2']
+    assert tracker.occupied['host-a'] == ['job-1']
+    assert tracker.number_running() == 1
+
+def test_acquire_backfills_jobs_behind_one_that_fits_nowhere():
+    tracker = create_tracker(['host-a'])
+    queue = ['large', 'small']
+
+    select = lambda job: 'host-a' if job == 'small' else None
+    assert tracker.acquire_next(queue, select) == ('small', 'host-a')
+    assert queue == ['large']
+
+def test_acquire_returns_none_once_all_is_done():
+    tracker = create_tracker(['host-a'])
+    assert tracker.acquire_next([], lambda job: 'host-a') is None
+
+def test_acquire_waits_for_release():
+    tracker = create_tracker(['host-a'])
+    queue = ['job-1', 'job-2']
+    # A single slot on the host
+    select = lambda job: 'host-a' if len(tracker.occupied['host-a']) == 0 else None
+    assert tracker.acquire_next(queue, select) == ('job-1', 'host-a')
+
+    releaser = threading.Timer(0.1, lambda: tracker.release('host-a', 'job-1'))
+    releaser.start()
+    assert tracker.acquire_next(queue, select, timeout=5.0) == ('job-2', 'host-a')
+    releaser.join()
+    assert tracker.occupied['host-a'] == ['job-2']
+
+def test_try_acquire_does_not_block():
+    tracker = create_tracker(['host-a'])
+    assert tracker.try_acquire('job-1', lambda: None) is None
+    assert tracker.try_acquire('job-1', lambda: 'host-a') == 'host-a'
+    assert tracker.occupied['host-a'] == ['job-1']
+
+def test_wait_until_idle_returns_after_last_release():
+    tracker = create_tracker(['host-a'])
+    tracker.try_acquire('job-1', lambda: 'host-a')
+
+    releaser = threading.Timer(0.1, lambda: tracker.release('host-a', 'job-1'))
+    releaser.start()
+    tracker.wait_until_idle()
+    releaser.join()
+    assert tracker.number_running() == 0
+
+def test_deferred_job_is_requeued_by_priority():
+    tracker = create_tracker(['host-a'], priority=lambda job: job[1])
+    queue = [('high', 3.0), ('low', 1.0)]
+    tracker.try_acquire(('retry', 2.0), lambda: 'host-a')
+
+    # Deferred before its slot is released, so that the tracker keeps waiting for it
+    tracker.defer(queue, ('retry', 2.0), 0.05)
+    tracker.release('host-a', ('retry', 2.0))
+    assert tracker.deferred == 1
+
+    tracker.wait_until_idle()
+    assert tracker.deferred == 0
+    assert queue == [('high', 3.0), ('retry', 2.0), ('low', 1.0)]
+
+def test_acquire_waits_for_deferred_job():
+    tracker = create_tracker(['host-a'])
+    queue = []
+    tracker.defer(queue, 'retry', 0.05)
+
+    assert tracker.acquire_next(queue, lambda job: 'host-a', timeout=5.0) == ('retry', 'host-a')
+
+def test_acquire_skips_jobs_sharing_signature_of_unplaced_job():
+    tracker = create_tracker(['host-a'])
+    queue = [('large', 1), ('large', 2), ('small', 3)]
+    evaluated = []
+
+    def select(job):
+        evaluated.append(job)
+        return 'host-a' if job[0] == 'small' else None
+
+    assert tracker.acquire_next(queue, select, signature=lambda job: job[0]) == (('small', 3), 'host-a')
+    assert evaluated == [('large', 1), ('small', 3)]
@@ -0,0 +1,101 @@
+import os
+import sys
+import ast
+import runpy
+import socket
+import argparse
+import importlib
+
+from typing import Any, Dict, List
+
+# Local Modules - Parallelization (standard library only, so that submitting a job stays cheap)
+import modules_parallelization.module_daemon       as module_daemon
+
+# =================================================== CONSTANTS DEFINITION ===================================================
+
+TMP_DIRECTORY = './tmp/'
+DAEMON_LOG_FILE = 'worker_daemon - {0}.log'
+ARGUMENTS_SEPARATOR = '--'
+
+# =================================================== AUXILIARY FUNCTIONS ===================================================
+
+def check_file(file_path : str) -> None:
+    if not os.path.exists(file_path) or not os.path.isfile(file_path):
+        exit(f"🚨 File at '{file_path}' does not exist")
+
+def get_script_modules(script : str) -> List[str]:
+    # Modules imported at the top of the script, which bring along the heavy packages (pandas, sklearn, tensorflow, torch, ...)
+    file = open(script, 'r')
+    tree = ast.parse(file.read())
+    file.close()
+
+    modules : List[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Import): modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module is not None: modules.append(node.module)
+    return modules
+
+def get_socket_path(script : str, timestamp : str) -> str:
+    return module_daemon.get_socket_path([os.getcwd(), os.path.abspath(script), timestamp])
+
+def serve(script : str, timestamp : str, idle_seconds : float) -> None:
+
+    def warm() -> None:
+        # Only imported, torch and tensorflow start their thread pools in the forked jobs (as sessions and models are built)
+        print(f"🔥 Importing modules required by '{script}' ...", flush=True)
+        for module in get_script_modules(script): importlib.import_module(module)
+
+    def prepare(request : Dict[str, Any]) -> None:
+        # Imported after warming up, the daemon then holds the feature sets of the execution for every forked job
+        import modules_abstraction.module_models as module_models
+        module_models.cache_feature_sets(os.path.join(TMP_DIRECTORY, timestamp))
+
+    def run(request : Dict[str, Any]) -> int:
+        sys.argv = [script] + request['arguments']
+        runpy.run_path(script, run_name='__main__')
+        return 0
+
+    server = module_daemon.ForkServer(get_socket_path(script, timestamp), warm, prepare, run, idle_seconds)
+    server.serve()
+
+def submit(script : str, timestamp : str, idle_seconds : float, arguments : List[str]) -> None:
+    request : Dict[str, Any] = { 'cwd': os.getcwd(), 'environment': dict(os.environ), 'arguments': arguments }
+    code = module_daemon.submit(get_socket_path(script, timestamp), request)
+    if code is not None: exit(code)
+
+    # No daemon on this host yet, one is started for the following jobs while this one is executed from scratch
+    log_directory = os.path.join(TMP_DIRECTORY, timestamp)
+    os.makedirs(log_directory, exist_ok=True)
+    module_daemon.spawn([sys.executable, os.path.abspath(__file__), '-execution=serve', f'-script={script}',
+        f'-timestamp={timestamp}', f'-idle_seconds={idle_seconds}'], os.path.join(log_directory, DAEMON_LOG_FILE.format(socket.gethostname())))
+    sys.stdout.flush()
+    os.execv(sys.executable, [sys.executable, script] + arguments)
+
+# ===================================================== MAIN EXECUTION =====================================================
+
+SUBMIT_OPTION = 'submit'
+SERVE_OPTION = 'serve'
+EXECUTION_OPTIONS = [SUBMIT_OPTION, SERVE_OPTION]
+
+# Arguments after the separator are forwarded to the script
+daemon_arguments : List[str] = sys.argv[1:]
+script_arguments : List[str] = []
+if ARGUMENTS_SEPARATOR in daemon_arguments:
+    separator_index = daemon_arguments.index(ARGUMENTS_SEPARATOR)
+    script_arguments = daemon_arguments[separator_index + 1:]
+    daemon_arguments = daemon_arguments[:separator_index]
+
+parser = argparse.ArgumentParser()
+parser.add_argument("-script",      required=True,  type=str,   help="path for the model script executed by the jobs")
+parser.add_argument("-timestamp",   required=True,  type=str,   help="key (timestamp) to uniquely identify execution, each execution has its own daemon")
+parser.add_argument("-execution",                   type=str,   help="execution type", choices=EXECUTION_OPTIONS, default=SUBMIT_OPTION)
+parser.add_argument("-idle_seconds",                type=float, help="number of seconds without jobs after which the daemon stops", default=module_daemon.DAEMON_IDLE_SECONDS)
+
+arguments = parser.parse_args(daemon_arguments)
+arguments_dict = vars(arguments)
+
+check_file(arguments_dict['script'])
+if arguments_dict['execution'] == SERVE_OPTION:
+    serve(arguments_dict['script'], arguments_dict['timestamp'], arguments_dict['idle_seconds'])
+elif arguments_dict['execution'] == SUBMIT_OPTION:
+    submit(arguments_dict['script'], arguments_dict['timestamp'], arguments_dict['idle_seconds'], script_arguments)